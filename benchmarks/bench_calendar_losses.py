@@ -0,0 +1,86 @@
+"""
+Micro-benchmark: daily Sharpe via ``DataFrame.resample`` vs precomputed calendar bins.
+
+Runs each approach repeatedly on a synthetic hyperopt results frame, the same way
+hyperopt calls a loss once per epoch, and checks both produce the same daily series.
+
+Usage:
+    python benchmarks/bench_calendar_losses.py [--trades 10000 100000] [--epochs 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ftlib.calendar_bins import day_bins, sharpe  # noqa: E402
+
+
+SLIPPAGE_PER_TRADE_RATIO = 0.0005
+
+
+def make_results(trades: int, days: int = 365, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01", tz="UTC")
+    offsets = np.sort(rng.integers(0, days * 86_400, trades))
+    return pd.DataFrame({
+        "close_date": start + pd.to_timedelta(offsets, unit="s"),
+        "profit_ratio": rng.normal(0.002, 0.02, trades),
+    })
+
+
+def resample_daily(results: pd.DataFrame, min_date, max_date) -> np.ndarray:
+    # Mirrors freqtrade's SharpeHyperOptLossDaily.
+    results = results.assign(
+        profit_ratio_after_slippage=results["profit_ratio"] - SLIPPAGE_PER_TRADE_RATIO
+    )
+    t_index = pd.date_range(start=min_date, end=max_date, freq="1D", normalize=True)
+    sum_daily = (
+        results.resample("1D", on="close_date")
+        .agg({"profit_ratio_after_slippage": "sum"})
+        .reindex(t_index)
+        .fillna(0)
+    )
+    return sum_daily["profit_ratio_after_slippage"].to_numpy()
+
+
+def binned_daily(results: pd.DataFrame, min_date, max_date) -> np.ndarray:
+    profit = results["profit_ratio"].to_numpy() - SLIPPAGE_PER_TRADE_RATIO
+    return day_bins(min_date, max_date).sum(results["close_date"], profit)
+
+
+def time_it(func, results, min_date, max_date, epochs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(epochs):
+        sharpe(func(results, min_date, max_date))
+    return (time.perf_counter() - start) / epochs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--epochs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'trades':>8} {'resample ms':>12} {'bins ms':>9} {'speedup':>8}")
+    for trades in args.trades:
+        results = make_results(trades)
+        min_date = results["close_date"].iloc[0]
+        max_date = results["close_date"].iloc[-1]
+
+        expected = resample_daily(results, min_date, max_date)
+        actual = binned_daily(results, min_date, max_date)
+        if not np.allclose(expected, actual):
+            raise SystemExit(f"Daily series differ for {trades} trades")
+
+        slow = time_it(resample_daily, results, min_date, max_date, args.epochs)
+        fast = time_it(binned_daily, results, min_date, max_date, args.epochs)
+        print(f"{trades:>8} {slow * 1e3:>12.3f} {fast * 1e3:>9.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,74 @@
+"""
+Strategy checks run before a strategy is handed to a bot instance.
+
+    python check_strategy.py lint [PATH ...] [--json] [--max-cost heavy]
+        Static performance lint (no code is executed). Exit code 1 if any file
+        has a finding worse than --max-cost.
+    python check_strategy.py validate [PATH ...] [--workers N] [--json]
+        Import every strategy file in an isolated subprocess, instantiate its
+        IStrategy subclasses and report import-time cost per module. Exit code 1
+        if any file fails to import or instantiate.
+"""
+import argparse
+import json
 import sys
-sys.path.append('c:\\Users\\HP1\\Music\\botmoon-backend\\user_data\\strategies')
-
-try:
-    from FixedRiskRewardLoss import FixedRiskRewardLoss
-    print("Successfully imported FixedRiskRewardLoss")
-    # Attempt to instantiate the class (if it has a simple constructor)
-    # This might fail if it requires Freqtrade specific context
-    try:
-        strategy_instance = FixedRiskRewardLoss()
-        print("Successfully instantiated FixedRiskRewardLoss")
-    except Exception as e:
-        print(f"Error instantiating FixedRiskRewardLoss: {e}")
-
-except ImportError as e:
-    print(f"ImportError: {e}")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+from pathlib import Path
+
+from ftlib.strategy_lint import COST_CLASSES, lint_file
+from ftlib.strategy_loader import STRATEGY_DIRS, iter_strategy_files
+from ftlib.strategy_validate import print_report, validate
+
+
+def run_lint(args) -> int:
+    reports = [lint_file(path) for path in iter_strategy_files(args.paths or STRATEGY_DIRS)]
+    if args.json:
+        print(json.dumps([report.to_dict(args.max_cost) for report in reports], indent=2))
+    else:
+        for report in reports:
+            if report.verdict == "ok" and not args.verbose:
+                continue
+            print(f"{report.path}: {report.verdict}")
+            if report.error:
+                print(f"    {report.error}")
+            for finding in sorted(report.findings, key=lambda f: f.line):
+                where = f" in {finding.function}" if finding.function else ""
+                print(f"    line {finding.line}{where} [{finding.cost}] {finding.rule}: {finding.message}")
+    return 0 if all(report.passes(args.max_cost) for report in reports) else 1
+
+
+def run_validate(args) -> int:
+    results = validate(args.paths or None, args.workers)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    failed = any(
+        result["error"] or any(cls["error"] for cls in result["classes"]) for result in results
+    )
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check strategies before deploying them.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lint = subparsers.add_parser("lint", help="Flag known-slow code patterns.")
+    lint.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories.")
+    lint.add_argument("--json", action="store_true", help="Machine-readable verdicts.")
+    lint.add_argument("--max-cost", choices=COST_CLASSES, default="heavy",
+                      help="Worst cost class that still passes (default: heavy).")
+    lint.add_argument("-v", "--verbose", action="store_true", help="Also list clean files.")
+    lint.set_defaults(func=run_lint)
+
+    check = subparsers.add_parser("validate", help="Import and instantiate every strategy.")
+    check.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories.")
+    check.add_argument("--workers", type=int, default=None, help="Parallel imports (default: CPU count).")
+    check.add_argument("--json", action="store_true", help="Machine-readable results.")
+    check.set_defaults(func=run_validate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
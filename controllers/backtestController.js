@@ -1,5 +1,6 @@
 const logger = require("../utils/logger");
 const { startFreqtradeBacktest } = require("../services/freqtradeManager");
+const { getBacktest, streamBacktestEvents } = require("../services/freqtrade/backtestPool");
 
 exports.startBacktest = async (req, res) => {
   const operation = "startBacktest";
@@ -70,4 +71,59 @@ exports.startBacktest = async (req, res) => {
     });
     res.status(500).json({ message: "Internal server error during backtest initiation." });
   }
-};
\ No newline at end of file
+};
+
+// Jobs belong to the user who queued them; other users get a 404 like unknown ids.
+const findOwnBacktest = async (req, res) => {
+  const userId = req.userDB?._id;
+  if (!userId) {
+    res.status(401).json({ message: "Authentication required." });
+    return null;
+  }
+  const job = await getBacktest(req.params.backtestId);
+  if (!job || job.user !== userId.toString()) {
+    res.status(404).json({ message: "Backtest not found." });
+    return null;
+  }
+  return job;
+};
+
+exports.getBacktestStatus = async (req, res) => {
+  const operation = "getBacktestStatus";
+  try {
+    const job = await findOwnBacktest(req, res);
+    if (!job) return;
+    res.status(200).json({
+      backtestId: job.id,
+      state: job.state,
+      strategy: job.strategy,
+      timerange: job.timerange,
+      progress: job.progress,
+      result: job.result,
+      error: job.error,
+    });
+  } catch (error) {
+    logger.error({ operation, backtestId: req.params.backtestId, error: error.message });
+    res.status(502).json({ message: "Backtest service unavailable." });
+  }
+};
+
+// Proxies the pool's NDJSON event stream (queued, started, progress, done / failed).
+exports.streamBacktestEvents = async (req, res) => {
+  const operation = "streamBacktestEvents";
+  try {
+    const job = await findOwnBacktest(req, res);
+    if (!job) return;
+    const events = await streamBacktestEvents(job.id);
+    res.status(200);
+    res.setHeader("Content-Type", "application/x-ndjson");
+    res.setHeader("Cache-Control", "no-cache");
+    res.flushHeaders();
+    req.on("close", () => events.destroy());
+    events.pipe(res);
+  } catch (error) {
+    logger.error({ operation, backtestId: req.params.backtestId, error: error.message });
+    if (!res.headersSent) res.status(502).json({ message: "Backtest service unavailable." });
+    else res.end();
+  }
+};
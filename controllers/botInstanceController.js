@@ -6,6 +6,10 @@ const {
   startFreqtradeProcess,
   stopFreqtradeProcess,
 } = require("../services/freqtrade");
+const {
+  readCallbackMetrics,
+  summarizeCallbacks,
+} = require("../services/freqtrade/metricsReader");
 const logger = require("../utils/logger");
 const { sendNotification } = require("../socket");
 
@@ -474,6 +478,48 @@ exports.getBotInstanceConfigDetails = async (req, res) => {
   }
 };
 
+// 🔹 Get Bot Instance Callback Latency Metrics
+exports.getBotInstanceMetrics = async (req, res) => {
+  const operation = "getBotInstanceMetrics";
+  try {
+    const { botInstanceId } = req.params;
+    const userId = req.userDB._id;
+
+    const instance = await BotInstance.findOne({
+      _id: botInstanceId,
+      userId: userId,
+    }).select("running config");
+
+    if (!instance) {
+      return res
+        .status(404)
+        .json({ message: "Bot instance not found or permission denied." });
+    }
+
+    const snapshot = await readCallbackMetrics(
+      botInstanceId,
+      instance.config?.callback_metrics?.interval
+    );
+    if (!snapshot) {
+      return res
+        .status(404)
+        .json({ message: "No metrics reported by this bot instance yet." });
+    }
+
+    res.json({
+      running: instance.running,
+      summary: summarizeCallbacks(snapshot),
+      metrics: snapshot,
+    });
+  } catch (error) {
+    logger.error(
+      `[${operation}] Error reading metrics for BotInstance ${req.params.botInstanceId}, User ${req.userDB?._id}:`,
+      { error: error.message, stack: error.stack }
+    );
+    res.status(500).json({ message: "Failed to retrieve bot instance metrics." });
+  }
+};
+
 // 🔹 Start Bot Instance
 exports.startBotInstance = async (req, res, next) => {
   
@@ -2,6 +2,12 @@
 const mongoose = require("mongoose");
 const Trade = require("../models/Trade"); // Assuming Trade model has 'profit' and 'createdAt'
 const BotInstance = require("../models/BotInstance");
+const {
+  rollupsAreFresh,
+  bucketStart,
+  nextBucketStart,
+  readRollups,
+} = require("../services/pnlRollups");
 const logger = require("../utils/logger");
 
 /**
@@ -108,6 +114,55 @@ exports.getPerformanceChartData = async (req, res) => {
 
     pipeline.push({ $match: matchStage });
 
+    // Closed-trade profit comes from the precomputed buckets while the rollup job is
+    // running (ftlib/pnl_rollups.py). Those cover whole hours/days/months, so a start
+    // date inside a bucket sums that first bucket from the raw trades, like the fallback.
+    const rollupGranularity = ["hourly", "monthly"].includes(granularity)
+      ? granularity
+      : "daily";
+    if (status === "closed" && (await rollupsAreFresh())) {
+      const buckets = [];
+      let rollupsFrom = startDate;
+      if (
+        startDate &&
+        bucketStart(startDate, rollupGranularity).getTime() !== startDate.getTime()
+      ) {
+        rollupsFrom = nextBucketStart(startDate, rollupGranularity);
+        const [partial] = await Trade.aggregate([
+          {
+            $match: {
+              ...matchStage,
+              createdAt: { $gte: startDate, $lt: rollupsFrom },
+            },
+          },
+          { $group: { _id: null, profit: { $sum: "$profit" } } },
+        ]);
+        if (partial) {
+          buckets.push({
+            bucket: bucketStart(startDate, rollupGranularity),
+            profit: partial.profit,
+          });
+        }
+      }
+      buckets.push(
+        ...(await readRollups("instance", botInstanceId, rollupGranularity, {
+          from: rollupsFrom || undefined,
+        }))
+      );
+      const chartData = buckets.map((bucket) => ({
+        timestamp: bucket.bucket.toISOString(),
+        value: bucket.profit,
+      }));
+      logger.info({
+        operation,
+        message: `Read ${chartData.length} rollup buckets for ${botInstanceId}`,
+        granularity: rollupGranularity,
+        period,
+        userId,
+      });
+      return res.json(chartData);
+    }
+
     // 2. $project stage: Extract necessary fields and maybe format date early
     // Project profit and the date field used for grouping
     pipeline.push({
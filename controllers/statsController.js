@@ -1,6 +1,11 @@
 const mongoose = require("mongoose");
 const Trade = require("../models/Trade");
 const BotInstance = require("../models/BotInstance");
+const {
+  rollupsAreFresh,
+  readRollups,
+  sumRollups,
+} = require("../services/pnlRollups");
 const logger = require("../utils/logger"); // Assuming logger exists
 
 // Helper function to get UTC date boundaries
@@ -26,6 +31,34 @@ const getUTCDateBoundaries = () => {
   return { now, startOfTodayUTC, startOfMonthUTC, startOfLastMonthUTC };
 };
 
+// Same figures as the $facet aggregation below, from the user's rollup buckets
+// (ftlib/pnl_rollups.py): one monthly bucket per month plus today's daily bucket.
+const statsFromRollups = async (userId, botInstanceIds, boundaries) => {
+  const { startOfTodayUTC, startOfMonthUTC, startOfLastMonthUTC } = boundaries;
+  const [monthly, today, activePositions] = await Promise.all([
+    readRollups("user", userId, "monthly"),
+    readRollups("user", userId, "daily", { from: startOfTodayUTC }),
+    Trade.countDocuments({
+      botInstanceId: { $in: botInstanceIds },
+      status: "open",
+    }),
+  ]);
+  const overall = sumRollups(monthly);
+  const monthProfit = (start) =>
+    monthly.find((bucket) => bucket.bucket.getTime() === start.getTime())
+      ?.profit || 0;
+  return {
+    totalProfit: overall.profit,
+    totalTradesCount: overall.trades,
+    winningTrades: overall.wins,
+    totalFees: overall.fees,
+    todayProfit: sumRollups(today).profit,
+    activePositions,
+    currentMonthProfit: monthProfit(startOfMonthUTC),
+    lastMonthProfit: monthProfit(startOfLastMonthUTC),
+  };
+};
+
 /**
  * GET /api/stats/trading
  * Calculates and returns trading statistics for the logged-in user.
@@ -66,111 +99,114 @@ exports.getTradingStats = async (req, res) => {
     }
 
     // 2. Define Date Boundaries (UTC)
+    const boundaries = getUTCDateBoundaries();
     const { startOfTodayUTC, startOfMonthUTC, startOfLastMonthUTC } =
-      getUTCDateBoundaries();
-
-    // 3. Perform Aggregation on Trades
-    const statsAggregation = await Trade.aggregate([
-      // Stage 1: Match trades belonging to the user's bot instances
-      { $match: { botInstanceId: { $in: botInstanceIds } } },
-
-      // Stage 2: Use $facet to calculate multiple aggregates in parallel
-      {
-        $facet: {
-          // --- Calculations for CLOSED trades ---
-          overallClosed: [
-            { $match: { status: "closed" } },
-            {
-              $group: {
-                _id: null,
-                totalProfit: { $sum: "$profit" },
-                totalTradesCount: { $sum: 1 },
-                winningTrades: {
-                  $sum: { $cond: [{ $gt: ["$profit", 0] }, 1, 0] },
+      boundaries;
+
+    // 3. Read the rollup buckets, or aggregate the trades while the rollup job is behind
+    const statsAggregation = (await rollupsAreFresh())
+      ? [await statsFromRollups(userId, botInstanceIds, boundaries)]
+      : await Trade.aggregate([
+          // Stage 1: Match trades belonging to the user's bot instances
+          { $match: { botInstanceId: { $in: botInstanceIds } } },
+
+          // Stage 2: Use $facet to calculate multiple aggregates in parallel
+          {
+            $facet: {
+              // --- Calculations for CLOSED trades ---
+              overallClosed: [
+                { $match: { status: "closed" } },
+                {
+                  $group: {
+                    _id: null,
+                    totalProfit: { $sum: "$profit" },
+                    totalTradesCount: { $sum: 1 },
+                    winningTrades: {
+                      $sum: { $cond: [{ $gt: ["$profit", 0] }, 1, 0] },
+                    },
+                    totalFees: { $sum: "$platformFee" }, // Add total fees
+                  },
                 },
-                totalFees: { $sum: "$fee" }, // Add total fees
-              },
+              ],
+              todayClosed: [
+                // Using createdAt of closed trades for daily calculation
+                {
+                  $match: {
+                    status: "closed",
+                    createdAt: { $gte: startOfTodayUTC },
+                  },
+                },
+                {
+                  $group: {
+                    _id: null,
+                    todayProfit: { $sum: "$profit" },
+                  },
+                },
+              ],
+              currentMonthClosed: [
+                // Using createdAt of closed trades
+                {
+                  $match: {
+                    status: "closed",
+                    createdAt: { $gte: startOfMonthUTC },
+                  },
+                },
+                {
+                  $group: {
+                    _id: null,
+                    currentMonthProfit: { $sum: "$profit" },
+                  },
+                },
+              ],
+              lastMonthClosed: [
+                // Using createdAt of closed trades
+                {
+                  $match: {
+                    status: "closed",
+                    createdAt: { $gte: startOfLastMonthUTC, $lt: startOfMonthUTC },
+                  },
+                },
+                {
+                  $group: {
+                    _id: null,
+                    lastMonthProfit: { $sum: "$profit" },
+                  },
+                },
+              ],
+              // --- Calculation for OPEN trades ---
+              activePositions: [
+                { $match: { status: "open" } },
+                { $count: "count" },
+              ],
             },
-          ],
-          todayClosed: [
-            // Using createdAt of closed trades for daily calculation
-            {
-              $match: {
-                status: "closed",
-                createdAt: { $gte: startOfTodayUTC },
+          },
+
+          // Stage 3: Project results from $facet arrays (handle empty arrays with $ifNull)
+          {
+            $project: {
+              totalProfit: {
+                $ifNull: [{ $first: "$overallClosed.totalProfit" }, 0],
               },
-            },
-            {
-              $group: {
-                _id: null,
-                todayProfit: { $sum: "$profit" },
+              totalTradesCount: {
+                $ifNull: [{ $first: "$overallClosed.totalTradesCount" }, 0],
               },
-            },
-          ],
-          currentMonthClosed: [
-            // Using createdAt of closed trades
-            {
-              $match: {
-                status: "closed",
-                createdAt: { $gte: startOfMonthUTC },
+              winningTrades: {
+                $ifNull: [{ $first: "$overallClosed.winningTrades" }, 0],
               },
-            },
-            {
-              $group: {
-                _id: null,
-                currentMonthProfit: { $sum: "$profit" },
+              totalFees: { $ifNull: [{ $first: "$overallClosed.totalFees" }, 0] }, // Project total fees
+              todayProfit: { $ifNull: [{ $first: "$todayClosed.todayProfit" }, 0] },
+              activePositions: {
+                $ifNull: [{ $first: "$activePositions.count" }, 0],
               },
-            },
-          ],
-          lastMonthClosed: [
-            // Using createdAt of closed trades
-            {
-              $match: {
-                status: "closed",
-                createdAt: { $gte: startOfLastMonthUTC, $lt: startOfMonthUTC },
+              currentMonthProfit: {
+                $ifNull: [{ $first: "$currentMonthClosed.currentMonthProfit" }, 0],
               },
-            },
-            {
-              $group: {
-                _id: null,
-                lastMonthProfit: { $sum: "$profit" },
+              lastMonthProfit: {
+                $ifNull: [{ $first: "$lastMonthClosed.lastMonthProfit" }, 0],
               },
             },
-          ],
-          // --- Calculation for OPEN trades ---
-          activePositions: [
-            { $match: { status: "open" } },
-            { $count: "count" },
-          ],
-        },
-      },
-
-      // Stage 3: Project results from $facet arrays (handle empty arrays with $ifNull)
-      {
-        $project: {
-          totalProfit: {
-            $ifNull: [{ $first: "$overallClosed.totalProfit" }, 0],
-          },
-          totalTradesCount: {
-            $ifNull: [{ $first: "$overallClosed.totalTradesCount" }, 0],
-          },
-          winningTrades: {
-            $ifNull: [{ $first: "$overallClosed.winningTrades" }, 0],
-          },
-          totalFees: { $ifNull: [{ $first: "$overallClosed.totalFees" }, 0] }, // Project total fees
-          todayProfit: { $ifNull: [{ $first: "$todayClosed.todayProfit" }, 0] },
-          activePositions: {
-            $ifNull: [{ $first: "$activePositions.count" }, 0],
-          },
-          currentMonthProfit: {
-            $ifNull: [{ $first: "$currentMonthClosed.currentMonthProfit" }, 0],
-          },
-          lastMonthProfit: {
-            $ifNull: [{ $first: "$lastMonthClosed.lastMonthProfit" }, 0],
           },
-        },
-      },
-    ]);
+        ]);
 
     // 4. Extract results and calculate derived metrics
     const result = statsAggregation[0] || {}; // Get the first (and only) result or default object
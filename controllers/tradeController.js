@@ -278,6 +278,23 @@ exports.createTrade = async (req, res) => {
       return res.status(404).json({ message: "User not found." });
     }
 
+    // Bot trades are exported from the instance databases by ftlib/trade_exporter.py, which
+    // also charges their fee. Posting one of them again returns the stored trade.
+    const ftTradeId = tradeDetails?.ftTradeId;
+    if (ftTradeId !== undefined) {
+      const existing = await Trade.findOne({ botInstanceId, "tradeDetails.ftTradeId": ftTradeId });
+      if (existing) {
+        logger.info({
+          operation,
+          message: `Trade ${ftTradeId} of bot instance ${botInstanceId} already exists.`,
+          botInstanceId,
+          userId,
+          tradeId: existing._id,
+        });
+        return res.status(200).json(existing);
+      }
+    }
+
     // --- Implement Trade Blocking Logic ---
 
     // 1. Block trades if the bot is manually disabled (status check)
@@ -311,11 +328,13 @@ exports.createTrade = async (req, res) => {
 
     // Calculate gross profit (profit before platform fees)
     const grossProfit = profit;
+    const tradeStatus = status || "open";
     let netProfit = profit;
     let platformFee = 0;
 
-    // 4. Block trades if fee balance is insufficient (assuming accountBalance covers fees)
-    if (grossProfit > 0) {
+    // 4. Block trades if fee balance is insufficient (assuming accountBalance covers fees).
+    // The fee is charged once the trade is closed with a profit, as ftlib/trade_exporter.py does.
+    if (tradeStatus === "closed" && grossProfit > 0) {
       const bot = await Bot.findById(botInstance.botId).select("profitFee");
       const profitFeePercentage = bot?.profitFee || 0.20; // Default to 20% if not set
       platformFee = grossProfit * profitFeePercentage;
@@ -332,7 +351,7 @@ exports.createTrade = async (req, res) => {
 
       netProfit = grossProfit - platformFee;
 
-      // Deduct fee from user's wallet balance
+      // Deduct fee from user's wallet balance, saved once the trade is stored
       if (user) {
         user.accountBalance -= platformFee;
         // Pause bot if account balance falls below a threshold (e.g., 0 or a configurable minimum)
@@ -348,7 +367,6 @@ exports.createTrade = async (req, res) => {
             botInstanceId,
           });
         }
-        await user.save();
       } else {
         logger.error({
           operation,
@@ -366,10 +384,32 @@ exports.createTrade = async (req, res) => {
       platformFee: platformFee,
       netProfit: netProfit,
       profit: netProfit, // Keep 'profit' field for backward compatibility, but it now stores net profit
-      status: status || "open",
+      status: tradeStatus,
+      // The exporter must not charge this trade again
+      feeChargedAt: platformFee > 0 ? new Date() : undefined,
     });
 
-    await trade.save();
+    try {
+      await trade.save();
+    } catch (error) {
+      // The exporter upserted the same freqtrade trade since the lookup above and charges
+      // its fee itself, so nothing is deducted here.
+      if (error.code !== 11000 || ftTradeId === undefined) {
+        throw error;
+      }
+      const existing = await Trade.findOne({ botInstanceId, "tradeDetails.ftTradeId": ftTradeId });
+      logger.info({
+        operation,
+        message: `Trade ${ftTradeId} of bot instance ${botInstanceId} was stored concurrently.`,
+        botInstanceId,
+        userId,
+        tradeId: existing?._id,
+      });
+      return res.status(200).json(existing);
+    }
+    if (platformFee > 0) {
+      await user.save();
+    }
     // Save updated bot instance status if it was paused
     if (botInstance.isModified('status') || botInstance.isModified('isActive')) {
       await botInstance.save();
@@ -10,10 +10,12 @@ from datetime import datetime
 from typing import Optional # Crucial for type hints
 import logging
 
+from ftlib.stake_sizing import StakeSizingMixin
+
 logger = logging.getLogger(__name__)
 
 # Ensure the CLASS NAME here matches what is in your config.json -> "strategy": "THIS_NAME"
-class SmartScalpingDCA(IStrategy):
+class SmartScalpingDCA(StakeSizingMixin, IStrategy):
     """
     Scalping strategy with EMA, SuperTrend, RSI for entry.
     Exits via ROI, stoploss, or ATR-based custom trailing stop.
@@ -63,6 +65,9 @@ class SmartScalpingDCA(IStrategy):
     dca_threshold = DecimalParameter(low=-0.05, high=-0.02, default=-0.035, decimals=3, space="buy", optimize=True)
     dca_max_entries = IntParameter(low=1, high=3, default=2, space="buy", optimize=True) # Max number of DCA entries (e.g., 2 means initial + 2 DCAs = 3 total entries)
 
+    # Stake sizing: fraction of the available stake balance per entry (see custom_stake_amount)
+    stake_risk_percentage = 0.02
+
     ####################################################
     # INDICATORS
     ####################################################
@@ -176,32 +181,17 @@ class SmartScalpingDCA(IStrategy):
                             min_stake: float, max_stake: float,
                             leverage: float, entry_tag: Optional[str], # entry_tag can be None
                             side: str, **kwargs) -> float:
-        # Example: Risk 2% of available stake balance per trade
-        try:
-            balance = self.wallets.get_available_stake_amount()
-
-            if balance is None or balance <= 0:
-                logger.warning(f"Could not get valid available stake balance for {pair} (Balance: {balance}). Falling back to proposed_stake: {proposed_stake}")
-                return max(min_stake, min(proposed_stake, max_stake))
-
-            desired_risk_percentage = 0.02 # Risk 2%
-            # For spot, leverage is 1. For futures, it's the trade leverage.
-            effective_leverage = leverage if leverage and leverage > 0 else 1.0
-            
-            # Amount of stake currency to risk
-            amount_to_risk = balance * desired_risk_percentage
-            
-            # This is the actual stake size based on the amount to risk
-            calculated_stake = amount_to_risk / effective_leverage 
-
-            final_stake = max(min_stake, min(calculated_stake, max_stake))
-            
-            # logger.info(f"CustomStake: Pair: {pair}, Balance: {balance:.2f}, Risk%: {desired_risk_percentage*100}%, Leverage: {effective_leverage}, CalcStake: {calculated_stake:.2f}, FinalStake: {final_stake:.2f}")
-            return final_stake
-
-        except Exception as e:
-            logger.error(f"Error in custom_stake_amount for {pair}: {e}. Falling back to proposed_stake.")
-            return max(min_stake, min(proposed_stake, max_stake))
+        # Risk 2% of the available stake balance per trade (initial entries and DCA orders).
+        # The balance is snapshotted once per bot iteration and every stake granted in the
+        # iteration is reserved against it, so concurrent entries / DCAs cannot overdraw it.
+        # For spot, leverage is 1. For futures, it's the trade leverage.
+        final_stake = self.stake_sizer.risk_stake(
+            pair, self.stake_risk_percentage, min_stake, max_stake, leverage,
+            fallback=max(min_stake or 0, min(proposed_stake, max_stake)),
+        )
+        if final_stake is None:
+            return 0  # Not enough balance left in this iteration - skip the entry
+        return final_stake
 
     ####################################################
     # DCA (POSITION ADJUSTMENT) LOGIC
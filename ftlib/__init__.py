@@ -0,0 +1,8 @@
+"""
+Shared helpers for the freqtrade side of the platform.
+
+Strategies, hyperopt losses and the maintenance scripts import from here.
+Freqtrade is started with the backend root as working directory
+(see ``startFreqtradeProcess`` in ``services/freqtradeManager.js``), so the
+package is importable as ``ftlib`` from every instance.
+"""
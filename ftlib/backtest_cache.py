@@ -0,0 +1,414 @@
+"""
+Content-addressed cache of backtest results.
+
+A backtest result depends only on the strategy code, the effective config, the simulated
+timerange and the candles handed to the simulator. ``backtest_key`` hashes exactly those:
+
+- the strategy file, its parameter file values and the repository modules it imports
+  (``ftlib`` helpers, siblings in its directory),
+- the config without fields that cannot change results (credentials, API server,
+  Telegram, logging, paths, export options, ...),
+- the timerange after freqtrade's startup-candle adjustment,
+- the content of every candle frame used (main, detail and funding / mark data), so
+  appending newer candles to a file does not invalidate runs that end earlier.
+
+Candles a strategy reads through the DataProvider (informative pairs) are only known once
+it ran. Those reads are recorded on a miss and stored with the entry as file fingerprints.
+An entry whose informative files changed since is treated as a miss.
+
+Entries live in ``BACKTEST_CACHE_DIR`` (default ``data/backtest_cache``) as
+``<key[:2]>/<key>.zip`` / ``.meta.json`` / ``.json``. On a hit the zip is copied into
+the run's ``backtest_results`` under its original name, so it shows up like any other run.
+Copies, not hardlinks: freqtrade rewrites a result file of the same name in place, which
+would change the cached entry through a shared inode.
+
+``ftlib.backtest_pool`` uses the cache for every job. For the command line (same
+arguments as ``freqtrade backtesting``, one strategy):
+    python -m ftlib.backtest_cache backtesting --config user_data/config.json --strategy BbandRsi \\
+        --timerange 20250601-20250630
+    python -m ftlib.backtest_cache --prune 30
+"""
+import ast
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+from ftlib.strategy_loader import ROOT
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("BACKTEST_CACHE_DIR") or ROOT / "data" / "backtest_cache")
+
+# Bump when the key composition changes.
+KEY_VERSION = 2
+
+# Config keys that cannot change a backtest result.
+IRRELEVANT_CONFIG_KEYS = (
+    "original_config", "config_files", "add_config_files", "internals", "runmode", "verbosity",
+    "logfile", "log_config", "print_colorized", "api_server", "telegram", "webhook", "discord",
+    "producer", "external_message_consumer", "db_url", "bot_name", "initial_state",
+    "force_entry_enable", "user_data_dir", "datadir", "strategy_path", "recursive_strategy_search",
+    "freqaimodel_path", "export", "exportfilename", "exportdirectory", "backtest_show_pair_list",
+    "backtest_breakdown", "backtest_cache", "disableparamexport", "timerange", "strategy_list",
+    "dry_run", "cancel_open_orders_on_exit", "reduce_df_footprint",
+)
+
+IRRELEVANT_EXCHANGE_KEYS = (
+    "key", "secret", "password", "uid", "walletAddress", "privateKey", "ccxt_config",
+    "ccxt_async_config", "ccxt_sync_config", "log_responses",
+)
+
+
+def normalized_config(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    The effective config without keys that cannot change a result.
+    """
+    normalized = {key: value for key, value in config.items() if key not in IRRELEVANT_CONFIG_KEYS}
+    if isinstance(config.get("exchange"), dict):
+        normalized["exchange"] = {
+            key: value for key, value in config["exchange"].items() if key not in IRRELEVANT_EXCHANGE_KEYS
+        }
+    return normalized
+
+
+def _imported_names(path: Path) -> set[str]:
+    """
+    Absolute module names a source file imports anywhere (function-level imports and
+    ``lazy_import`` / ``lazy_attr`` calls included). ``from a import b`` yields ``a`` and
+    ``a.b``, since ``b`` may be a submodule.
+    """
+    from ftlib.startup_profile import LAZY_FACTORIES
+
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"), filename=str(path))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.Call) and getattr(node.func, "id", None) in LAZY_FACTORIES \
+                and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+            names.add(node.args[0].value)
+    return names
+
+
+def _module_source(name: str) -> Optional[Path]:
+    parent = name.rpartition(".")[0]
+    if parent:
+        # ``a.b.Name`` with ``a.b`` a plain module: find_spec would import ``a.b`` to fail.
+        package = _module_source(parent)
+        if package is None or package.name != "__init__.py":
+            return None
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    origin = spec.origin if spec else None
+    return Path(origin).resolve() if origin and origin.endswith(".py") else None
+
+
+def _local_modules(strategy) -> list[Path]:
+    """
+    Source files of repository modules the strategy imports, followed transitively:
+    ``ftlib`` modules and modules next to the strategy file. Read from the source, as
+    freqtrade executes strategy files without registering them in ``sys.modules``.
+    """
+    strategy_file = Path(strategy.__file__).resolve()
+    strategy_dir = strategy_file.parent
+    local_tops: dict[str, bool] = {}
+    files: set[Path] = set()
+    pending = [strategy_file]
+    while pending:
+        for name in _imported_names(pending.pop()):
+            top = name.split(".")[0]
+            if top not in local_tops:
+                # Only top-level lookups here: they locate without importing anything.
+                source = _module_source(top)
+                local_tops[top] = top == "ftlib" or (source is not None and source.parent == strategy_dir)
+            if not local_tops[top]:
+                continue
+            source = _module_source(name)
+            if source is not None and source not in files and source != strategy_file:
+                files.add(source)
+                pending.append(source)
+    return sorted(files)
+
+
+def strategy_digest(strategy) -> str:
+    digest = hashlib.sha256(Path(strategy.__file__).read_bytes())
+    digest.update(json.dumps(getattr(strategy, "_ft_params_from_file", None), sort_keys=True, default=str).encode())
+    for source in _local_modules(strategy):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def frames_digest(frames: dict[str, pd.DataFrame]) -> str:
+    """
+    Content hash of ``{pair: DataFrame}`` (row hashes of all columns, in pair order).
+    """
+    digest = hashlib.sha256()
+    for pair in sorted(frames):
+        frame = frames[pair]
+        digest.update(f"{pair}:{len(frame)}:{','.join(map(str, frame.columns))}".encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def backtest_key(backtesting, data: dict[str, pd.DataFrame], timerange) -> str:
+    """
+    Cache key of ``backtesting``'s (single) strategy on ``data`` over ``timerange``.
+    """
+    from freqtrade import __version__
+
+    parts = {
+        "version": KEY_VERSION,
+        "freqtrade": __version__,
+        "strategy": strategy_digest(backtesting.strategylist[0]),
+        "config": normalized_config(backtesting.config),
+        "timerange": [timerange.startts, timerange.stopts],
+        "data": frames_digest(data),
+        "detail": frames_digest(getattr(backtesting, "detail_data", None) or {}),
+        "futures": frames_digest(getattr(backtesting, "futures_data", None) or {}),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _file_fingerprint(path: Path) -> Optional[list]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+@contextmanager
+def record_reads(backtesting) -> Iterator[dict[str, Optional[list]]]:
+    """
+    Collect fingerprints of the candle files the strategy reads through the DataProvider,
+    besides the main pairs' own candles (those are part of the key).
+    """
+    from freqtrade.data.history import get_datahandler
+    from freqtrade.enums import CandleType
+
+    config = backtesting.config
+    dataprovider = backtesting.dataprovider
+    handler = get_datahandler(config["datadir"], config.get("dataformat_ohlcv", "feather"))
+    default_type = CandleType.from_string(config.get("candle_type_def", CandleType.SPOT))
+    main_pairs = set(backtesting.pairlists.whitelist)
+    original = dataprovider.historic_ohlcv
+    reads: dict[str, Optional[list]] = {}
+
+    def historic_ohlcv(pair: str, timeframe: str, candle_type: str = ""):
+        candle_type_ = CandleType.from_string(candle_type) if candle_type else default_type
+        if not (pair in main_pairs and timeframe == backtesting.timeframe and candle_type_ == default_type):
+            path = handler._pair_data_filename(handler._datadir, pair, timeframe, candle_type_)
+            reads[str(path)] = _file_fingerprint(path)
+        return original(pair, timeframe, candle_type)
+
+    dataprovider.historic_ohlcv = historic_ohlcv
+    try:
+        yield reads
+    finally:
+        del dataprovider.historic_ohlcv
+
+
+def _copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp")
+    shutil.copy2(source, tmp)
+    tmp.replace(target)
+
+
+def _metadata_file(zip_file: Path) -> Path:
+    return zip_file.with_suffix(".meta.json")
+
+
+class BacktestCache:
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR):
+        self.root = Path(root)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        directory = self.root / key[:2]
+        return directory / f"{key}.json", directory / f"{key}.zip"
+
+    def lookup(self, key: str, results_dir: Path) -> Optional[dict[str, Any]]:
+        """
+        The stored entry for ``key`` with its zip placed in ``results_dir`` (``file``),
+        or None on a miss.
+        """
+        entry_file, zip_file = self._paths(key)
+        try:
+            entry = json.loads(entry_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if not zip_file.is_file():
+            return None
+        changed = [path for path, fingerprint in entry["reads"].items()
+                   if _file_fingerprint(Path(path)) != fingerprint]
+        if changed:
+            logger.info(f"Backtest cache: {len(changed)} informative files changed since {key[:12]}.")
+            return None
+
+        target = Path(results_dir) / entry["name"]
+        if not target.exists():
+            _copy(zip_file, target)
+            if _metadata_file(zip_file).is_file():
+                _copy(_metadata_file(zip_file), _metadata_file(target))
+        (target.parent / ".last_result.json").write_text(json.dumps({"latest_backtest": target.name}))
+        os.utime(entry_file)  # Last use, for prune()
+        return {**entry, "file": str(target)}
+
+    def lookup_result(self, key: str, results_dir: Path) -> Optional[dict[str, Any]]:
+        """
+        The stored ``result`` (see ``result_summary``) with ``file``, or None on a miss.
+        Entries stored without a result count as misses.
+        """
+        hit = self.lookup(key, results_dir)
+        if hit is None or hit.get("result") is None:
+            return None
+        return {**hit["result"], "file": hit["file"]}
+
+    def store(self, key: str, zip_file: Path, reads: dict[str, Optional[list]],
+              result: Optional[dict[str, Any]] = None) -> None:
+        """
+        Keep ``zip_file`` (and its ``.meta.json``) under ``key``. The entry file is written
+        last, so a partly stored entry is never found.
+        """
+        entry_file, cached_zip = self._paths(key)
+        zip_file = Path(zip_file)
+        _copy(zip_file, cached_zip)
+        if _metadata_file(zip_file).is_file():
+            _copy(_metadata_file(zip_file), _metadata_file(cached_zip))
+        entry = {"name": zip_file.name, "created": time.time(), "reads": reads, "result": result}
+        tmp = entry_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, default=str))
+        tmp.replace(entry_file)
+
+    def prune(self, max_age_days: float) -> int:
+        """
+        Drop entries not used for ``max_age_days``. Returns the number removed.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for entry_file in self.root.glob("*/*.json"):
+            if entry_file.name.endswith(".meta.json") or entry_file.stat().st_mtime >= cutoff:
+                continue
+            key = entry_file.stem
+            entry_file.unlink()
+            for suffix in (".zip", ".meta.json"):
+                (entry_file.parent / f"{key}{suffix}").unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def result_summary(stats: dict[str, Any], pairs: int) -> dict[str, Any]:
+    """
+    What an entry keeps besides the zip: the strategy's summary row and the simulated range
+    of a single-strategy result (as returned by ``generate_backtest_stats``).
+    """
+    summary = stats["strategy_comparison"][0]
+    strategy = stats["strategy"][summary["key"]]
+    return {
+        "summary": json.loads(json.dumps(summary, default=str)),
+        "min_date": datetime.fromtimestamp(strategy["backtest_start_ts"] / 1000, tz=timezone.utc).isoformat(),
+        "max_date": datetime.fromtimestamp(strategy["backtest_end_ts"] / 1000, tz=timezone.utc).isoformat(),
+        "pairs": pairs,
+    }
+
+
+def results_dir(config: dict[str, Any]) -> Path:
+    """
+    Directory freqtrade exports backtest results of ``config`` to.
+    """
+    export = Path(config["exportfilename"])
+    return export if export.suffix == "" else export.parent
+
+
+# --- freqtrade backtesting, through the cache ----------------------------------------------
+
+def _cached_start(self) -> None:
+    from freqtrade.data.btanalysis import load_backtest_stats
+    from freqtrade.optimize.optimize_reports import show_backtest_results
+
+    if len(self.strategylist) != 1 or self.config.get("export", "none") == "none":
+        # Entries hold one strategy's exported result.
+        return _ORIGINAL_START(self)
+
+    data, timerange = self.load_bt_data()
+    self.load_bt_data_detail()
+    cache = BacktestCache()
+    key = backtest_key(self, data, timerange)
+    directory = results_dir(self.config)
+    hit = cache.lookup(key, directory)
+    if hit is not None:
+        logger.info(f"Backtest cache hit {key[:12]}: {hit['file']}")
+        show_backtest_results(self.config, load_backtest_stats(hit["file"]))
+        return
+
+    # Run with the data loaded above.
+    self.load_bt_data = lambda: (data, timerange)
+    self.load_bt_data_detail = lambda: None
+    previous = _latest_result(directory)
+    with record_reads(self) as reads:
+        _ORIGINAL_START(self)
+    latest = _latest_result(directory)
+    if latest is not None and latest != previous:  # Not when freqtrade reused a prior result
+        result = result_summary(load_backtest_stats(directory / latest), len(data))
+        cache.store(key, directory / latest, reads, result)
+        logger.info(f"Backtest cache: stored {key[:12]}.")
+
+
+def _latest_result(directory: Path) -> Optional[str]:
+    from freqtrade.data.btanalysis import get_latest_backtest_filename
+
+    try:
+        return get_latest_backtest_filename(directory)
+    except ValueError:
+        return None
+
+
+_ORIGINAL_START = None
+
+
+def install() -> None:
+    """
+    Patch freqtrade's backtesting to go through the cache. Idempotent.
+    """
+    global _ORIGINAL_START
+    from freqtrade.optimize.backtesting import Backtesting
+
+    if _ORIGINAL_START is not None:
+        return
+    _ORIGINAL_START = Backtesting.start
+    Backtesting.start = _cached_start
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    argv = argv if argv is not None else sys.argv[1:]
+    if argv[:1] == ["--prune"]:
+        removed = BacktestCache().prune(float(argv[1]))
+        print(f"Removed {removed} cache entries.")
+        return
+
+    from freqtrade.main import main as freqtrade_main
+
+    install()
+    freqtrade_main(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,764 @@
+"""
+Resident backtest workers with hot candles in memory.
+
+Every backtest from the API used to be a fresh ``freqtrade backtesting`` process: the
+interpreter, freqtrade and the strategy's libraries imported, markets and leverage tiers
+loaded, candles read from feather - for runs that often take less time than that start-up.
+The pool keeps ``--workers`` processes resident with freqtrade imported and one exchange
+object per exchange / trading mode (API keys stripped). The dispatcher keeps recently used
+candle files in shared memory (least recently used dropped first, bounded by
+``--cache-mb``); a job copies only its timerange plus startup candles out of the blocks.
+
+Jobs arrive over a local HTTP API and are scheduled fairly: at most ``--per-user`` jobs of
+one user run at once, and a free worker takes the oldest job of the user with the fewest
+running jobs.
+
+    POST   /jobs               {"user", "config", "strategy", "timerange", "timeframe"}
+    GET    /jobs/<id>          state, last progress and result
+    GET    /jobs/<id>/events   progress and result as NDJSON, streamed until the job ends
+    DELETE /jobs/<id>          cancel a queued job
+    GET    /status             workers, queue and candle cache
+
+Results are stored as ``freqtrade backtesting --export trades`` stores them (the
+instance's ``backtest_results``); the final event carries the file and the strategy's
+summary row. Repeated runs are answered from ``ftlib.backtest_cache`` (``"cached": true``);
+runs extending an earlier one's end date resume from its checkpoint
+(``ftlib.incremental_backtest``, ``"resumed_from"``). ``--datadir`` points all jobs at one shared data directory, so instances
+share hot candles.
+
+Usage (the API reaches it at ``BACKTEST_POOL_URL``, default ``http://127.0.0.1:8765``):
+    python -m ftlib.backtest_pool --workers 4 --cache-mb 2048 --datadir user_data/data/binance
+    pm2 start python --name ft-backtest-pool -- -m ftlib.backtest_pool --workers 4
+"""
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from ftlib.backtest_cache import BacktestCache, backtest_key, record_reads, result_summary, results_dir
+from ftlib.fork_server import PRELOAD_MODULES, preload, strategy_imports
+from ftlib.incremental_backtest import CheckpointStore, run_backtest
+from ftlib.shared_candles import SharedCandles, SharedFrameSpec, copy_range, release
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = int(os.environ.get("BACKTEST_POOL_PORT") or 8765)
+
+DEFAULT_CACHE_MB = 2048
+
+DEFAULT_PER_USER = 1
+
+# Further submissions of a user are refused (HTTP 429) while this many are queued.
+MAX_QUEUED_PER_USER = 10
+
+DEFAULT_JOB_TIMEOUT = 1800.0
+
+# Finished jobs stay queryable this long.
+JOB_TTL = 3600.0
+
+PROGRESS_INTERVAL = 0.5
+
+WORKER_PRELOAD = PRELOAD_MODULES + (
+    "freqtrade.optimize.backtesting", "freqtrade.optimize.optimize_reports", "freqtrade.data.history",
+    "freqtrade.data.metrics",
+)
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class PoolFull(Exception):
+    pass
+
+
+# --- Dispatcher: candle cache -------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CandleKey:
+    datadir: str
+    pair: str
+    timeframe: str
+    candle_type: str
+    data_format: str
+
+
+def _candle_file(key: CandleKey) -> tuple[Any, Path]:
+    from freqtrade.data.history import get_datahandler
+    from freqtrade.enums import CandleType
+
+    handler = get_datahandler(Path(key.datadir), key.data_format)
+    path = handler._pair_data_filename(
+        Path(key.datadir), key.pair, key.timeframe, CandleType.from_string(key.candle_type)
+    )
+    return handler, path
+
+
+class _CachedCandles:
+
+    def __init__(self, key: CandleKey, mtime: int):
+        from freqtrade.data.history import load_pair_history
+        from freqtrade.enums import CandleType
+
+        handler, _ = _candle_file(key)
+        frame = load_pair_history(
+            pair=key.pair, timeframe=key.timeframe, datadir=Path(key.datadir),
+            data_handler=handler, candle_type=CandleType.from_string(key.candle_type),
+        )
+        self.key = key
+        self.mtime = mtime
+        self.shared = SharedCandles({key.pair: frame})
+        self.spec: SharedFrameSpec = self.shared.specs[0]
+        self.nbytes = self.shared.nbytes
+        self.users = 0
+        self.retired = False
+
+
+class CandleCache:
+    """
+    Whole candle files in shared memory, least recently used dropped first once above
+    ``max_bytes`` (blocks pinned by running jobs are kept). A file that changed on disk
+    since it was read (new candles downloaded) is read again on its next use. Names of
+    dropped blocks go to ``on_drop`` so workers unmap them.
+    """
+
+    def __init__(self, max_bytes: int, on_drop):
+        self.max_bytes = max_bytes
+        self.on_drop = on_drop
+        self._entries: "OrderedDict[CandleKey, _CachedCandles]" = OrderedDict()
+        self._key_locks: dict[CandleKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, keys: list[CandleKey]) -> dict[CandleKey, Optional[_CachedCandles]]:
+        """
+        Pinned entries for ``keys`` (None where there is no data). Pass them to ``release``.
+        """
+        pinned = {}
+        for key in keys:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                pinned[key] = self._acquire(key)
+        self._evict()
+        return pinned
+
+    def _acquire(self, key: CandleKey) -> Optional[_CachedCandles]:
+        try:
+            mtime = _candle_file(key)[1].stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime == mtime:
+                self._entries.move_to_end(key)
+                entry.users += 1
+                self.hits += 1
+                return entry
+        entry = _CachedCandles(key, mtime)
+        with self._lock:
+            stale = self._entries.pop(key, None)
+            self._entries[key] = entry
+            entry.users += 1
+            self.misses += 1
+            dropped = self._retire(stale) if stale is not None else []
+        if dropped:
+            self.on_drop(dropped)
+        return entry
+
+    def _retire(self, entry: _CachedCandles) -> list[str]:
+        entry.retired = True
+        if entry.users:
+            return []
+        entry.shared.close()
+        return [entry.spec.shm_name]
+
+    def release(self, entries: list[_CachedCandles]) -> None:
+        dropped = []
+        with self._lock:
+            for entry in entries:
+                entry.users -= 1
+                if entry.retired and not entry.users:
+                    entry.shared.close()
+                    dropped.append(entry.spec.shm_name)
+        if dropped:
+            self.on_drop(dropped)
+        self._evict()
+
+    def _evict(self) -> None:
+        dropped = []
+        with self._lock:
+            size = sum(entry.nbytes for entry in self._entries.values())
+            for key in list(self._entries):
+                if size <= self.max_bytes:
+                    break
+                entry = self._entries[key]
+                if entry.users:
+                    continue
+                del self._entries[key]
+                size -= entry.nbytes
+                dropped += self._retire(entry)
+        if dropped:
+            self.on_drop(dropped)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "mb": round(sum(entry.nbytes for entry in self._entries.values()) / 1e6, 1),
+                "max_mb": round(self.max_bytes / 1e6, 1),
+                "pinned": sum(1 for entry in self._entries.values() if entry.users),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry.shared.close()
+            self._entries.clear()
+
+
+# --- Worker process -----------------------------------------------------------------------
+
+def _configuration_class():
+    from freqtrade.configuration import Configuration
+
+    class PoolConfiguration(Configuration):
+        """
+        Leaves the worker's logging alone - instance configs name the bot's logfile.
+        """
+
+        def _process_logging_options(self, config: dict[str, Any]) -> None:
+            config.setdefault("verbosity", 0)
+
+    return PoolConfiguration
+
+
+class _JobRunner:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.exchanges: dict[tuple, Any] = {}
+        self.configuration = _configuration_class()
+        self.cache = BacktestCache()
+        self.checkpoints = CheckpointStore()
+
+    def config(self, request: dict[str, Any]) -> dict[str, Any]:
+        from freqtrade.enums import RunMode
+
+        args = {
+            "config": [request["config"]],
+            "strategy": request["strategy"],
+            "timerange": request["timerange"],
+            "export": "trades",
+        }
+        for option in ("timeframe", "datadir"):
+            if request.get(option):
+                args[option] = request[option]
+        return self.configuration(args, RunMode.BACKTEST).get_config()
+
+    def exchange(self, config: dict[str, Any]):
+        """
+        One exchange per (exchange, trading mode, margin mode), with markets and leverage
+        tiers loaded once. Created from a copy of the first job's config without its keys.
+        """
+        from freqtrade.resolvers import ExchangeResolver
+
+        key = (config["exchange"]["name"], config.get("trading_mode", "spot"), config.get("margin_mode", ""))
+        if key not in self.exchanges:
+            exchange_config = deepcopy(config)
+            for secret in ("key", "secret", "password", "uid"):
+                exchange_config["exchange"][secret] = ""
+            self.exchanges[key] = ExchangeResolver.load_exchange(exchange_config, load_leverage_tiers=True)
+        return self.exchanges[key]
+
+    def _receive_data(self) -> dict[str, Optional[SharedFrameSpec]]:
+        while True:
+            kind, payload = self.conn.recv()
+            if kind == "data":
+                return payload
+            if kind == "release":
+                release(payload)
+
+    def load(self, backtesting):
+        """
+        The job's candles from the dispatcher's cache, trimmed as ``load_bt_data`` trims
+        them: the timerange padded by the strategy's startup candles.
+        """
+        from freqtrade.enums import CandleType
+        from freqtrade.exceptions import OperationalException
+        from freqtrade.exchange import timeframe_to_seconds
+
+        config = backtesting.config
+        candle_type = CandleType(config.get("candle_type_def", CandleType.SPOT))
+        keys = [
+            CandleKey(str(config["datadir"]), pair, backtesting.timeframe, candle_type.value,
+                      config.get("dataformat_ohlcv", "feather"))
+            for pair in backtesting.pairlists.whitelist
+        ]
+        self.conn.send(("need", keys))
+        specs = self._receive_data()
+
+        timerange = backtesting.timerange
+        seconds = timeframe_to_seconds(backtesting.timeframe)
+        start = timerange.startdt - timedelta(seconds=seconds * backtesting.required_startup) if timerange.startts else None
+        end = timerange.stopdt if timerange.stopts else None
+        data = {}
+        for pair, spec in specs.items():
+            frame = copy_range(spec, start, end) if spec is not None else None
+            if frame is None or frame.empty:
+                logger.warning(f"No data for {pair} {backtesting.timeframe} in {config['datadir']}.")
+                continue
+            data[pair] = frame
+        if not data:
+            raise OperationalException("No data found. Terminating.")
+        min_date = min(frame["date"].iloc[0] for frame in data.values())
+        timerange.adjust_start_if_necessary(seconds, backtesting.required_startup, min_date)
+        return data, timerange
+
+    def run(self, request: dict[str, Any]) -> dict[str, Any]:
+        from freqtrade.data.metrics import combined_dataframes_with_rel_mean
+        from freqtrade.optimize.backtesting import Backtesting
+        from freqtrade.optimize.optimize_reports import generate_backtest_stats, store_backtest_results
+
+        start = time.perf_counter()
+        config = self.config(request)
+        backtesting = Backtesting(config, exchange=self.exchange(config))
+        data, timerange = self.load(backtesting)
+        backtesting.load_bt_data_detail()
+
+        key = backtest_key(backtesting, data, timerange)
+        hit = self.cache.lookup_result(key, results_dir(config))
+        if hit is not None:
+            return {**hit, "cached": True, "seconds": round(time.perf_counter() - start, 3)}
+
+        outcome: dict[str, Any] = {}
+
+        def backtest() -> None:
+            try:
+                outcome["dates"] = run_backtest(backtesting, data, timerange, self.checkpoints)
+            except BaseException as e:
+                outcome["error"] = e
+
+        with record_reads(backtesting) as reads:
+            thread = threading.Thread(target=backtest, name="backtest", daemon=True)
+            thread.start()
+            reported = None
+            while thread.is_alive():
+                thread.join(PROGRESS_INTERVAL)
+                progress = (str(backtesting.progress.action), backtesting.progress.progress)
+                if progress != reported:
+                    self.conn.send(("progress", {"action": progress[0], "progress": progress[1]}))
+                    reported = progress
+        if "error" in outcome:
+            raise outcome["error"]
+
+        min_date, max_date, resumed_from = outcome["dates"]
+        stats = generate_backtest_stats(data, backtesting.all_results, min_date=min_date, max_date=max_date)
+        market_change = combined_dataframes_with_rel_mean(data, min_date, max_date)
+        strategy = backtesting.strategylist[0]
+        # Jobs of one instance share its backtest_results and may finish within the same
+        # second; freqtrade would overwrite the earlier job's file under the same name.
+        path = store_backtest_results(
+            config, stats, datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f"), market_change_data=market_change,
+            analysis_results=backtesting.analysis_results,
+            strategy_files={strategy.get_strategy_name(): strategy.__file__},
+        )
+        result = result_summary(stats, len(data))
+        if path:
+            self.cache.store(key, path, reads, result)
+        return {**result, "file": str(path) if path else None, "cached": False,
+                "resumed_from": resumed_from.isoformat() if resumed_from else None,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+
+def worker_main(conn) -> None:
+    """
+    Resident worker: runs one job at a time as the dispatcher sends them.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The dispatcher shuts the pool down
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    preload(list(WORKER_PRELOAD) + strategy_imports())
+    runner = _JobRunner(conn)
+    while True:
+        try:
+            kind, payload = conn.recv()
+        except EOFError:
+            return
+        if kind == "release":
+            release(payload)
+        elif kind == "job":
+            try:
+                conn.send(("result", runner.run(payload)))
+            except Exception as e:
+                logger.exception(f"Backtest of {payload.get('strategy')} failed")
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+            gc.collect()
+        elif kind == "stop":
+            return
+
+
+# --- Dispatcher: jobs and workers ---------------------------------------------------------
+
+@dataclass
+class Job:
+    id: str
+    user: str
+    config: str
+    strategy: str
+    timerange: str
+    timeframe: Optional[str] = None
+    state: str = "queued"
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    progress: Optional[dict[str, Any]] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    def public(self) -> dict[str, Any]:
+        return {name: value for name, value in vars(self).items() if name != "events"}
+
+
+class _Worker:
+
+    def __init__(self, index: int, context):
+        self.index = index
+        self.context = context
+        self.process = None
+        self.conn = None
+        self.job: Optional[Job] = None
+        self.dropped: list[str] = []
+
+    def start(self) -> None:
+        parent, child = self.context.Pipe()
+        self.process = self.context.Process(
+            target=worker_main, args=(child,), name=f"backtest-worker-{self.index}", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.dropped = []  # A new process has nothing mapped
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        self.conn.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+
+class BacktestPool:
+
+    def __init__(self, workers: int, cache_mb: int = DEFAULT_CACHE_MB, per_user: int = DEFAULT_PER_USER,
+                 datadir: Optional[Path] = None, job_timeout: float = DEFAULT_JOB_TIMEOUT):
+        self.per_user = per_user
+        self.datadir = datadir
+        self.job_timeout = job_timeout
+        self.cond = threading.Condition()
+        self.jobs: dict[str, Job] = {}
+        self.queue: list[Job] = []
+        self.running: Counter = Counter()
+        self.cache = CandleCache(cache_mb * 1024 * 1024, self._drop_blocks)
+        context = multiprocessing.get_context("spawn")
+        self.workers = [_Worker(index, context) for index in range(workers)]
+        self._stopping = False
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+            threading.Thread(target=self._serve, args=(worker,), name=f"serve-{worker.index}", daemon=True).start()
+
+    def submit(self, request: dict[str, Any]) -> Job:
+        missing = [name for name in ("user", "config", "strategy", "timerange") if not request.get(name)]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        with self.cond:
+            self._prune()
+            user = str(request["user"])
+            if sum(1 for job in self.queue if job.user == user) >= MAX_QUEUED_PER_USER:
+                raise PoolFull(f"{MAX_QUEUED_PER_USER} backtests already queued")
+            job = Job(secrets.token_hex(8), user, str(request["config"]), str(request["strategy"]),
+                      str(request["timerange"]), request.get("timeframe") or None)
+            self.jobs[job.id] = job
+            self.queue.append(job)
+            self._emit(job, {"event": "queued", "ahead": len(self.queue) - 1})
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        with self.cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return False
+            self.queue.remove(job)
+            self._finish(job, "cancelled")
+            return True
+
+    def follow(self, job: Job, timeout: float = 15.0) -> Iterator[Optional[dict[str, Any]]]:
+        """
+        The job's events from the first, until it finished. Yields None every ``timeout``
+        seconds without news so callers can notice closed connections.
+        """
+        sent = 0
+        while True:
+            with self.cond:
+                if sent == len(job.events) and job.state not in FINISHED:
+                    self.cond.wait(timeout)
+                events = job.events[sent:]
+                finished = job.state in FINISHED
+            sent += len(events)
+            if not events and not finished:
+                yield None
+            yield from events
+            if finished and sent == len(job.events):
+                return
+
+    def _emit(self, job: Job, event: dict[str, Any]) -> None:
+        with self.cond:
+            event = {"time": time.time(), **event}
+            job.events.append(event)
+            if event["event"] == "progress":
+                job.progress = {"action": event["action"], "progress": event["progress"]}
+            self.cond.notify_all()
+
+    def _finish(self, job: Job, state: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        with self.cond:
+            if job.started is not None:
+                self.running[job.user] -= 1
+            job.state, job.result, job.error, job.finished = state, result, error, time.time()
+            self._emit(job, {"event": state, "result": result, "error": error})
+
+    def _prune(self) -> None:
+        expired = [job.id for job in self.jobs.values()
+                   if job.state in FINISHED and time.time() - job.finished > JOB_TTL]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def _next_job(self) -> Optional[Job]:
+        """
+        Oldest queued job of the user with the fewest running jobs, within ``per_user``.
+        """
+        eligible = [job for job in self.queue if self.running[job.user] < self.per_user]
+        if not eligible:
+            return None
+        return min(eligible, key=lambda job: (self.running[job.user], job.created))
+
+    def _drop_blocks(self, names: list[str]) -> None:
+        with self.cond:
+            for worker in self.workers:
+                worker.dropped.extend(names)
+            self.cond.notify_all()
+
+    def _serve(self, worker: _Worker) -> None:
+        """
+        Feeds one worker. Everything sent to a worker goes through its serve thread;
+        unmap requests for dropped blocks wait while it is busy.
+        """
+        while True:
+            with self.cond:
+                while not self._stopping and not worker.dropped and self._next_job() is None:
+                    self.cond.wait()
+                if self._stopping:
+                    return
+                dropped, worker.dropped = worker.dropped, []
+                job = self._next_job()
+                if job is not None:
+                    self.queue.remove(job)
+                    self.running[job.user] += 1
+                    job.state, job.started, worker.job = "running", time.time(), job
+            try:
+                if dropped:
+                    worker.conn.send(("release", dropped))
+                if job is not None:
+                    self._emit(job, {"event": "started", "worker": worker.index})
+                    self._run(worker, job)
+            except (EOFError, OSError):
+                if job is not None and job.state == "running":
+                    self._finish(job, "failed", error="backtest worker exited")
+                if not self._stopping:
+                    logger.warning(f"Backtest worker {worker.index} exited, restarting it.")
+                    worker.restart()
+            finally:
+                worker.job = None
+
+    def _run(self, worker: _Worker, job: Job) -> None:
+        pinned: list[_CachedCandles] = []
+        deadline = time.monotonic() + self.job_timeout
+        worker.conn.send(("job", {
+            "config": job.config, "strategy": job.strategy, "timerange": job.timerange,
+            "timeframe": job.timeframe, "datadir": str(self.datadir) if self.datadir else None,
+        }))
+        try:
+            while True:
+                if not worker.conn.poll(max(deadline - time.monotonic(), 0)):
+                    self._finish(job, "failed", error=f"timed out after {self.job_timeout:.0f}s")
+                    worker.restart()
+                    return
+                kind, payload = worker.conn.recv()
+                if kind == "need":
+                    entries = self.cache.acquire(payload)
+                    pinned += [entry for entry in entries.values() if entry is not None]
+                    worker.conn.send(("data", {
+                        key.pair: entry.spec if entry is not None else None for key, entry in entries.items()
+                    }))
+                elif kind == "progress":
+                    self._emit(job, {"event": "progress", **payload})
+                elif kind == "result":
+                    self._finish(job, "done", result=payload)
+                    return
+                elif kind == "error":
+                    self._finish(job, "failed", error=payload)
+                    return
+        finally:
+            self.cache.release(pinned)
+
+    def status(self) -> dict[str, Any]:
+        with self.cond:
+            return {
+                "workers": [
+                    {"index": worker.index, "pid": worker.process.pid if worker.process else None,
+                     "alive": bool(worker.process and worker.process.is_alive()),
+                     "job": worker.job.id if worker.job else None}
+                    for worker in self.workers
+                ],
+                "queued": len(self.queue),
+                "running": {user: count for user, count in self.running.items() if count},
+                "cache": self.cache.stats(),
+            }
+
+    def stop(self) -> None:
+        with self.cond:
+            self._stopping = True
+            self.cond.notify_all()
+        for worker in self.workers:
+            worker.stop()
+        self.cache.close()
+
+
+# --- HTTP API -----------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    pool: BacktestPool
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+    def _parts(self) -> list[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def _json(self, status: int, body: Any) -> None:
+        data = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job(self, parts: list[str]) -> Optional[Job]:
+        job = self.pool.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+        if job is None:
+            self._json(404, {"error": "no such job"})
+        return job
+
+    def do_GET(self) -> None:
+        parts = self._parts()
+        if parts == ["status"]:
+            return self._json(200, self.pool.status())
+        job = self._job(parts)
+        if job is None:
+            return
+        if len(parts) == 2:
+            return self._json(200, job.public())
+        if parts[2:] != ["events"]:
+            return self._json(404, {"error": "not found"})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for event in self.pool.follow(job):
+                self.wfile.write(json.dumps(event or {"event": "heartbeat"}, default=str).encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self) -> None:
+        if self._parts() != ["jobs"]:
+            return self._json(404, {"error": "not found"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            job = self.pool.submit(request)
+        except (ValueError, AttributeError) as e:
+            return self._json(400, {"error": str(e)})
+        except PoolFull as e:
+            return self._json(429, {"error": str(e)})
+        self._json(202, {"id": job.id, "state": job.state, "ahead": job.events[0]["ahead"]})
+
+    def do_DELETE(self) -> None:
+        parts = self._parts()
+        job = self._job(parts)
+        if job is None:
+            return
+        if not self.pool.cancel(job.id):
+            return self._json(409, {"error": f"job is {job.state}"})
+        self._json(200, job.public())
+
+
+def _terminate(*_) -> None:
+    raise KeyboardInterrupt
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident backtest worker pool with in-memory candles.")
+    parser.add_argument("--workers", type=int, default=max((os.cpu_count() or 2) - 1, 1))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_MB, help="Candle cache size.")
+    parser.add_argument("--per-user", type=int, default=DEFAULT_PER_USER, help="Concurrent jobs per user.")
+    parser.add_argument("--datadir", type=Path, help="Candle directory for all jobs (default: each config's).")
+    parser.add_argument("--job-timeout", type=float, default=DEFAULT_JOB_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(threadName)s %(levelname)s %(message)s")
+    pool = BacktestPool(args.workers, args.cache_mb, args.per_user, args.datadir, args.job_timeout)
+    handler = type("Handler", (_Handler,), {"pool": pool})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    signal.signal(signal.SIGTERM, _terminate)
+    pool.start()
+    logger.info(f"Backtest pool: {args.workers} workers on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)  # Finish unlinking the shared blocks
+        server.server_close()
+        pool.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
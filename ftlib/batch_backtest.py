@@ -0,0 +1,247 @@
+"""
+Backtest many strategies against the same pairs / timerange with one data load.
+
+Candles are loaded once (with the largest ``startup_candle_count`` of all strategies),
+published in shared memory, and strategies are fanned out across a process pool whose
+workers attach to the data without copying it. Per-strategy results are combined into
+a single result zip in freqtrade's usual export format.
+
+Usage (remaining arguments are regular ``freqtrade backtesting`` arguments):
+    python -m ftlib.batch_backtest --workers 4 -- --config user_data/config.json \\
+        --strategy-list ADXMomentum AdxSmas BbandRsi --timerange 20240101-20240601
+    python -m ftlib.batch_backtest --all --workers 4 -- --config user_data/config.json \\
+        --strategy-path user_data/strategies/berlinguyinca --timerange 20240101-20240601
+
+The timing report compares the batch with an estimate of one freqtrade invocation per
+strategy (the one data load repeated per strategy plus the measured backtests). Pass
+``--measure-sequential`` to actually run the strategies one after the other afterwards
+and report the measured speedup instead.
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Optional
+
+from ftlib.shared_candles import SharedCandles, SharedFrameSpec, attach
+
+
+logger = logging.getLogger(__name__)
+
+# Set once per worker process by _init_worker.
+_worker_data: dict = {}
+
+
+def _init_worker(specs: list[SharedFrameSpec]) -> None:
+    _worker_data.update(attach(specs))
+
+
+def _run_strategy(config: dict[str, Any], strategy_name: str, timerange) -> dict[str, Any]:
+    from freqtrade.optimize.backtesting import Backtesting
+
+    start = time.perf_counter()
+    config = {**config, "strategy": strategy_name, "strategy_list": [strategy_name]}
+    backtesting = Backtesting(config)
+    # Detail candles and futures funding / mark rates are not shared; each worker loads them.
+    backtesting.load_bt_data_detail()
+    strategy = backtesting.strategylist[0]
+    min_date, max_date = backtesting.backtest_one_strategy(strategy, _worker_data, timerange)
+    return {
+        "strategy": strategy_name,
+        "results": backtesting.all_results[strategy_name],
+        "analysis": {
+            kind: frames[strategy_name]
+            for kind, frames in backtesting.analysis_results.items()
+            if strategy_name in frames
+        },
+        "strategy_file": strategy.__file__,
+        "min_date": min_date,
+        "max_date": max_date,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def discover_strategies(config: dict[str, Any]) -> list[str]:
+    """
+    Names of all strategies found in ``strategy_path`` (recursively, if configured).
+    """
+    from freqtrade.resolvers import StrategyResolver
+
+    found = StrategyResolver.search_all_objects(
+        config, enum_failed=False, recursive=config.get("recursive_strategy_search", False)
+    )
+    return sorted(strategy["name"] for strategy in found)
+
+
+def load_candles(config: dict[str, Any]):
+    """
+    Load candles once for all strategies in ``strategy_list``.
+    Freqtrade pads the timerange by the largest startup candle count of the list.
+    """
+    from freqtrade.optimize.backtesting import Backtesting
+
+    backtesting = Backtesting(config)
+    data, timerange = backtesting.load_bt_data()
+    return data, timerange
+
+
+def export_results(config: dict[str, Any], data: dict, outcomes: list[dict[str, Any]]) -> None:
+    from freqtrade.data.metrics import combined_dataframes_with_rel_mean
+    from freqtrade.optimize.optimize_reports import (
+        generate_backtest_stats,
+        show_backtest_results,
+        store_backtest_results,
+    )
+
+    all_results = {outcome["strategy"]: outcome["results"] for outcome in outcomes}
+    min_date = min(outcome["min_date"] for outcome in outcomes)
+    max_date = max(outcome["max_date"] for outcome in outcomes)
+    stats = generate_backtest_stats(data, all_results, min_date=min_date, max_date=max_date)
+    show_backtest_results(config, stats)
+
+    if config.get("export", "none") in ("trades", "signals"):
+        dt_appendix = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        market_change = combined_dataframes_with_rel_mean(data, min_date, max_date)
+        # As Backtesting.start stores them: strategy sources and, for --export signals,
+        # the signal / rejected / exited candles.
+        analysis_results: dict[str, dict] = {"signals": {}, "rejected": {}, "exited": {}}
+        for outcome in outcomes:
+            for kind, frame in outcome["analysis"].items():
+                analysis_results[kind][outcome["strategy"]] = frame
+        store_backtest_results(
+            config, stats, dt_appendix, market_change_data=market_change,
+            analysis_results=analysis_results,
+            strategy_files={outcome["strategy"]: outcome["strategy_file"] for outcome in outcomes},
+        )
+
+
+def measure_sequential(config: dict[str, Any], strategies: list[str]) -> float:
+    """
+    Wall time of loading the candles and backtesting each strategy on its own, one strategy
+    after the other - a freqtrade invocation per strategy, minus interpreter start-up.
+    """
+    from freqtrade.optimize.backtesting import Backtesting
+
+    start = time.perf_counter()
+    for name in strategies:
+        backtesting = Backtesting({**config, "strategy": name, "strategy_list": [name]})
+        data, timerange = backtesting.load_bt_data()
+        backtesting.load_bt_data_detail()
+        backtesting.backtest_one_strategy(backtesting.strategylist[0], data, timerange)
+        logger.info(f"{name}: sequential run done after {time.perf_counter() - start:.2f}s")
+    return time.perf_counter() - start
+
+
+def run_batch(
+    config: dict[str, Any], strategies: list[str], workers: int, measure: bool = False
+) -> list[dict[str, Any]]:
+    total_start = time.perf_counter()
+    config = {**config, "strategy_list": strategies}
+
+    load_start = time.perf_counter()
+    data, timerange = load_candles(config)
+    load_time = time.perf_counter() - load_start
+    logger.info(f"Loaded {len(data)} pairs once in {load_time:.2f}s for {len(strategies)} strategies.")
+
+    outcomes = []
+    failures = []
+    with SharedCandles(data) as shared:
+        logger.info(f"Published {shared.nbytes / 1e6:.1f} MB of candles in shared memory.")
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared.specs,)
+        ) as pool:
+            futures = {
+                pool.submit(_run_strategy, config, name, timerange): name for name in strategies
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error(f"Backtest of {name} failed: {e}")
+                    failures.append(name)
+                    continue
+                logger.info(f"{name}: {outcome['wall_time']:.2f}s")
+                outcomes.append(outcome)
+
+    if outcomes:
+        outcomes.sort(key=lambda outcome: strategies.index(outcome["strategy"]))
+        export_results(config, data, outcomes)
+
+    total_time = time.perf_counter() - total_start
+    sequential = None
+    if measure and outcomes:
+        logger.info(f"Running {len(outcomes)} strategies sequentially for comparison.")
+        sequential = measure_sequential(config, [outcome["strategy"] for outcome in outcomes])
+    report_timings(outcomes, failures, load_time, total_time, sequential)
+    return outcomes
+
+
+def report_timings(
+    outcomes: list[dict[str, Any]],
+    failures: list[str],
+    load_time: float,
+    total_time: float,
+    sequential: Optional[float] = None,
+) -> None:
+    """
+    Print wall time per strategy and the batch wall time against one freqtrade run per
+    strategy. Without a measured ``sequential`` time that baseline is an estimate - the
+    batch's data load repeated per strategy plus the per-strategy wall times measured in
+    the workers, which run concurrently and may be slower than alone - and is labelled so.
+    """
+    print(f"\n{'Strategy':<40} {'Wall time (s)':>14}")
+    for outcome in sorted(outcomes, key=lambda outcome: -outcome["wall_time"]):
+        print(f"{outcome['strategy']:<40} {outcome['wall_time']:>14.2f}")
+    for name in failures:
+        print(f"{name:<40} {'FAILED':>14}")
+    print(f"\nData load (once):          {load_time:8.2f}s")
+    if sequential is None:
+        sequential = load_time * len(outcomes) + sum(outcome["wall_time"] for outcome in outcomes)
+        label = "estimate"
+        print(f"Sequential (estimate):     {sequential:8.2f}s")
+    else:
+        label = "measured"
+        print(f"Sequential (measured):     {sequential:8.2f}s")
+    print(f"Batch wall time:           {total_time:8.2f}s")
+    if total_time > 0:
+        print(f"{f'Speedup ({label}):':<27}{sequential / total_time:8.2f}x")
+    if label == "estimate":
+        print("Run with --measure-sequential to time the strategies one after the other.")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from freqtrade.commands import Arguments
+    from freqtrade.commands.optimize_commands import setup_optimize_configuration
+    from freqtrade.enums import RunMode
+
+    parser = argparse.ArgumentParser(description="Batch backtest several strategies on one data load.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument(
+        "--all", action="store_true", help="Backtest every strategy found in --strategy-path."
+    )
+    parser.add_argument(
+        "--measure-sequential",
+        action="store_true",
+        help="Afterwards run the strategies one after the other to measure the speedup.",
+    )
+    parser.add_argument("freqtrade_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    freqtrade_args = [arg for arg in args.freqtrade_args if arg != "--"]
+    parsed = Arguments(["backtesting", *freqtrade_args]).get_parsed_arg()
+    config = setup_optimize_configuration(parsed, RunMode.BACKTEST)
+
+    strategies = discover_strategies(config) if args.all else list(config.get("strategy_list") or [])
+    if not strategies and config.get("strategy"):
+        strategies = [config["strategy"]]
+    if not strategies:
+        raise SystemExit("No strategies given - use --strategy-list or --all with --strategy-path.")
+
+    run_batch(config, strategies, max(1, args.workers), args.measure_sequential)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Bollinger bands for several deviation multipliers from one rolling pass.
+
+``qtpylib.bollinger_bands(series, window, stds)`` recomputes the rolling mean and
+standard deviation on every call, so Bandtastic's four bands (k = 1..4) or SmoothOperator's
+two (k = 2 and 1.6) pay for the same rolling window several times. ``BollingerFamily``
+computes mean and std once per (source, window); each band is then ``mid +- k * std``:
+
+    bb = BollingerFamily(qtpylib.typical_price(dataframe), window=20)
+    dataframe = dataframe.assign(**bb.columns(1, lower="bb_lowerband1", mid="bb_middleband1"))
+    bollinger = bb.bands(2)       # same frame as qtpylib.bollinger_bands(..., stds=2)
+
+Defaults match qtpylib (mean with ``min_periods=1``, sample std). ``BollingerFamily.talib``
+matches ``ta.BBANDS`` (population std, NaN until the window is full).
+"""
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame, Series
+
+
+class BollingerFamily:
+
+    def __init__(self, source: Series, window: int = 20, ddof: int = 1,
+                 min_periods: Optional[int] = 1, dtype=None):
+        """
+        :param dtype: store mid / std (and every band derived from them) as e.g. ``np.float32``.
+        """
+        rolling = source.rolling(window=window, min_periods=min_periods)
+        mean = rolling.mean()
+        std = rolling.std(ddof=ddof)
+        if dtype is not None:
+            mean, std = mean.astype(dtype), std.astype(dtype)
+        self.window = window
+        self.mid = mean
+        self.std = std
+
+    @classmethod
+    def talib(cls, source: Series, window: int = 5, dtype=None) -> "BollingerFamily":
+        return cls(source, window, ddof=0, min_periods=window, dtype=dtype)
+
+    def upper(self, stds: float) -> Series:
+        return self.mid + self.std * stds
+
+    def lower(self, stds: float) -> Series:
+        return self.mid - self.std * stds
+
+    def width(self, stds: float) -> Series:
+        """
+        (upper - lower) / mid.
+        """
+        return 2 * stds * self.std / self.mid
+
+    def bands(self, stds: float = 2) -> DataFrame:
+        """
+        ``upper`` / ``mid`` / ``lower`` frame, a drop-in for ``qtpylib.bollinger_bands``.
+        """
+        return DataFrame(
+            index=self.mid.index,
+            data={"upper": self.upper(stds), "mid": self.mid, "lower": self.lower(stds)},
+        )
+
+    def columns(self, stds: float, lower: Optional[str] = None, mid: Optional[str] = None,
+                upper: Optional[str] = None) -> dict[str, Series]:
+        """
+        The requested bands under the given column names, for ``DataFrame.assign``.
+        """
+        columns = {}
+        if lower:
+            columns[lower] = self.lower(stds)
+        if mid:
+            columns[mid] = self.mid
+        if upper:
+            columns[upper] = self.upper(stds)
+        return columns
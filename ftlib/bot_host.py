@@ -0,0 +1,677 @@
+"""
+Multi-tenant bot host: many freqtrade bot instances in one Python process.
+
+Every BotInstance is started as its own ``python -m freqtrade trade`` process today, and
+each of them pays for the interpreter, pandas / numpy / TA-Lib / ccxt, freqtrade itself,
+the exchange's market list and its own copy of every candle it watches. The host loads
+all of that once and runs each instance as a tenant: a thread running freqtrade's
+``Worker`` iterations with its own config, strategy, wallet, exchange credentials and
+trade database.
+
+freqtrade keeps some state per process, which the host makes per tenant:
+
+- the SQLAlchemy session of ``Trade`` / ``Order`` / ``PairLock`` / key-value store /
+  custom data is replaced by a scoped session keyed on (tenant, thread), bound to the
+  tenant's own engine. ``init_db`` called by ``FreqtradeBot`` registers that engine;
+- log records are routed by tenant to the tenant's ``logfile`` (same path and format as
+  a standalone bot, so ``ftlib.log_shipper`` keeps working); freqtrade's global
+  ``setup_logging`` is not run per tenant;
+- threads started by a tenant (RPC, Telegram) inherit its context, so they use its
+  database and log file;
+- ``PairLocks.timeframe`` is a class attribute: a host only accepts tenants of one
+  timeframe (run one host per timeframe, or shard with ``--shard``);
+- the REST API server is a process-wide singleton and is disabled for tenants.
+
+Public exchange data is shared between tenants of the same exchange: ``load_markets``
+runs once per exchange and trading mode (refreshed with freqtrade's own market refresh),
+and OHLCV candles fetched by one tenant for the current candle are handed to the others
+that need no more history (``required_candle_call_count``, from the startup candles). The
+``_klines`` entries are replaced, never mutated in place, so tenants share the frames.
+Private calls - balances, orders - stay on each tenant's exchange object and credentials.
+
+The host couples to freqtrade internals (``Worker._worker``, ``Exchange._klines``,
+``Exchange._pairs_last_refresh_time``, ``Exchange._api_reload_markets``); it is written
+against freqtrade 2025.x.
+
+Tenants are listed in a JSON file which is re-read when it changes, so instances can be
+added or removed without restarting the others:
+
+    [{"id": "685c5fd7ed51d8473f4425f3",
+      "config": "data/ft_user_data/685c5fd7ed51d8473f4425f3/config.json",
+      "strategy_path": "data/ft_user_data/685c5fd7ed51d8473f4425f3/strategies"}]
+
+Usage:
+    python -m ftlib.bot_host run --tenants tenants.json [--shard 0/4]
+    python -m ftlib.bot_host bench --config data/ft_user_data/<id>/config.json --bots 1 10 50
+"""
+import argparse
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from ftlib.strategy_loader import ROOT
+
+
+logger = logging.getLogger(__name__)
+
+current_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_tenant", default=None)
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Seconds between checks of the tenants file.
+RELOAD_INTERVAL = 5.0
+
+# A crashing tenant is restarted after this many seconds, doubling per crash.
+RESTART_BACKOFF = 5.0
+MAX_RESTART_BACKOFF = 300.0
+
+# Library loggers freqtrade's setup_logging quietens (it is not run per tenant here).
+NOISY_LOGGERS = ("requests", "urllib3", "ccxt.base.exchange", "telegram", "httpx", "websockets")
+
+# Markets are shared for this long; freqtrade reloads them every hour by default.
+MARKETS_TTL = 3600.0
+
+
+class TenantError(Exception):
+    pass
+
+
+class ContextThreads:
+    """
+    Threads inherit the ``contextvars`` context of the thread that starts them (the
+    default from Python 3.14 on with ``inherit_context``).
+    """
+
+    _installed = False
+
+    @classmethod
+    def install(cls) -> None:
+        if cls._installed:
+            return
+        original_start = threading.Thread.start
+
+        def start(thread: threading.Thread) -> None:
+            context, run = contextvars.copy_context(), thread.run
+            thread.run = lambda: context.run(run)
+            original_start(thread)
+
+        threading.Thread.start = start
+        cls._installed = True
+
+
+class TenantDatabases:
+    """
+    One engine per tenant behind freqtrade's model sessions.
+    """
+
+    def __init__(self):
+        self.engines: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._installed = False
+
+    def _engine(self):
+        tenant = current_tenant.get()
+        try:
+            return self.engines[tenant]
+        except KeyError:
+            raise TenantError(f"no database registered for tenant {tenant!r}") from None
+
+    def install(self) -> None:
+        """
+        Point the freqtrade models at tenant-aware sessions and make ``FreqtradeBot``
+        register its database with the host instead of rebinding the models.
+        """
+        if self._installed:
+            return
+        import freqtrade.freqtradebot
+        from freqtrade.persistence import Order, PairLock, Trade
+        from freqtrade.persistence.custom_data import _CustomData
+        from freqtrade.persistence.key_value_store import _KeyValueStoreModel
+        from freqtrade.persistence.models import get_request_or_thread_id
+        from sqlalchemy.orm import Session, scoped_session
+
+        def scope():
+            return current_tenant.get(), get_request_or_thread_id()
+
+        session = scoped_session(lambda: Session(bind=self._engine(), autoflush=False), scopefunc=scope)
+        Trade.session = Order.session = PairLock.session = _KeyValueStoreModel.session = session
+        _CustomData.session = scoped_session(lambda: Session(bind=self._engine(), autoflush=True), scopefunc=scope)
+        freqtrade.freqtradebot.init_db = self.init_db
+        self._installed = True
+
+    def init_db(self, db_url: str) -> None:
+        """
+        ``freqtrade.persistence.init_db`` for the current tenant.
+        """
+        from freqtrade.exceptions import OperationalException
+        from freqtrade.persistence import Trade
+        from freqtrade.persistence.base import ModelBase
+        from freqtrade.persistence.migrations import check_migrate
+        from sqlalchemy import create_engine, inspect
+        from sqlalchemy.pool import StaticPool
+
+        tenant = current_tenant.get()
+        if tenant is None:
+            raise TenantError("init_db called outside of a tenant")
+        kwargs: dict[str, Any] = {}
+        if db_url == "sqlite:///":
+            raise OperationalException(f"Bad db-url {db_url}. For in-memory database, please use `sqlite://`.")
+        if db_url == "sqlite://":
+            kwargs["poolclass"] = StaticPool
+        if db_url.startswith("sqlite://"):
+            kwargs["connect_args"] = {"check_same_thread": False}
+        engine = create_engine(db_url, future=True, **kwargs)
+        previous_tables = inspect(engine).get_table_names()
+        ModelBase.metadata.create_all(engine)
+        with self._lock:
+            old = self.engines.get(tenant)
+            self.engines[tenant] = engine
+        if old is not None:
+            old.dispose()
+        check_migrate(engine, decl_base=ModelBase, previous_tables=previous_tables)
+        Trade.use_db = True
+
+    def close_sessions(self) -> None:
+        """
+        Close the sessions of the current tenant thread (scoped sessions outlive threads).
+        """
+        from freqtrade.persistence import Trade
+        from freqtrade.persistence.custom_data import _CustomData
+
+        Trade.session.remove()
+        _CustomData.session.remove()
+
+    def remove(self, tenant: str) -> None:
+        with self._lock:
+            engine = self.engines.pop(tenant, None)
+        if engine is not None:
+            engine.dispose()
+
+
+class TenantLogRouter(logging.Handler):
+    """
+    Sends each record to the log file of the tenant it was logged from; records logged
+    outside of a tenant go to ``fallback``.
+    """
+
+    def __init__(self, fallback: logging.Handler):
+        super().__init__()
+        self.fallback = fallback
+        self.handlers: dict[str, logging.Handler] = {}
+
+    def add(self, tenant: str, logfile: Path) -> None:
+        logfile.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(logfile, maxBytes=1024 * 1024 * 10, backupCount=10)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        old, self.handlers[tenant] = self.handlers.get(tenant), handler
+        if old is not None:
+            old.close()
+
+    def remove(self, tenant: str) -> None:
+        handler = self.handlers.pop(tenant, None)
+        if handler is not None:
+            handler.close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handlers.get(current_tenant.get(), self.fallback).handle(record)
+
+
+def _candle_start(timeframe: str) -> int:
+    from freqtrade.exchange import timeframe_to_seconds
+
+    period = timeframe_to_seconds(timeframe)
+    return int(time.time()) // period * period
+
+
+@dataclass
+class _CandleEntry:
+    frame: Any
+    candle_start: int
+    refreshed_at: Any
+    # ``required_candle_call_count`` of the exchange that fetched the frame: how much history it holds.
+    calls: int = 1
+
+
+class SharedExchangeData:
+    """
+    Markets and closed-candle OHLCV shared by all tenants of one exchange id.
+    """
+
+    def __init__(self):
+        self.markets: dict[tuple, tuple[float, Any, Any]] = {}
+        self.candles: dict[tuple, _CandleEntry] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.fetched = 0
+        self.reused = 0
+
+    def _lock(self, exchange_id: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(exchange_id, threading.Lock())
+
+    def install(self) -> None:
+        """
+        Share ``load_markets`` results across ``Exchange`` objects (class level; only
+        exchanges created in this process are affected).
+        """
+        from freqtrade.exchange import Exchange
+
+        if getattr(Exchange._api_reload_markets, "_shared", False):
+            return
+        original = Exchange._api_reload_markets
+        shared = self
+
+        async def _api_reload_markets(exchange, reload: bool = False):
+            key = (exchange._api_async.id, str(exchange.trading_mode), str(exchange.margin_mode))
+            cached = shared.markets.get(key)
+            if cached is not None and time.monotonic() - cached[0] < MARKETS_TTL:
+                exchange._api_async.set_markets(cached[1], cached[2])
+                return exchange._api_async.markets
+            markets = await original(exchange, reload=reload)
+            if not isinstance(markets, Exception):
+                shared.markets[key] = (time.monotonic(), exchange._api_async.markets, exchange._api_async.currencies)
+            return markets
+
+        _api_reload_markets._shared = True
+        Exchange._api_reload_markets = _api_reload_markets
+
+    def attach(self, exchange) -> None:
+        """
+        Route the tenant exchange's candle refresh through the shared candle cache.
+        """
+        original = exchange.refresh_latest_ohlcv
+        lock = self._lock(exchange.id)
+        calls = getattr(exchange, "required_candle_call_count", 1)
+
+        def refresh_latest_ohlcv(pair_list, **kwargs):
+            if kwargs.get("since_ms") is not None or not kwargs.get("cache", True):
+                return original(pair_list, **kwargs)
+            result = {}
+            with lock:
+                missing = []
+                for pair, timeframe, candle_type in pair_list:
+                    entry = self.candles.get((exchange.id, pair, timeframe, str(candle_type)))
+                    if entry is None or entry.candle_start < _candle_start(timeframe) or entry.calls < calls:
+                        missing.append((pair, timeframe, candle_type))
+                        continue
+                    exchange._klines[(pair, timeframe, candle_type)] = entry.frame
+                    exchange._pairs_last_refresh_time[(pair, timeframe, candle_type)] = entry.refreshed_at
+                    result[(pair, timeframe, candle_type)] = entry.frame
+                    self.reused += 1
+                if missing:
+                    fetched = original(missing, **kwargs)
+                    for (pair, timeframe, candle_type), frame in fetched.items():
+                        self.candles[(exchange.id, pair, timeframe, str(candle_type))] = _CandleEntry(
+                            frame, _candle_start(timeframe),
+                            exchange._pairs_last_refresh_time.get((pair, timeframe, candle_type)), calls,
+                        )
+                    self.fetched += len(fetched)
+                    result.update(fetched)
+            return result
+
+        exchange.refresh_latest_ohlcv = refresh_latest_ohlcv
+
+
+@dataclass
+class TenantSpec:
+    id: str
+    config: list[str]
+    strategy_path: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TenantSpec":
+        configs = data["config"] if isinstance(data["config"], list) else [data["config"]]
+        return cls(str(data["id"]), [str(path) for path in configs], data.get("strategy_path"))
+
+
+@dataclass
+class Tenant:
+    spec: TenantSpec
+    thread: Optional[threading.Thread] = None
+    stop: threading.Event = field(default_factory=threading.Event)
+    worker: Any = None
+    state: str = "starting"
+    restarts: int = 0
+    error: Optional[str] = None
+
+
+class BotHost:
+
+    def __init__(self, timeframe: Optional[str] = None, verbosity: int = 0):
+        self.timeframe = timeframe
+        self.tenants: dict[str, Tenant] = {}
+        self.databases = TenantDatabases()
+        self.exchange_data: Optional[SharedExchangeData] = None
+        fallback = logging.StreamHandler(sys.stderr)
+        fallback.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.log_router = TenantLogRouter(fallback)
+        logging.root.handlers = [self.log_router]
+        logging.root.setLevel(logging.DEBUG if verbosity > 1 else logging.INFO)
+        for name in NOISY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.DEBUG if verbosity > 2 else logging.WARNING)
+        self._lock = threading.Lock()
+
+    def _install(self) -> None:
+        import freqtrade.configuration.configuration as configuration_module
+
+        # Logging is set up once for the host; per-tenant configs must not replace the handlers.
+        configuration_module.setup_logging = lambda config: None
+        ContextThreads.install()
+        self.databases.install()
+
+    def load_config(self, spec: TenantSpec) -> dict[str, Any]:
+        from freqtrade.configuration import Configuration
+
+        args: dict[str, Any] = {"config": spec.config}
+        if spec.strategy_path:
+            args["strategy_path"] = spec.strategy_path
+        config = Configuration(args, None).get_config()
+        timeframe = config.get("timeframe")
+        if self.timeframe is None:
+            self.timeframe = timeframe
+        elif timeframe and timeframe != self.timeframe:
+            raise TenantError(f"tenant {spec.id} trades {timeframe}, this host runs {self.timeframe} "
+                              f"(PairLocks.timeframe is process-wide)")
+        config.setdefault("api_server", {})["enabled"] = False
+        return config
+
+    def _make_worker(self, tenant: Tenant):
+        from freqtrade.worker import Worker
+
+        config = self.load_config(tenant.spec)
+        self.log_router.add(tenant.spec.id, Path(config.get("logfile") or f"freqtrade_{tenant.spec.id}.log"))
+        if self.exchange_data is None:
+            self.exchange_data = SharedExchangeData()
+            self.exchange_data.install()
+        worker = Worker(args=None, config=config)
+        self.exchange_data.attach(worker.freqtrade.exchange)
+        return worker
+
+    def _run_tenant(self, tenant: Tenant) -> None:
+        from freqtrade.enums import State
+
+        current_tenant.set(tenant.spec.id)
+        backoff = RESTART_BACKOFF
+        while not tenant.stop.is_set():
+            try:
+                tenant.worker = self._make_worker(tenant)
+                tenant.state, tenant.error = "running", None
+                state = None
+                while not tenant.stop.is_set():
+                    state = tenant.worker._worker(old_state=state)
+                    if state == State.RELOAD_CONFIG:
+                        logger.info(f"Tenant {tenant.spec.id}: reloading configuration.")
+                        tenant.worker.exit()
+                        tenant.worker = self._make_worker(tenant)
+                        state = None
+                backoff = RESTART_BACKOFF
+            except TenantError as e:
+                tenant.state, tenant.error = "rejected", str(e)
+                logger.error(f"Tenant {tenant.spec.id} rejected: {e}")
+                return
+            except Exception as e:
+                tenant.state, tenant.error = "crashed", repr(e)
+                tenant.restarts += 1
+                logger.exception(f"Tenant {tenant.spec.id} crashed, restarting in {backoff:.0f}s.")
+            finally:
+                if tenant.worker is not None:
+                    try:
+                        tenant.worker.exit()
+                    except Exception:
+                        logger.exception(f"Tenant {tenant.spec.id}: error during shutdown.")
+                    tenant.worker = None
+                if tenant.spec.id in self.databases.engines:
+                    self.databases.close_sessions()
+            if tenant.stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF)
+        tenant.state = "stopped"
+
+    def add(self, spec: TenantSpec) -> Tenant:
+        with self._lock:
+            if spec.id in self.tenants:
+                raise TenantError(f"tenant {spec.id} is already running")
+            self._install()
+            tenant = Tenant(spec)
+            # The tenant context is set inside the thread; child threads inherit it from there.
+            tenant.thread = threading.Thread(target=self._run_tenant, args=(tenant,), name=f"tenant-{spec.id}",
+                                             daemon=True)
+            self.tenants[spec.id] = tenant
+        tenant.thread.start()
+        logger.info(f"Tenant {spec.id} started.")
+        return tenant
+
+    def remove(self, tenant_id: str, timeout: float = 60.0) -> None:
+        with self._lock:
+            tenant = self.tenants.pop(tenant_id, None)
+        if tenant is None:
+            return
+        tenant.stop.set()
+        if tenant.thread is not None:
+            tenant.thread.join(timeout)
+        self.databases.remove(tenant_id)
+        self.log_router.remove(tenant_id)
+        logger.info(f"Tenant {tenant_id} stopped.")
+
+    def reconcile(self, specs: list[TenantSpec]) -> None:
+        """
+        Start tenants that are new or whose spec changed, stop tenants no longer listed.
+        """
+        wanted = {spec.id: spec for spec in specs}
+        for tenant_id, tenant in list(self.tenants.items()):
+            if wanted.get(tenant_id) != tenant.spec:
+                self.remove(tenant_id)
+        for tenant_id, spec in wanted.items():
+            if tenant_id not in self.tenants:
+                self.add(spec)
+
+    def status(self) -> dict[str, Any]:
+        data = self.exchange_data
+        return {
+            "pid": os.getpid(),
+            "timeframe": self.timeframe,
+            "tenants": {tenant_id: {"state": tenant.state, "restarts": tenant.restarts, "error": tenant.error}
+                        for tenant_id, tenant in self.tenants.items()},
+            "candles": {"fetched": data.fetched, "reused": data.reused} if data else None,
+            "pss_bytes": process_pss(os.getpid()),
+        }
+
+    def stop(self) -> None:
+        for tenant in self.tenants.values():
+            tenant.stop.set()
+        for tenant_id in list(self.tenants):
+            self.remove(tenant_id)
+
+
+def load_specs(path: Path, shard: Optional[tuple[int, int]] = None) -> list[TenantSpec]:
+    specs = [TenantSpec.from_dict(entry) for entry in json.loads(Path(path).read_text())]
+    if shard is not None:
+        index, count = shard
+        specs = [spec for spec in specs if zlib.crc32(spec.id.encode()) % count == index]
+    return specs
+
+
+def process_pss(pid: int) -> Optional[int]:
+    """
+    Proportional set size of ``pid`` (shared pages divided among their users) in bytes,
+    the fair measure when processes share libraries; None where /proc is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as handle:
+            for line in handle:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def run(args: argparse.Namespace) -> int:
+    shard = tuple(int(part) for part in args.shard.split("/")) if args.shard else None
+    host = BotHost(args.timeframe, args.verbosity)
+    stopping = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopping.set())
+
+    status_path = args.status or Path(args.tenants).with_suffix(".status.json")
+    mtime = None
+    while not stopping.is_set():
+        try:
+            stamp = Path(args.tenants).stat().st_mtime_ns
+            if stamp != mtime:
+                mtime = stamp
+                host.reconcile(load_specs(args.tenants, shard))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read tenants from {args.tenants}: {e}")
+        tmp = Path(status_path).with_suffix(".tmp")
+        tmp.write_text(json.dumps(host.status()))
+        os.replace(tmp, status_path)
+        stopping.wait(RELOAD_INTERVAL)
+    host.stop()
+    return 0
+
+
+def _bench_copies(config_path: Path, count: int, workdir: Path) -> list[TenantSpec]:
+    """
+    ``count`` dry-run copies of one instance config, each with its own database, user data
+    directory and log file.
+    """
+    config = json.loads(Path(config_path).read_text())
+    specs = []
+    for index in range(count):
+        tenant_id = f"{index:024x}"
+        directory = workdir / tenant_id
+        directory.mkdir(parents=True, exist_ok=True)
+        copy_config = copy.deepcopy(config)
+        copy_config.update({
+            "dry_run": True,
+            "db_url": f"sqlite:///{directory / 'tradesv3.sqlite'}",
+            "user_data_dir": str(directory),
+            "logfile": str(directory / f"freqtrade_{tenant_id}.log"),
+            "bot_name": f"bench_{index}",
+        })
+        copy_config.setdefault("api_server", {})["enabled"] = False
+        copy_config.get("telegram", {})["enabled"] = False
+        path = directory / "config.json"
+        path.write_text(json.dumps(copy_config))
+        specs.append(TenantSpec(tenant_id, [str(path)], copy_config.get("strategy_path")))
+    return specs
+
+
+def _measure(processes: list[subprocess.Popen], settle: float) -> Optional[int]:
+    time.sleep(settle)
+    if any(process.poll() is not None for process in processes):
+        return None
+    sizes = [process_pss(process.pid) for process in processes]
+    return None if None in sizes else sum(sizes)
+
+
+def _stop(processes: list[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def bench(args: argparse.Namespace) -> int:
+    """
+    Memory of ``n`` bots as ``n`` freqtrade processes vs. one host process, after a
+    settle time long enough for the first candle refresh and analysis.
+    """
+    rows = []
+    for count in args.bots:
+        with tempfile.TemporaryDirectory(prefix="bot_host_bench_") as tmp:
+            workdir = Path(tmp)
+            specs = _bench_copies(args.config, count, workdir / "process")
+            processes = [
+                subprocess.Popen([sys.executable, "-m", "freqtrade", "trade", "--config", spec.config[0]]
+                                 + (["--strategy-path", spec.strategy_path] if spec.strategy_path else []),
+                                 cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                for spec in specs
+            ]
+            try:
+                per_process = _measure(processes, args.settle)
+            finally:
+                _stop(processes)
+
+            specs = _bench_copies(args.config, count, workdir / "host")
+            tenants = workdir / "tenants.json"
+            tenants.write_text(json.dumps([{"id": spec.id, "config": spec.config, "strategy_path": spec.strategy_path}
+                                           for spec in specs]))
+            host = subprocess.Popen([sys.executable, "-m", "ftlib.bot_host", "run", "--tenants", str(tenants)],
+                                    cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                hosted = _measure([host], args.settle)
+                status = json.loads(tenants.with_suffix(".status.json").read_text())
+                running = sum(tenant["state"] == "running" for tenant in status["tenants"].values())
+            except (OSError, ValueError):
+                running = 0
+            finally:
+                _stop([host])
+
+        rows.append({
+            "bots": count,
+            "process_per_bot_mb": per_process / 1e6 if per_process else None,
+            "host_mb": hosted / 1e6 if hosted else None,
+            "host_running": running,
+            "bots_per_gb_process": count / (per_process / 1e9) if per_process else None,
+            "bots_per_gb_host": count / (hosted / 1e9) if hosted and running == count else None,
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    print(f"{'bots':>5} {'process/bot MB':>15} {'host MB':>9} {'bots/GB process':>16} {'bots/GB host':>13}")
+    for row in rows:
+        print(f"{row['bots']:>5} {_fmt(row['process_per_bot_mb'], 15)} {_fmt(row['host_mb'], 9)} "
+              f"{_fmt(row['bots_per_gb_process'], 16)} {_fmt(row['bots_per_gb_host'], 13)}")
+    return 0
+
+
+def _fmt(value: Optional[float], width: int) -> str:
+    return f"{value:>{width}.1f}" if value is not None else f"{'-':>{width}}"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run many freqtrade bot instances in one process.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the tenants listed in a JSON file.")
+    run_parser.add_argument("--tenants", type=Path, required=True, help="JSON list of {id, config, strategy_path}.")
+    run_parser.add_argument("--shard", help="K/N: only run tenants whose id hashes to K of N hosts.")
+    run_parser.add_argument("--timeframe", help="Timeframe of this host (default: the first tenant's).")
+    run_parser.add_argument("--status", type=Path, help="Status file (default: <tenants>.status.json).")
+    run_parser.add_argument("-v", "--verbosity", action="count", default=0)
+    run_parser.set_defaults(func=run)
+
+    bench_parser = commands.add_parser("bench", help="Bots per GB: one process per bot vs. one host.")
+    bench_parser.add_argument("--config", type=Path, required=True, help="Instance config to copy (dry-run).")
+    bench_parser.add_argument("--bots", type=int, nargs="+", default=[1, 10, 25])
+    bench_parser.add_argument("--settle", type=float, default=90.0, help="Seconds before measuring.")
+    bench_parser.add_argument("--json", action="store_true")
+    bench_parser.set_defaults(func=bench)
+
+    args = parser.parse_args(argv)
+    if args.command == "bench":
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
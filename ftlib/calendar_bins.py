@@ -0,0 +1,138 @@
+"""
+Calendar bucketing for backtest results without ``DataFrame.resample``.
+
+Hyperopt evaluates thousands of epochs over the same ``min_date..max_date``
+window, so the day boundaries only need to be computed once per run.
+Each epoch then buckets its trades with ``np.searchsorted`` and sums them with
+``np.bincount`` - the metrics below work on those plain arrays.
+"""
+from datetime import datetime
+from functools import lru_cache
+from math import sqrt
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+DAYS_PER_YEAR = 365
+
+
+def to_ns(values) -> np.ndarray:
+    """
+    Convert datetimes (Series, Index or array, tz-aware or naive UTC) to int64 nanoseconds.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        # tz-aware values are converted to naive UTC by to_numpy
+        return values.to_numpy(dtype="datetime64[ns]").view("i8")
+    return np.asarray(values, dtype="datetime64[ns]").view("i8")
+
+
+class CalendarBins:
+    """
+    Fixed-width calendar buckets covering ``start..end``.
+
+    ``edges`` holds the left edge of every bucket (int64 ns, UTC) - the same
+    index ``pd.date_range(start, end, freq=freq, normalize=True)`` produces,
+    which is what freqtrade's daily losses reindex the resampled frame to.
+    """
+
+    def __init__(self, start: datetime, end: datetime, freq: str = "1D"):
+        index = pd.date_range(start=start, end=end, freq=freq, normalize=True)
+        self.freq = freq
+        self.edges = to_ns(index)
+        self.size = len(self.edges)
+
+    def bucket(self, dates) -> np.ndarray:
+        """
+        Return the bucket number of every date.
+        Dates outside the range are clipped into the first / last bucket.
+        """
+        idx = np.searchsorted(self.edges, to_ns(dates), side="right") - 1
+        return np.clip(idx, 0, self.size - 1)
+
+    def sum(self, dates, weights) -> np.ndarray:
+        """
+        Sum ``weights`` per bucket. Empty buckets are 0.
+        """
+        if self.size == 0:
+            return np.zeros(0)
+        return np.bincount(
+            self.bucket(dates), weights=np.asarray(weights, dtype=np.float64), minlength=self.size
+        )
+
+    def count(self, dates) -> np.ndarray:
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.bincount(self.bucket(dates), minlength=self.size)
+
+
+@lru_cache(maxsize=8)
+def day_bins(min_date: datetime, max_date: datetime) -> CalendarBins:
+    """
+    Day buckets for a hyperopt run. Cached - all epochs of a run share the same dates.
+    """
+    return CalendarBins(min_date, max_date, "1D")
+
+
+def daily_sum(results: DataFrame, column: str, min_date: datetime, max_date: datetime) -> np.ndarray:
+    """
+    Per-day sum of ``results[column]`` keyed on ``close_date``.
+    Drop-in for ``results.resample("1D", on="close_date")[column].sum()`` reindexed to the range.
+    """
+    bins = day_bins(min_date, max_date)
+    return bins.sum(results["close_date"], results[column].to_numpy())
+
+
+def sharpe(returns: np.ndarray, risk_free: float = 0.0) -> float:
+    """
+    Annualized Sharpe ratio of daily returns.
+    """
+    if len(returns) < 2:
+        return 0.0
+    excess = returns - risk_free
+    std = excess.std(ddof=1)
+    if std == 0 or not np.isfinite(std):
+        return 0.0
+    return float(excess.mean() / std * sqrt(DAYS_PER_YEAR))
+
+
+def sortino(returns: np.ndarray, minimum_acceptable: float = 0.0) -> float:
+    """
+    Annualized Sortino ratio of daily returns, using downside deviation below ``minimum_acceptable``.
+    """
+    if len(returns) < 2:
+        return 0.0
+    excess = returns - minimum_acceptable
+    downside = np.minimum(excess, 0.0)
+    down_std = sqrt(float(np.dot(downside, downside)) / len(downside))
+    if down_std == 0:
+        return 0.0
+    return float(excess.mean() / down_std * sqrt(DAYS_PER_YEAR))
+
+
+def max_drawdown(profits: np.ndarray, starting_balance: float) -> float:
+    """
+    Largest relative drop of the equity curve ``starting_balance + cumsum(profits)``
+    from its running peak. Returns a positive ratio (0.1 == 10%).
+    """
+    if len(profits) == 0:
+        return 0.0
+    equity = starting_balance + np.cumsum(profits)
+    peak = np.maximum.accumulate(np.maximum(equity, starting_balance))
+    return float(np.max((peak - equity) / peak))
+
+
+def calmar(profits: np.ndarray, starting_balance: float) -> float:
+    """
+    Annualized return over max drawdown for daily absolute profits.
+    """
+    days = len(profits)
+    if days == 0 or starting_balance <= 0:
+        return 0.0
+    annual_return = profits.sum() / starting_balance / days * DAYS_PER_YEAR
+    drawdown = max_drawdown(profits, starting_balance)
+    if drawdown == 0:
+        # No drawdown at all - reward the return, but keep it finite.
+        return float(annual_return * 100)
+    return float(annual_return / drawdown)
@@ -0,0 +1,302 @@
+"""
+Per-callback latency histograms for running bots.
+
+``CallbackMetricsMixin`` times every strategy callback the strategy overrides
+(``populate_*``, ``custom_stoploss``, ``adjust_trade_position``, ``custom_stake_amount``,
+``confirm_trade_*``, ...) per pair, and tracks the bot loop itself: the time between two
+``bot_loop_start`` calls, the strategy time spent inside it and the number of loops that
+took longer than one candle (overruns - the bot fell a candle behind).
+
+    class NostalgiaForInfinityNext(CallbackMetricsMixin, CompactFrameMixin, IStrategy):
+        ...
+
+Snapshots are written as JSON (atomic replace) every ``interval`` seconds, from the bot
+loop - no extra thread. The Node side reads them per BotInstance
+(``services/freqtrade/metricsReader.js``). Configuration, all optional:
+
+    "callback_metrics": {"enabled": true, "path": "<user_data_dir>/metrics/callbacks.json",
+                         "interval": 15}
+
+Recording a call costs two ``perf_counter_ns`` reads, a ``bisect`` over the bucket bounds
+and a dict lookup (~1 us); the measured cost per call is calibrated at start-up and the
+snapshot reports the resulting share of loop time as ``overhead_ratio``.
+"""
+import inspect
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+CALLBACKS = (
+    "bot_start", "bot_loop_start",
+    "populate_indicators", "populate_entry_trend", "populate_exit_trend",
+    "custom_stoploss", "custom_roi", "custom_exit", "custom_stake_amount", "adjust_trade_position",
+    "custom_entry_price", "custom_exit_price", "confirm_trade_entry", "confirm_trade_exit",
+    "check_entry_timeout", "check_exit_timeout", "leverage", "order_filled",
+)
+
+# Upper bucket bounds: 10 us doubling every two buckets up to ~20 s, then +Inf.
+BUCKET_BOUNDS_NS = [int(10_000 * 2 ** (i / 2)) for i in range(43)]
+
+DEFAULT_INTERVAL = 15.0
+
+METRICS_FILENAME = Path("metrics") / "callbacks.json"
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced buckets; quantiles are read from the bucket bounds.
+    """
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = BUCKET_BOUNDS_NS[index] if index < len(BUCKET_BOUNDS_NS) else self.max_ns
+                return min(bound, self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_seconds": self.total_ns / 1e9,
+            "max_seconds": self.max_ns / 1e9,
+            "p50_seconds": self.quantile(0.5),
+            "p90_seconds": self.quantile(0.9),
+            "p99_seconds": self.quantile(0.99),
+            # [upper bound in seconds (None = +Inf), count], non-empty buckets only
+            "buckets": [
+                [BUCKET_BOUNDS_NS[index] / 1e9 if index < len(BUCKET_BOUNDS_NS) else None, count]
+                for index, count in enumerate(self.counts) if count
+            ],
+        }
+
+
+def _call_pair(args: tuple, kwargs: dict) -> str:
+    """
+    Pair of a callback call: ``pair=`` / ``trade=`` keywords or the ``metadata`` dict of
+    ``populate_*``; '' for pair-less callbacks (``bot_loop_start``, ...).
+    """
+    pair = kwargs.get("pair")
+    if pair is None:
+        trade = kwargs.get("trade")
+        if trade is not None:
+            return getattr(trade, "pair", "")
+        if len(args) > 1 and isinstance(args[1], dict):
+            return args[1].get("pair", "")
+        if args and isinstance(args[0], str):
+            return args[0]
+        return ""
+    return pair
+
+
+class CallbackRecorder:
+    """
+    Histograms per (callback, pair) plus bot loop accounting and snapshot writing.
+    """
+
+    def __init__(self, path: Path, candle_seconds: float, interval: float = DEFAULT_INTERVAL,
+                 strategy: str = ""):
+        self.path = Path(path)
+        self.candle_seconds = candle_seconds
+        self.interval = interval
+        self.strategy = strategy
+        self.started_at = datetime.now(timezone.utc)
+        self.histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self.loop_histogram = LatencyHistogram()
+        self.busy_histogram = LatencyHistogram()
+        self.loops = 0
+        self.overruns = 0
+        self.calls = 0
+        self.callback_ns = 0
+        self.loop_wall_ns = 0
+        self._loop_start_ns: Optional[int] = None
+        self._loop_busy_ns = 0
+        self._next_write = time.monotonic() + interval
+        self.call_cost_ns = 0.0
+
+    def record(self, name: str, pair: str, elapsed_ns: int) -> None:
+        histogram = self.histograms.get((name, pair))
+        if histogram is None:
+            histogram = self.histograms[(name, pair)] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+        self.calls += 1
+        self.callback_ns += elapsed_ns
+        self._loop_busy_ns += elapsed_ns
+
+    def loop_started(self, now_ns: int) -> None:
+        if self._loop_start_ns is not None:
+            elapsed = now_ns - self._loop_start_ns
+            self.loop_histogram.record(elapsed)
+            self.busy_histogram.record(self._loop_busy_ns)
+            self.loop_wall_ns += elapsed
+            self.loops += 1
+            if elapsed > self.candle_seconds * 1e9:
+                self.overruns += 1
+        self._loop_start_ns = now_ns
+        self._loop_busy_ns = 0
+        if time.monotonic() >= self._next_write:
+            self._next_write = time.monotonic() + self.interval
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning(f"Could not write callback metrics to {self.path}: {e}")
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        record, perf_counter_ns = self.record, time.perf_counter_ns
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, _call_pair(args, kwargs), perf_counter_ns() - start)
+
+        # getfullargspec ignores __wrapped__; freqtrade reads it on the strategy (after_fill
+        # of custom_stoploss, the populate_* arity), so report what the bound method reports.
+        timed.__signature__ = inspect.signature(getattr(func, "__func__", func))
+        return timed
+
+    def calibrate(self, calls: int = 2000) -> float:
+        """
+        Wrapper cost per call in ns, measured on a no-op callback and kept out of the histograms.
+        """
+        probe = CallbackRecorder(self.path, self.candle_seconds, self.interval)
+        noop = probe.wrap("noop", lambda *args, **kwargs: None)
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            noop(pair="BTC/USDT")
+        wrapped = time.perf_counter_ns() - start
+        start = time.perf_counter_ns()
+        plain = lambda *args, **kwargs: None  # noqa: E731
+        for _ in range(calls):
+            plain(pair="BTC/USDT")
+        self.call_cost_ns = max(0, wrapped - (time.perf_counter_ns() - start)) / calls
+        return self.call_cost_ns
+
+    def snapshot(self) -> dict[str, Any]:
+        callbacks: dict[str, dict[str, Any]] = {}
+        totals: dict[str, LatencyHistogram] = {}
+        for (name, pair), histogram in sorted(self.histograms.items()):
+            entry = callbacks.setdefault(name, {"pairs": {}})
+            if pair:
+                entry["pairs"][pair] = histogram.to_dict()
+            totals.setdefault(name, LatencyHistogram()).merge(histogram)
+        for name, histogram in totals.items():
+            callbacks[name]["all"] = histogram.to_dict()
+        return {
+            "strategy": self.strategy,
+            "pid": os.getpid(),
+            "started_at": self.started_at.isoformat(),
+            "written_at": datetime.now(timezone.utc).isoformat(),
+            "candle_seconds": self.candle_seconds,
+            "loops": {
+                "count": self.loops,
+                "overruns": self.overruns,
+                "duration": self.loop_histogram.to_dict(),
+                "strategy_busy": self.busy_histogram.to_dict(),
+            },
+            "calls": self.calls,
+            "call_cost_ns": self.call_cost_ns,
+            "overhead_ratio": self.calls * self.call_cost_ns / self.loop_wall_ns if self.loop_wall_ns else None,
+            "callbacks": callbacks,
+        }
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, self.path)
+        return self.path
+
+
+def overridden_callbacks(strategy_cls: type, base: type) -> list[str]:
+    """
+    Callbacks in ``CALLBACKS`` that ``strategy_cls`` defines somewhere below ``base``.
+    """
+    names = []
+    for name in CALLBACKS:
+        for klass in strategy_cls.__mro__:
+            if klass is base or klass is CallbackMetricsMixin:
+                break
+            if name in vars(klass):
+                names.append(name)
+                break
+    return names
+
+
+class CallbackMetricsMixin:
+    """
+    Times the strategy callbacks of live / dry-run bots. Put it before ``IStrategy`` in
+    the bases.
+    """
+
+    callback_metrics_runmodes = ("dry_run", "live")
+
+    def __init__(self, config: dict) -> None:
+        from freqtrade.exchange import timeframe_to_seconds
+
+        super().__init__(config)
+        self.callback_metrics: Optional[CallbackRecorder] = None
+        settings = config.get("callback_metrics", {})
+        runmode = getattr(config.get("runmode"), "value", config.get("runmode"))
+        if not settings.get("enabled", runmode in self.callback_metrics_runmodes):
+            return
+
+        path = settings.get("path") or Path(config.get("user_data_dir") or "user_data") / METRICS_FILENAME
+        recorder = CallbackRecorder(
+            path,
+            candle_seconds=timeframe_to_seconds(self.timeframe),
+            interval=float(settings.get("interval", DEFAULT_INTERVAL)),
+            strategy=type(self).__name__,
+        )
+        recorder.calibrate()
+        base = next((klass for klass in type(self).__mro__ if klass.__name__ == "IStrategy"), object)
+        for name in overridden_callbacks(type(self), base):
+            setattr(self, name, recorder.wrap(name, getattr(self, name)))
+
+        # The loop clock runs whether or not bot_loop_start is overridden.
+        loop_start = getattr(self, "bot_loop_start")
+
+        @wraps(loop_start)
+        def bot_loop_start(*args, **kwargs):
+            recorder.loop_started(time.perf_counter_ns())
+            return loop_start(*args, **kwargs)
+
+        self.bot_loop_start = bot_loop_start
+        self.callback_metrics = recorder
+        logger.info(f"Callback metrics enabled, writing to {recorder.path} every {recorder.interval:.0f}s "
+                    f"(~{recorder.call_cost_ns:.0f} ns per timed call).")
@@ -0,0 +1,210 @@
+"""
+Compact dtypes for analyzed dataframes.
+
+A bot keeps the analyzed frame of every pair in memory. Indicators come out of TA-Lib
+and pandas as float64, signals as int64 / float64 (``.loc[cond, 'enter_long'] = 1``
+leaves NaN elsewhere) and tags or labels (Supertrend's 'up' / 'down', ``enter_tag``)
+as Python strings. ``compact_frame`` converts an analyzed frame to:
+
+- float32 for indicator columns (OHLCV stays float64 - freqtrade prices trades from it),
+- int8 for signal columns (NaN becomes 0, which is how freqtrade reads a missing signal),
+- the smallest integer type for other integer columns,
+- categoricals for string columns (one copy of each distinct tag per frame).
+
+Strategies opt in with the mixin; it compacts after ``populate_exit_trend``, so the
+signals are computed from the full-precision indicators:
+
+    class Supertrend(CompactFrameMixin, IStrategy):
+        ...
+
+Only dry-run / live frames are compacted by default (``compact_frame_runmodes``);
+backtesting keeps the original dtypes.
+
+``python -m ftlib.compact_frame [PATHS]`` reports the bytes saved per strategy on the
+bundled candles and checks that signals and tags are unchanged - both after conversion
+and when the signals are recomputed from float32 indicators.
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+SIGNAL_COLUMNS = ("enter_long", "exit_long", "enter_short", "exit_short", "buy", "sell")
+
+TAG_COLUMNS = ("enter_tag", "exit_tag", "buy_tag", "exit_reason")
+
+
+def _compact_column(series: pd.Series, name: Any) -> pd.Series:
+    dtype = series.dtype
+    if name in SIGNAL_COLUMNS and (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)):
+        return series.fillna(0).astype(np.int8)
+    if name in PRICE_COLUMNS or pd.api.types.is_bool_dtype(dtype):
+        return series
+    if pd.api.types.is_float_dtype(dtype):
+        return series.astype(np.float32) if dtype == np.float64 else series
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+        return series.astype("category")
+    return series
+
+
+def compact_frame(dataframe: DataFrame) -> DataFrame:
+    """
+    Copy of ``dataframe`` with compact dtypes (see module docstring).
+    """
+    return DataFrame(
+        {name: _compact_column(dataframe[name], name) for name in dataframe.columns},
+        index=dataframe.index,
+    )
+
+
+def frame_bytes(dataframe: DataFrame) -> int:
+    return int(dataframe.memory_usage(index=True, deep=True).sum())
+
+
+def signals_equal(original: DataFrame, compacted: DataFrame) -> list[str]:
+    """
+    Signal and tag columns whose values differ between two frames ([] if all match).
+    Missing signals compare as 0 and missing tags as empty.
+    """
+    differing = []
+    for name in original.columns:
+        if name in SIGNAL_COLUMNS:
+            before = original[name].fillna(0).to_numpy(dtype=float)
+            after = compacted[name].fillna(0).to_numpy(dtype=float) if name in compacted else np.zeros(len(before))
+        elif name in TAG_COLUMNS:
+            before = original[name].astype(object).where(original[name].notna(), "").to_numpy()
+            after = compacted[name].astype(object).where(compacted[name].notna(), "").to_numpy() \
+                if name in compacted else np.full(len(before), "", dtype=object)
+        else:
+            continue
+        if len(before) != len(after) or not (before == after).all():
+            differing.append(name)
+    return differing
+
+
+class CompactFrameMixin:
+    """
+    Compacts the analyzed frame after the exit signals are populated. Put it before
+    ``IStrategy`` in the bases.
+    """
+
+    compact_frame_runmodes: Iterable[str] = ("dry_run", "live")
+
+    def advise_exit(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        dataframe = super().advise_exit(dataframe, metadata)
+        runmode = getattr(self.config.get("runmode"), "value", self.config.get("runmode"))
+        if runmode in self.compact_frame_runmodes:
+            dataframe = compact_frame(dataframe)
+        return dataframe
+
+
+def compare_strategy(strategy, frame: DataFrame, pair: str) -> dict[str, Any]:
+    """
+    Bytes before / after compaction of the analyzed frame and signal equality checks.
+    """
+    from ftlib.strategy_bench import PHASES
+
+    metadata = {"pair": pair}
+    with contextlib.redirect_stdout(io.StringIO()):
+        indicators = strategy.populate_indicators(frame.copy(), metadata)
+        analyzed = indicators.copy()
+        for phase in PHASES[1:]:
+            analyzed = getattr(strategy, phase)(analyzed, metadata)
+        compacted = compact_frame(analyzed)
+
+        # Signals recomputed from float32 indicators: would compacting earlier flip a threshold?
+        try:
+            recomputed = compact_frame(indicators)
+            for phase in PHASES[1:]:
+                recomputed = getattr(strategy, phase)(recomputed, metadata)
+            changed_float32 = signals_equal(analyzed, recomputed)
+        except Exception as e:
+            changed_float32 = [f"error: {e!r}"]
+
+    before, after = frame_bytes(analyzed), frame_bytes(compacted)
+    return {
+        "candles": len(frame),
+        "columns": len(analyzed.columns),
+        "bytes_before": before,
+        "bytes_after": after,
+        "saved_ratio": 1 - after / before if before else 0.0,
+        "signals_changed": signals_equal(analyzed, compacted),
+        "signals_changed_float32": changed_float32,
+    }
+
+
+def print_report(results: list[dict[str, Any]]) -> None:
+    print(f"{'Strategy':<32} {'Cols':>5} {'Before KB':>10} {'After KB':>9} {'Saved':>6}  Signals")
+    for result in results:
+        if "error" in result:
+            print(f"{result['strategy']:<32} error: {result['error']}")
+            continue
+        if result["signals_changed"]:
+            check = "CHANGED: " + ", ".join(result["signals_changed"])
+        elif result["signals_changed_float32"]:
+            check = "same (float32 recompute differs: " + ", ".join(result["signals_changed_float32"]) + ")"
+        else:
+            check = "same"
+        print(f"{result['strategy']:<32} {result['columns']:>5} {result['bytes_before'] / 1024:>10.0f} "
+              f"{result['bytes_after'] / 1024:>9.0f} {result['saved_ratio']:>6.0%}  {check}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    # Report helpers only: live bots import the mixin from this module.
+    from ftlib.strategy_bench import load_candles, synthetic_candles
+    from ftlib.strategy_loader import DATA_DIR, iter_strategy_files, load_module, load_strategy, strategy_classes
+
+    parser = argparse.ArgumentParser(description="Bytes saved by compact analyzed frames, per strategy.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories.")
+    parser.add_argument("--pair", default="BTC/USDT")
+    parser.add_argument("--datadir", type=Path, default=DATA_DIR)
+    parser.add_argument("--candles", type=int, default=500, help="Most recent N candles (bot default: 500).")
+    parser.add_argument("--synthetic", action="store_true", help="Use a synthetic series instead of bundled data.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for path in iter_strategy_files(args.paths or None):
+        try:
+            classes = strategy_classes(load_module(path))
+        except Exception as e:
+            results.append({"strategy": path.stem, "error": f"import: {e!r}"})
+            continue
+        for strategy_cls in classes:
+            entry: dict[str, Any] = {"strategy": strategy_cls.__name__, "file": str(path)}
+            timeframe = getattr(strategy_cls, "timeframe", "5m")
+            frame = synthetic_candles(max(args.candles, 1000), timeframe) if args.synthetic \
+                else load_candles(args.pair, timeframe, args.datadir)
+            if frame is None:
+                entry["error"] = f"no {timeframe} data for {args.pair}"
+            else:
+                startup = int(getattr(strategy_cls, "startup_candle_count", 0) or 0)
+                frame = frame.iloc[-(args.candles + startup):].reset_index(drop=True)
+                try:
+                    entry.update(compare_strategy(load_strategy(path, strategy_cls.__name__, args.pair),
+                                                  frame, args.pair))
+                except Exception as e:
+                    entry["error"] = repr(e)
+            results.append(entry)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 1 if any(result.get("signals_changed") for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
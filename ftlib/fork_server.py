@@ -0,0 +1,507 @@
+"""
+Pre-warmed fork server for freqtrade bot processes.
+
+Every pm2 start of a bot is a cold ``python -m freqtrade trade``: the interpreter,
+numpy, pandas, TA-Lib, ccxt, freqtrade and every library the strategies import are
+loaded from scratch, for each instance, after each deploy or demo-expiry sweep. The fork
+server imports all of that once, freezes it (``gc.freeze()``, so the collector does not
+dirty the shared pages) and forks a child per bot start. The child only parses its config,
+loads its strategy and markets; the imported modules stay shared copy-on-write between
+all children.
+
+pm2 keeps managing bots as before. It runs the thin client instead of freqtrade:
+
+    python -m ftlib.fork_server spawn -- trade --config <config.json> -vv
+
+The client (standard library only, no heavy imports) hands its stdin/stdout/stderr to the
+server (``SCM_RIGHTS``), so the bot writes to pm2's log files; it forwards SIGINT /
+SIGTERM / SIGHUP to the bot and exits with the bot's exit code. If the client goes away,
+the server terminates its bot. Without a server (not running, or no ``fork`` / unix
+sockets on this platform) the client execs ``python -m freqtrade`` itself.
+
+The server runs under pm2 as well:
+
+    pm2 start python --name ft-fork-server -- -m ftlib.fork_server serve
+
+Set ``FREQTRADE_FORK_SERVER_SOCKET`` for the API so the launchers use the client.
+``bench`` compares cold starts with forked starts: time until a bot first populates
+indicators, and the PSS of all bots.
+"""
+import argparse
+import gc
+import importlib
+import json
+import logging
+import os
+import re
+import selectors
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = Path(os.environ.get("FREQTRADE_FORK_SERVER_SOCKET") or "/tmp/ft_fork_server.sock")
+
+# Imported by the server before forking; failures are logged and skipped.
+PRELOAD_MODULES = (
+    "numpy", "pandas", "talib", "talib.abstract", "ccxt", "ccxt.async_support", "ccxt.pro", "aiohttp",
+    "sqlalchemy", "sqlalchemy.orm", "rapidjson", "orjson", "pyarrow", "pyarrow.feather",
+    "freqtrade.main", "freqtrade.commands", "freqtrade.configuration", "freqtrade.worker",
+    "freqtrade.freqtradebot", "freqtrade.exchange", "freqtrade.persistence", "freqtrade.strategy",
+    "freqtrade.resolvers", "freqtrade.rpc", "freqtrade.rpc.telegram", "freqtrade.vendor.qtpylib.indicators",
+    "technical.indicators", "ftlib.compact_frame", "ftlib.signal_expr", "ftlib.stake_sizing",
+    "ftlib.callback_metrics", "ftlib.moving_averages", "ftlib.oscillators", "ftlib.bollinger",
+)
+
+# A bot log line showing the strategy analyzed its first pair (freqtrade logs it at -v and up).
+FIRST_ANALYSIS_RE = r"Populating indicators for pair"
+
+_HEADER = struct.Struct("!I")
+
+
+def _send(sock: socket.socket, message: dict[str, Any], fds: Optional[list[int]] = None) -> None:
+    payload = json.dumps(message).encode()
+    data = _HEADER.pack(len(payload)) + payload
+    if fds:
+        socket.send_fds(sock, [data], fds)
+    else:
+        sock.sendall(data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def _recv(sock: socket.socket, with_fds: int = 0) -> tuple[dict[str, Any], list[int]]:
+    fds: list[int] = []
+    if with_fds:
+        data, fds, _, _ = socket.recv_fds(sock, 1024 * 1024, with_fds)
+        if not data:
+            raise ConnectionError("connection closed")
+    else:
+        data = _recv_exact(sock, _HEADER.size)
+    (size,) = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size:]
+    if len(payload) < size:
+        payload += _recv_exact(sock, size - len(payload))
+    return json.loads(payload), fds
+
+
+def strategy_imports() -> list[str]:
+    """
+    Top-level modules imported by the shipped strategies (see ``ftlib.startup_profile``).
+    """
+    from ftlib.startup_profile import module_imports
+    from ftlib.strategy_loader import iter_strategy_files
+
+    modules = set()
+    for path in iter_strategy_files():
+        try:
+            modules.update(entry["module"] for entry in module_imports(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+    return sorted(modules)
+
+
+def preload(modules: list[str]) -> dict[str, Any]:
+    """
+    Import ``modules`` (missing ones are skipped) and freeze the heap for forking.
+    """
+    start = time.perf_counter()
+    loaded, failed = [], {}
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception as e:
+            failed[name] = f"{type(e).__name__}: {e}"
+    gc.collect()
+    gc.freeze()
+    return {"seconds": time.perf_counter() - start, "loaded": loaded, "failed": failed}
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class ForkServer:
+    """
+    Single-threaded accept / fork / reap loop (a server with threads must not fork).
+    """
+
+    def __init__(self, path: Path = DEFAULT_SOCKET):
+        self.path = Path(path)
+        self.selector = selectors.DefaultSelector()
+        self.listener: Optional[socket.socket] = None
+        self.children: dict[int, dict[str, Any]] = {}
+        self.warm: dict[str, Any] = {}
+        self.started = 0
+        self._running = True
+
+    def listen(self) -> None:
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+                raise RuntimeError(f"a fork server is already listening on {self.path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.path.unlink()
+            finally:
+                probe.close()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        self.listener.listen(128)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+    def _spawn(self, conn: socket.socket, request: dict[str, Any], fds: list[int]) -> None:
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            self._child(request, fds)  # never returns
+        for fd in fds:
+            os.close(fd)
+        self.started += 1
+        self.children[pid] = {"conn": conn, "argv": request["argv"], "started_at": time.time()}
+        self.selector.register(conn, selectors.EVENT_READ, pid)
+        _send(conn, {"pid": pid})
+        logger.info(f"Forked {pid}: freqtrade {' '.join(request['argv'])}")
+
+    def _child(self, request: dict[str, Any], fds: list[int]) -> None:
+        code = 1
+        try:
+            os.setsid()
+            for signum in (signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+                signal.signal(signum, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self.selector.close()
+            self.listener.close()
+            for child in self.children.values():
+                child["conn"].close()
+            for target, fd in enumerate(fds[:3]):
+                os.dup2(fd, target)
+            for fd in fds:
+                if fd > 2:
+                    os.close(fd)
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            sys.stdin, sys.stdout, sys.stderr = (
+                open(0, "r", closefd=False), open(1, "w", buffering=1, closefd=False),
+                open(2, "w", buffering=1, closefd=False),
+            )
+            logging.root.handlers.clear()
+            _reseed()
+            sys.argv = ["freqtrade", *request["argv"]]
+            from freqtrade.main import main
+
+            main(request["argv"])
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            import traceback
+
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+    def _accept(self) -> None:
+        conn, _ = self.listener.accept()
+        conn.setblocking(True)
+        conn.settimeout(10)
+        try:
+            request, fds = _recv(conn, with_fds=3)
+            conn.settimeout(None)
+            if request.get("cmd") == "status":
+                _send(conn, self.status())
+                conn.close()
+            elif request.get("cmd") == "spawn" and len(fds) == 3:
+                self._spawn(conn, request, fds)
+            else:
+                for fd in fds:
+                    os.close(fd)
+                _send(conn, {"error": "expected status, or spawn with stdin/stdout/stderr"})
+                conn.close()
+        except (OSError, ValueError, ConnectionError) as e:
+            logger.warning(f"Bad fork server request: {e}")
+            conn.close()
+
+    def _client_closed(self, pid: int) -> None:
+        """
+        The client of ``pid`` went away (pm2 killed it): stop the bot too.
+        """
+        child = self.children.get(pid)
+        if child is None or child.get("orphaned"):
+            return
+        self.selector.unregister(child["conn"])
+        child["orphaned"] = True
+        logger.info(f"Client of {pid} disconnected, terminating it.")
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            child = self.children.pop(pid, None)
+            if child is None:
+                continue
+            code = _exit_code(status)
+            logger.info(f"Child {pid} exited with {code}.")
+            if not child.get("orphaned"):
+                self.selector.unregister(child["conn"])
+                try:
+                    _send(child["conn"], {"exit": code})
+                except OSError:
+                    pass
+            child["conn"].close()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "warm_seconds": self.warm.get("seconds"),
+            "preloaded": len(self.warm.get("loaded", [])),
+            "started": self.started,
+            "children": [{"pid": pid, "argv": child["argv"], "started_at": child["started_at"]}
+                         for pid, child in self.children.items()],
+        }
+
+    def stop(self, *_) -> None:
+        self._running = False
+
+    def serve(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.listen()
+        logger.info(f"Fork server listening on {self.path}.")
+        try:
+            while self._running:
+                for key, _ in self.selector.select(timeout=0.5):
+                    if key.fileobj is self.listener:
+                        self._accept()
+                    elif not key.fileobj.recv(1024):
+                        # Clients send nothing once the bot runs; readable means EOF.
+                        self._client_closed(key.data)
+                self._reap()
+        finally:
+            for pid in list(self.children):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            deadline = time.monotonic() + 30
+            while self.children and time.monotonic() < deadline:
+                self._reap()
+                time.sleep(0.1)
+            self.listener.close()
+            self.path.unlink(missing_ok=True)
+
+
+def _reseed() -> None:
+    """
+    Forked children would otherwise share the parent's random state.
+    """
+    import random
+
+    random.seed()
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        numpy.random.seed()
+
+
+def _exec_freqtrade(argv: list[str]) -> None:
+    os.execv(sys.executable, [sys.executable, "-m", "freqtrade", *argv])
+
+
+def spawn(argv: list[str], path: Path = DEFAULT_SOCKET) -> int:
+    """
+    Client: start ``freqtrade <argv>`` through the server and wait for it like pm2 expects.
+    """
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        _exec_freqtrade(argv)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        _send(sock, {"cmd": "spawn", "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}, [0, 1, 2])
+        reply, _ = _recv(sock)
+    except (OSError, ConnectionError) as e:
+        sock.close()
+        print(f"fork server unavailable ({e}), starting freqtrade directly", file=sys.stderr)
+        _exec_freqtrade(argv)
+    if "pid" not in reply:
+        print(f"fork server refused the start: {reply.get('error')}", file=sys.stderr)
+        return 1
+    pid = reply["pid"]
+
+    def forward(signum, _frame):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, forward)
+    try:
+        message, _ = _recv(sock)
+        return int(message.get("exit", 1))
+    except ConnectionError:
+        # Server gone: the bot may still run (re-parented); wait for it to go as well.
+        while True:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return 1
+            time.sleep(1)
+
+
+def server_status(path: Path = DEFAULT_SOCKET) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        _send(sock, {"cmd": "status"})
+        return _recv(sock)[0]
+
+
+def _wait_for_pattern(logfiles: list[Path], pattern: str, started: float, timeout: float) -> list[Optional[float]]:
+    regex = re.compile(pattern)
+    seen: list[Optional[float]] = [None] * len(logfiles)
+    while time.monotonic() - started < timeout and None in seen:
+        for index, logfile in enumerate(logfiles):
+            if seen[index] is None and logfile.exists() and regex.search(logfile.read_text(errors="replace")):
+                seen[index] = time.monotonic() - started
+        time.sleep(0.2)
+    return seen
+
+
+def bench(args: argparse.Namespace) -> int:
+    """
+    Start ``--bots`` dry-run copies of a config cold (``python -m freqtrade``) and through
+    the fork server; report time to first analysis and total PSS for both.
+    """
+    from ftlib.bot_host import _bench_copies, process_pss
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="fork_server_bench_") as tmp:
+        server = None
+        for mode in ("cold", "forked"):
+            specs = _bench_copies(args.config, args.bots, Path(tmp) / mode)
+            if mode == "forked":
+                socket_path = Path(tmp) / "fork.sock"
+                server = subprocess.Popen([sys.executable, "-m", "ftlib.fork_server", "serve",
+                                           "--socket", str(socket_path)], stdout=subprocess.DEVNULL)
+                deadline = time.monotonic() + 300
+                while not socket_path.exists() and time.monotonic() < deadline:
+                    time.sleep(0.2)
+                launcher = [sys.executable, "-m", "ftlib.fork_server", "spawn", "--socket", str(socket_path), "--"]
+            else:
+                launcher = [sys.executable, "-m", "freqtrade"]
+            started = time.monotonic()
+            processes = [
+                subprocess.Popen(launcher + ["trade", "--config", spec.config[0], "-vv"]
+                                 + (["--strategy-path", spec.strategy_path] if spec.strategy_path else []),
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                for spec in specs
+            ]
+            logfiles = [Path(json.loads(Path(spec.config[0]).read_text())["logfile"]) for spec in specs]
+            try:
+                times = _wait_for_pattern(logfiles, args.pattern, started, args.timeout)
+                if mode == "forked":
+                    pids = [child["pid"] for child in server_status(socket_path)["children"]]
+                else:
+                    pids = [process.pid for process in processes]
+                sizes = [process_pss(pid) for pid in pids]
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait(60)
+            done = [value for value in times if value is not None]
+            results[mode] = {
+                "bots": args.bots,
+                "analyzed": len(done),
+                "first_analysis_median_s": sorted(done)[len(done) // 2] if done else None,
+                "first_analysis_max_s": max(done) if done else None,
+                "pss_total_mb": sum(sizes) / 1e6 if None not in sizes else None,
+            }
+        if server is not None:
+            server.terminate()
+            server.wait(60)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode, row in results.items():
+            print(f"{mode:>7}: {row['analyzed']}/{row['bots']} analyzed, median {row['first_analysis_median_s']} s, "
+                  f"max {row['first_analysis_max_s']} s, PSS {row['pss_total_mb']} MB")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-warmed fork server for freqtrade bots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Preload libraries and fork bots on request.")
+    serve_parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    serve_parser.add_argument("--no-strategy-imports", action="store_true",
+                              help="Only preload the fixed module list, not the strategies' imports.")
+    spawn_parser = commands.add_parser("spawn", help="Start freqtrade through the server (pm2 entry point).")
+    spawn_parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    spawn_parser.add_argument("argv", nargs=argparse.REMAINDER, help="freqtrade arguments, after --.")
+    status_parser = commands.add_parser("status", help="Show the server's children.")
+    status_parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    bench_parser = commands.add_parser("bench", help="Cold vs. forked starts: first analysis time and PSS.")
+    bench_parser.add_argument("--config", type=Path, required=True)
+    bench_parser.add_argument("--bots", type=int, default=10)
+    bench_parser.add_argument("--pattern", default=FIRST_ANALYSIS_RE)
+    bench_parser.add_argument("--timeout", type=float, default=300.0)
+    bench_parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "spawn":
+        return spawn(args.argv[1:] if args.argv[:1] == ["--"] else args.argv, args.socket)
+    if args.command == "status":
+        print(json.dumps(server_status(args.socket), indent=2))
+        return 0
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if args.command == "bench":
+        return bench(args)
+
+    modules = list(PRELOAD_MODULES)
+    if not args.no_strategy_imports:
+        modules += [name for name in strategy_imports() if name not in modules]
+    server = ForkServer(args.socket)
+    server.warm = preload(modules)
+    logger.info(f"Preloaded {len(server.warm['loaded'])} modules in {server.warm['seconds']:.1f}s "
+                f"({len(server.warm['failed'])} unavailable).")
+    server.serve()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
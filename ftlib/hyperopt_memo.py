@@ -0,0 +1,316 @@
+"""
+Epoch memoization for freqtrade hyperopt.
+
+The sampler often proposes parameter sets that collapse to an already evaluated
+combination once ``.value`` semantics are applied (``DecimalParameter`` rounding,
+small ``IntParameter`` ranges, ...). This module canonicalizes every proposed
+parameter dict to a hash and returns the stored epoch result for repeats instead
+of running another backtest. The memo lives in a SQLite file, so resumed or
+repeated runs with the same strategy / data / loss reuse it too. Runs are told apart by
+the effective config, the strategy source and its parameter file, the timerange after the
+startup-candle adjustment and the content of the candles hyperopt loaded (an open-ended ``--timerange 20250101-`` over
+refreshed data is a different run).
+
+Usage (same arguments as ``freqtrade hyperopt``):
+    python -m ftlib.hyperopt_memo hyperopt --config user_data/config.json --strategy GodStraNew ...
+
+The memo file defaults to ``user_data/hyperopt_results/epoch_memo.sqlite``
+and can be moved with ``FT_HYPEROPT_MEMO_DB``.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMO_DB = "user_data/hyperopt_results/epoch_memo.sqlite"
+
+# Hyperopt options that change which parameter sets are tried or how results are shown,
+# not what a given parameter set evaluates to. Everything else in the effective config
+# (``backtest_cache.normalized_config``) is part of the run fingerprint.
+HYPEROPT_RUN_KEYS = (
+    "epochs", "effort", "early_stop", "hyperopt_jobs", "hyperopt_random_state", "print_all",
+    "print_json", "hyperopt_show_index", "hyperopt_show_no_header", "hyperopt_path",
+    "hyperoptexportfilename", "analyze_per_epoch", "hyperopt_ignore_missing_space",
+)
+
+# Significant digits kept for floats without parameter metadata (roi / stoploss / trailing spaces).
+FLOAT_DIGITS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS epochs (
+    fingerprint TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    loss REAL,
+    result BLOB NOT NULL,
+    PRIMARY KEY (fingerprint, params_hash)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class HyperoptMemo:
+    """
+    SQLite-backed store of epoch results, keyed on (run fingerprint, canonical params hash).
+    Safe to open from several hyperopt worker processes at once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def get(self, fingerprint: str, params_hash: str) -> Optional[dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT result FROM epochs WHERE fingerprint = ? AND params_hash = ?",
+            (fingerprint, params_hash),
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, fingerprint: str, params_hash: str, params: dict, result: dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO epochs (fingerprint, params_hash, params, loss, result) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                fingerprint,
+                params_hash,
+                json.dumps(params, sort_keys=True, default=str),
+                result.get("loss"),
+                pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL),
+            ),
+        )
+
+    def start_session(self, fingerprint: str) -> str:
+        session = uuid.uuid4().hex
+        self._conn.execute(
+            "INSERT INTO sessions (session, fingerprint) VALUES (?, ?)", (session, fingerprint)
+        )
+        return session
+
+    def record(self, session: str, hit: bool) -> None:
+        column = "hits" if hit else "misses"
+        self._conn.execute(f"UPDATE sessions SET {column} = {column} + 1 WHERE session = ?", (session,))
+
+    def session_stats(self, session: str) -> tuple[int, int]:
+        row = self._conn.execute(
+            "SELECT hits, misses FROM sessions WHERE session = ?", (session,)
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def size(self, fingerprint: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM epochs WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()[0]
+
+
+# One open memo per process - hyperopt workers receive only the path.
+_memos: dict[str, HyperoptMemo] = {}
+
+
+def _open_memo(path: str) -> HyperoptMemo:
+    if path not in _memos:
+        _memos[path] = HyperoptMemo(path)
+    return _memos[path]
+
+
+def _canonical_float(value: float) -> float:
+    return float(f"{value:.{FLOAT_DIGITS}g}")
+
+
+def canonical_value(value: Any, parameter: Any = None) -> Any:
+    """
+    Apply the ``.value`` semantics of a strategy parameter to a raw sampler value.
+    """
+    from freqtrade.strategy.parameters import DecimalParameter, IntParameter
+
+    if hasattr(value, "item"):
+        # numpy scalar from the sampler
+        value = value.item()
+    if isinstance(parameter, IntParameter):
+        return int(round(value))
+    if isinstance(parameter, DecimalParameter):
+        return round(float(value), parameter._decimals)
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, float):
+        return _canonical_float(value)
+    return str(value)
+
+
+def canonical_params(params: dict[str, Any], strategy: Any = None) -> dict[str, Any]:
+    """
+    Canonical form of a proposed parameter dict.
+    Strategy parameters are rounded like their ``.value`` would be, the remaining
+    spaces (roi, stoploss, trailing, ...) are normalized to ``FLOAT_DIGITS``.
+    """
+    return {
+        name: canonical_value(value, getattr(strategy, name, None) if strategy else None)
+        for name, value in sorted(params.items())
+    }
+
+
+def params_hash(params: dict[str, Any]) -> str:
+    payload = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_fingerprint(config: dict[str, Any], strategy_file: Optional[str] = None, timerange: Any = None,
+                    frames: Optional[dict[str, dict]] = None) -> str:
+    """
+    Hash of everything besides the parameters that determines an epoch result: the
+    effective config (minus ``HYPEROPT_RUN_KEYS``), the strategy source and its parameter
+    file (values of the spaces not being optimized), the resolved ``timerange`` and the
+    content of the loaded candle ``frames`` (``{"data": {pair: frame}, "detail": ...}``).
+    """
+    from ftlib.backtest_cache import frames_digest, normalized_config
+
+    parts = {
+        key: value for key, value in normalized_config(config).items()
+        if key not in HYPEROPT_RUN_KEYS and not key.startswith("hyperopt_list_")
+    }
+    if timerange is not None:
+        parts["timerange"] = [timerange.startts, timerange.stopts]
+    for name, data in sorted((frames or {}).items()):
+        parts[name] = frames_digest(data or {})
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode())
+    if strategy_file:
+        for path in (Path(strategy_file), Path(strategy_file).with_suffix(".json")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes() if path.is_file() else b"")
+    return digest.hexdigest()
+
+
+def _raw_params_dict(hyperopter: Any, raw_params: Any) -> dict[str, Any]:
+    if isinstance(raw_params, dict):
+        return raw_params
+    # Older (skopt based) optimizers pass a list ordered like the dimensions.
+    return {dim.name: value for dim, value in zip(hyperopter.dimensions, raw_params)}
+
+
+def _memoized_generate_optimizer(self, raw_params, *args, **kwargs):
+    if _ORIGINAL_GENERATE_OPTIMIZER is None:
+        # Fresh hyperopt worker process - it only imported this module to unpickle the wrapper.
+        install()
+    context = getattr(self, "_memo_context", None)
+    if context is None:
+        return _ORIGINAL_GENERATE_OPTIMIZER(self, raw_params, *args, **kwargs)
+
+    db_path, fingerprint, session = context
+    memo = _open_memo(db_path)
+    strategy = getattr(getattr(self, "backtesting", None), "strategy", None)
+    params = canonical_params(_raw_params_dict(self, raw_params), strategy)
+    key = params_hash(params)
+
+    cached = memo.get(fingerprint, key)
+    if cached is not None:
+        memo.record(session, hit=True)
+        return cached
+
+    result = _ORIGINAL_GENERATE_OPTIMIZER(self, raw_params, *args, **kwargs)
+    memo.put(fingerprint, key, params, result)
+    memo.record(session, hit=False)
+    return result
+
+
+def _memoized_start(self, *args, **kwargs):
+    db_path = os.environ.get("FT_HYPEROPT_MEMO_DB", DEFAULT_MEMO_DB)
+    memo = _open_memo(db_path)
+    hyperopter = getattr(self, "hyperopter", self)
+    backtesting = hyperopter.backtesting
+    strategy_file = getattr(backtesting.strategy, "__file__", None)
+    loaded: dict[str, Any] = {}
+
+    # The run is fingerprinted once hyperopt loaded its candles (load_bt_data, then
+    # load_bt_data_detail), before epochs are dispatched to the workers. The instance
+    # attributes are removed again right away: the workers receive a pickled hyperopter.
+    def load_bt_data():
+        del backtesting.load_bt_data
+        loaded["data"], loaded["timerange"] = backtesting.load_bt_data()
+        return loaded["data"], loaded["timerange"]
+
+    def load_bt_data_detail():
+        del backtesting.load_bt_data_detail
+        backtesting.load_bt_data_detail()
+        frames = {"data": loaded.get("data"), "detail": getattr(backtesting, "detail_data", None),
+                  "futures": getattr(backtesting, "futures_data", None)}
+        fingerprint = run_fingerprint(self.config, strategy_file, loaded.get("timerange"), frames)
+        loaded["session"] = memo.start_session(fingerprint)
+        hyperopter._memo_context = (db_path, fingerprint, loaded["session"])
+        logger.info(
+            f"Hyperopt epoch memo: {db_path} ({memo.size(fingerprint)} stored epochs for this run)"
+        )
+
+    backtesting.load_bt_data, backtesting.load_bt_data_detail = load_bt_data, load_bt_data_detail
+    try:
+        return _ORIGINAL_START(self, *args, **kwargs)
+    finally:
+        for name in ("load_bt_data", "load_bt_data_detail"):
+            vars(backtesting).pop(name, None)
+        if "session" in loaded:
+            hits, misses = memo.session_stats(loaded["session"])
+            total = hits + misses
+            rate = hits / total * 100 if total else 0.0
+            logger.info(
+                f"Hyperopt epoch memo: {hits}/{total} epochs served from memo ({rate:.1f}% hit rate)."
+            )
+
+
+def _optimizer_class():
+    try:
+        from freqtrade.optimize.hyperopt.hyperopt_optimizer import HyperOptimizer
+        return HyperOptimizer
+    except ImportError:
+        # Before the hyperopt package split generate_optimizer lived on Hyperopt itself.
+        from freqtrade.optimize.hyperopt import Hyperopt
+        return Hyperopt
+
+
+_ORIGINAL_GENERATE_OPTIMIZER = None
+_ORIGINAL_START = None
+
+
+def install() -> None:
+    """
+    Patch freqtrade's hyperopt to go through the memo. Idempotent.
+    """
+    global _ORIGINAL_GENERATE_OPTIMIZER, _ORIGINAL_START
+    from freqtrade.optimize.hyperopt import Hyperopt
+
+    if _ORIGINAL_GENERATE_OPTIMIZER is not None:
+        return
+    optimizer = _optimizer_class()
+    _ORIGINAL_GENERATE_OPTIMIZER = optimizer.generate_optimizer
+    _ORIGINAL_START = Hyperopt.start
+    optimizer.generate_optimizer = _memoized_generate_optimizer
+    Hyperopt.start = _memoized_start
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from freqtrade.main import main as freqtrade_main
+
+    install()
+    freqtrade_main(argv if argv is not None else sys.argv[1:])
+
+
+if __name__ == "__main__":
+    # Go through the importable module, so workers unpickle the wrapper by reference.
+    from ftlib import hyperopt_memo
+
+    hyperopt_memo.main()
@@ -0,0 +1,228 @@
+"""
+Incremental backtests: extend a finished run to a later end date without replaying it.
+
+Every backtest run through ``run_backtest`` leaves a checkpoint of the simulator at its last
+candle, taken right before freqtrade force-exits the trades still open:
+
+- closed and open trades (with their orders), the open-trade count and total profit -
+  the wallet and the protections are derived from these,
+- pair locks,
+- backtesting's counters (trade / order ids, rejected and timed-out signals).
+
+A later run with the same strategy, config and start but a later end resumes from the
+newest checkpoint whose candles are unchanged (content hash up to the checkpoint). Only the
+new candles are simulated; their indicators are computed from ``startup_candle_count``
+candles before the checkpoint, the warmup freqtrade itself relies on. Trades, locks and
+the statistics cover the whole range, like a full run.
+
+Checkpoints are keyed on the start date: a run whose start moves (a rolling "last 30
+days") simulates a different trade path and is not resumed - anchor such reports to a
+fixed start. Strategies keeping their own state between candles (attributes set in
+callbacks) are not captured and should not be resumed.
+
+Checkpoints live next to the result cache (``BACKTEST_CACHE_DIR/checkpoints``), the
+newest ``MAX_CHECKPOINTS`` per strategy / config / start.
+"""
+import hashlib
+import json
+import logging
+import pickle
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ftlib.backtest_cache import DEFAULT_CACHE_DIR, KEY_VERSION, frames_digest, normalized_config, strategy_digest
+
+
+logger = logging.getLogger(__name__)
+
+MAX_CHECKPOINTS = 3
+
+# Backtesting attributes that carry over between candles.
+COUNTERS = (
+    "trade_id_counter", "order_id_counter", "rejected_trades", "timedout_entry_orders",
+    "timedout_exit_orders", "canceled_trade_entries", "canceled_entry_orders", "replaced_entry_orders",
+)
+
+
+@dataclass
+class Checkpoint:
+    start: datetime
+    end: datetime
+    data_digest: str
+    state: bytes
+
+
+def run_prefix(backtesting, timerange) -> str:
+    """
+    Everything a checkpoint must share with the run resuming it, besides the candles.
+    """
+    from freqtrade import __version__
+
+    parts = {
+        "version": KEY_VERSION,
+        "freqtrade": __version__,
+        "strategy": strategy_digest(backtesting.strategylist[0]),
+        "config": normalized_config(backtesting.config),
+        "start": timerange.startts,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def data_until(data: dict[str, pd.DataFrame], end: datetime) -> dict[str, pd.DataFrame]:
+    return {pair: frame.loc[frame["date"] <= end] for pair, frame in data.items()}
+
+
+class CheckpointStore:
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR / "checkpoints"):
+        self.root = Path(root)
+
+    def _directory(self, prefix: str) -> Path:
+        return self.root / prefix[:2] / prefix
+
+    def candidates(self, prefix: str, before: datetime) -> list[Path]:
+        """
+        Checkpoint files of ``prefix`` ending before ``before``, newest first.
+        """
+        files = [path for path in self._directory(prefix).glob("*.pkl") if int(path.stem) < before.timestamp()]
+        return sorted(files, key=lambda path: int(path.stem), reverse=True)
+
+    def load(self, path: Path) -> Optional[Checkpoint]:
+        try:
+            return pickle.loads(path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Unreadable backtest checkpoint {path}: {e}")
+            return None
+
+    def save(self, prefix: str, checkpoint: Checkpoint) -> None:
+        directory = self._directory(prefix)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{int(checkpoint.end.timestamp())}.pkl"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
+        for stale in sorted(directory.glob("*.pkl"), key=lambda path: int(path.stem))[:-MAX_CHECKPOINTS]:
+            stale.unlink(missing_ok=True)
+
+
+def capture(backtesting) -> bytes:
+    from freqtrade.persistence import LocalTrade, PairLocks
+
+    return pickle.dumps({
+        "trades": (LocalTrade.bt_trades, LocalTrade.bt_trades_open, LocalTrade.bt_trades_open_pp,
+                   LocalTrade.bt_open_open_trade_count, LocalTrade.bt_total_profit),
+        "locks": PairLocks.locks,
+        "counters": {name: getattr(backtesting, name) for name in COUNTERS if hasattr(backtesting, name)},
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def restore(backtesting, state: bytes) -> None:
+    from freqtrade.persistence import LocalTrade, PairLocks
+
+    state = pickle.loads(state)
+    (LocalTrade.bt_trades, LocalTrade.bt_trades_open, LocalTrade.bt_trades_open_pp,
+     LocalTrade.bt_open_open_trade_count, LocalTrade.bt_total_profit) = state["trades"]
+    PairLocks.locks = state["locks"]
+    for name, value in state["counters"].items():
+        setattr(backtesting, name, value)
+
+
+class _Hooks:
+    """
+    Instance-level wrappers around ``Backtesting.backtest``'s reset and end-of-run steps:
+    restore a checkpoint after the reset, capture one before open trades are force-exited.
+    """
+
+    def __init__(self, backtesting, state: Optional[bytes] = None):
+        self.backtesting = backtesting
+        self.state = state
+        self.captured: Optional[bytes] = None
+
+    def __enter__(self) -> "_Hooks":
+        backtesting = self.backtesting
+        prepare_backtest, handle_left_open = backtesting.prepare_backtest, backtesting.handle_left_open
+
+        def prepare(*args, **kwargs):
+            prepare_backtest(*args, **kwargs)
+            if self.state is not None:
+                restore(backtesting, self.state)
+
+        def left_open(*args, **kwargs):
+            self.captured = capture(backtesting)
+            return handle_left_open(*args, **kwargs)
+
+        backtesting.prepare_backtest, backtesting.handle_left_open = prepare, left_open
+        return self
+
+    def __exit__(self, *args) -> None:
+        del self.backtesting.prepare_backtest, self.backtesting.handle_left_open
+
+
+def _find_checkpoint(store: CheckpointStore, prefix: str, data: dict[str, pd.DataFrame]) -> Optional[Checkpoint]:
+    last_candle = max(frame["date"].iloc[-1] for frame in data.values() if not frame.empty)
+    for path in store.candidates(prefix, last_candle.to_pydatetime()):
+        checkpoint = store.load(path)
+        if checkpoint is not None and frames_digest(data_until(data, checkpoint.end)) == checkpoint.data_digest:
+            return checkpoint
+    return None
+
+
+def _resume(backtesting, strategy, data: dict[str, pd.DataFrame], timerange, checkpoint: Checkpoint):
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.converter import trim_dataframes
+    from freqtrade.data.history import get_timerange
+    from freqtrade.exchange import timeframe_to_seconds
+
+    backtesting._set_strategy(strategy)
+    warmup = timedelta(seconds=timeframe_to_seconds(backtesting.timeframe) * backtesting.required_startup)
+    tail = {pair: frame.loc[frame["date"] >= checkpoint.end - warmup] for pair, frame in data.items()}
+    preprocessed = strategy.advise_all_indicators(tail)
+
+    # Simulate from the checkpoint's candle on; its warmup rows are trimmed by date.
+    saved = backtesting.timerange, backtesting.required_startup
+    backtesting.timerange = TimeRange("date", timerange.stoptype, int(checkpoint.end.timestamp()), timerange.stopts)
+    backtesting.required_startup = 0
+    try:
+        _, max_date = get_timerange(trim_dataframes(preprocessed, backtesting.timerange, 0))
+        with _Hooks(backtesting, checkpoint.state) as hooks:
+            results = backtesting.backtest(processed=preprocessed, start_date=checkpoint.end, end_date=max_date)
+    finally:
+        backtesting.timerange, backtesting.required_startup = saved
+    return results, max_date, hooks.captured
+
+
+def run_backtest(backtesting, data: dict[str, pd.DataFrame], timerange,
+                 store: Optional[CheckpointStore] = None) -> tuple[datetime, datetime, Optional[datetime]]:
+    """
+    ``backtest_one_strategy`` for ``backtesting``'s single strategy, resumed from a
+    checkpoint when one matches. Returns (min_date, max_date, checkpoint end resumed from).
+    """
+    store = store or CheckpointStore()
+    strategy = backtesting.strategylist[0]
+    prefix = run_prefix(backtesting, timerange)
+    checkpoint = _find_checkpoint(store, prefix, data)
+
+    if checkpoint is None:
+        with _Hooks(backtesting) as hooks:
+            min_date, max_date = backtesting.backtest_one_strategy(strategy, data, timerange)
+        captured, resumed_from = hooks.captured, None
+    else:
+        logger.info(f"Resuming {strategy.get_strategy_name()} from its checkpoint at {checkpoint.end}.")
+        backtest_start_time = datetime.now(timezone.utc)
+        results, max_date, captured = _resume(backtesting, strategy, data, timerange, checkpoint)
+        results.update({
+            "run_id": backtesting.run_ids.get(strategy.get_strategy_name(), ""),
+            "backtest_start_time": int(backtest_start_time.timestamp()),
+            "backtest_end_time": int(time.time()),
+        })
+        backtesting.all_results[strategy.get_strategy_name()] = results
+        min_date, resumed_from = checkpoint.start, checkpoint.end
+
+    if captured is not None:
+        store.save(prefix, Checkpoint(min_date, max_date, frames_digest(data_until(data, max_date)), captured))
+    return min_date, max_date, resumed_from
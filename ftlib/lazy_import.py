@@ -0,0 +1,98 @@
+"""
+Deferred imports for strategy modules.
+
+Every start / pm2 restart of a bot imports the strategy module, and with it every
+library the module imports at top level - pandas_ta, sklearn, technical, ta, ...
+whether the strategy ends up calling them or not. ``lazy_import`` returns a proxy that
+imports the library on first attribute access instead:
+
+    from ftlib.lazy_import import lazy_attr, lazy_import
+
+    pta = lazy_import("pandas_ta")                        # import pandas_ta as pta
+    preprocessing = lazy_import("sklearn.preprocessing")  # from sklearn import preprocessing
+    zema = lazy_attr("technical.indicators", "zema")      # from technical.indicators import zema
+
+Libraries that register pandas accessors on import (``pandas_ta`` adds ``df.ta``) only
+do so once the proxy is touched - use the module functions (``pta.cti(...)``), not the accessor.
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """
+    Module proxy that imports ``name`` on first attribute access.
+    Resolved attributes are cached on the proxy, so later lookups cost a plain getattr.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        value = getattr(self._lazy_load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+class LazyAttribute:
+    """
+    Stand-in for ``from module import name``: imports ``module`` on first call.
+    """
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module}.{self._name}>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    ``import name`` deferred until the returned module is first used.
+    Returns the real module if it has already been imported by someone else.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def lazy_attr(module: str, name: str) -> LazyAttribute:
+    """
+    ``from module import name`` deferred until ``name`` is first called.
+    """
+    return LazyAttribute(module, name)
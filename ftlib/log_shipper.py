@@ -0,0 +1,632 @@
+"""
+Batched, rate-limited shipping of freqtrade instance logs into the API's ``botlogs``.
+
+Every instance writes ``freqtrade_<instanceId>.log`` (``logfile`` in the generated config,
+relative to the backend root the bots are started from) and its stdout - ``print``s from
+strategies such as MultiMa - to ``pm2_out.log`` in its instance directory
+``data/ft_user_data/<instanceId>/`` (``startFreqtradeProcess``) or in ``logs/`` below it
+(``pm2Controller``). The shipper tails all of them from one process:
+
+- directories are watched with inotify (stat polling where inotify is unavailable), so
+  idle instances cost nothing and a file is only read after it was written;
+- lines are parsed in freqtrade's format (``asctime - name - levelname - message``, in
+  the local time of the host the bots and the shipper run on), continuation lines (tracebacks) are kept with their record, records below
+  ``--min-level`` are dropped (the bots run with ``-vv``);
+- repeats of a message within ``--window`` seconds - the same text with the numbers
+  masked, per instance, logger and level - are coalesced: the first is shipped right away,
+  the rest as one record with ``count`` when the window closes. A warning logged by
+  ``custom_stoploss`` on every pair and candle becomes a handful of documents per window;
+- records are written in ``insert_many`` batches at most ``--rate`` documents per second.
+  When the sink is slow or down, about ``--max-pending`` records are held and the files
+  are simply not read further (backpressure - the log files are the buffer). Offsets are
+  persisted once everything read has been shipped (repeat counts of windows still open
+  are lost on a crash).
+
+Rotation (freqtrade rolls the log over at 10 MB) and truncation are detected by inode and
+size. Run it at a lower CPU priority than the bots (``--nice``, default 10).
+
+Usage:
+    python -m ftlib.log_shipper --mongo-uri "$MONGO_URI"
+    python -m ftlib.log_shipper --jsonl exports/botlogs.jsonl --once
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import re
+import select
+import struct
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ftlib.strategy_loader import ROOT
+from ftlib.trade_exporter import USER_DATA_BASE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = USER_DATA_BASE_DIR / ".log_shipper_state.json"
+
+LOG_NAME_RE = re.compile(r"^freqtrade_(?P<instance>[0-9a-fA-F]{24})\.log$")
+
+RECORD_RE = re.compile(
+    r"^(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(?P<ms>\d{3}) - (?P<name>\S+) - "
+    r"(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - (?P<message>.*)$"
+)
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# Numbers, hex ids and floats in a message do not make it a different message.
+_NUMBER_RE = re.compile(r"0x[0-9a-fA-F]+|[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+MAX_MESSAGE_LENGTH = 4000
+
+# Files are read in chunks of this size; the pending queue may overshoot by one chunk.
+READ_CHUNK = 64 * 1024
+
+# Seconds between re-listing the instance directories (new instances, new log files).
+DISCOVERY_TTL = 30.0
+
+STDOUT_LOG = "pm2_out.log"
+
+
+def stdout_dirs(instance_dir: Path) -> tuple[Path, Path]:
+    """
+    Where pm2 writes an instance's stdout: the instance directory or its ``logs``.
+    """
+    return instance_dir, instance_dir / "logs"
+
+
+@dataclass
+class LogRecord:
+    instance_id: str
+    timestamp: datetime
+    level: str
+    source: str
+    message: str
+    count: int = 1
+    last_timestamp: Optional[datetime] = None
+
+    def template(self) -> str:
+        return _NUMBER_RE.sub("#", self.message.split("\n", 1)[0])
+
+    def to_document(self) -> dict[str, Any]:
+        return {
+            "botInstanceId": self.instance_id,
+            "type": "error" if LEVELS[self.level] >= LEVELS["ERROR"] else "log",
+            "level": self.level,
+            "source": self.source,
+            "message": self.message[:MAX_MESSAGE_LENGTH],
+            "timestamp": self.timestamp,
+            "count": self.count,
+            "lastTimestamp": self.last_timestamp or self.timestamp,
+        }
+
+
+class LogParser:
+    """
+    Turns lines of one file into records; lines without a header belong to the previous
+    record (tracebacks) or, in stdout files, are records of their own.
+    """
+
+    def __init__(self, instance_id: str, stdout: bool = False):
+        self.instance_id = instance_id
+        self.stdout = stdout
+        self._current: Optional[LogRecord] = None
+
+    def feed(self, lines: Iterable[str], now: datetime) -> list[LogRecord]:
+        records = []
+        for line in lines:
+            match = RECORD_RE.match(line)
+            if match:
+                if self._current is not None:
+                    records.append(self._current)
+                # asctime is local time.
+                moment = datetime.strptime(match["time"], "%Y-%m-%d %H:%M:%S").replace(
+                    microsecond=int(match["ms"]) * 1000).astimezone(timezone.utc)
+                self._current = LogRecord(self.instance_id, moment, match["level"], match["name"], match["message"])
+            elif self.stdout:
+                if line.strip():
+                    records.append(LogRecord(self.instance_id, now, "INFO", "stdout", line.strip()))
+            elif self._current is not None:
+                if len(self._current.message) < MAX_MESSAGE_LENGTH:
+                    self._current.message += "\n" + line
+        return records
+
+    def flush(self) -> list[LogRecord]:
+        """
+        The record still collecting continuation lines, once its file went quiet.
+        """
+        record, self._current = self._current, None
+        return [record] if record is not None else []
+
+
+@dataclass
+class TailedFile:
+    path: Path
+    instance_id: str
+    stdout: bool
+    inode: Optional[int] = None
+    offset: int = 0
+    partial: bytes = b""
+    parser: LogParser = field(init=False)
+
+    def __post_init__(self):
+        self.parser = LogParser(self.instance_id, self.stdout)
+
+    def read_lines(self, max_bytes: int) -> list[str]:
+        """
+        Complete lines written since the last read (at most ``max_bytes``); a rotated or
+        truncated file is read again from the start.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+        data = b""
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            data = self._rotated_tail()
+            self.inode, self.offset = stat.st_ino, 0
+        if stat.st_size > self.offset:
+            with self.path.open("rb") as handle:
+                handle.seek(self.offset)
+                data += handle.read(max_bytes)
+                self.offset = handle.tell()
+        if not data:
+            return []
+        data = self.partial + data
+        # print(..., end="\r") progress output uses bare carriage returns.
+        lines = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n").split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", "replace") for line in lines]
+
+    def _rotated_tail(self) -> bytes:
+        """
+        What was appended to the file before ``RotatingFileHandler`` renamed it to ``.1``.
+        """
+        rotated = self.path.with_name(self.path.name + ".1")
+        try:
+            if self.inode is not None and rotated.stat().st_ino == self.inode:
+                with rotated.open("rb") as handle:
+                    handle.seek(self.offset)
+                    return handle.read()
+        except FileNotFoundError:
+            pass
+        self.partial = b""
+        return b""
+
+    @property
+    def pending_bytes(self) -> bool:
+        try:
+            return self.path.stat().st_size > self.offset
+        except FileNotFoundError:
+            return False
+
+
+def discover_logs(log_dir: Path = ROOT, base_dir: Path = USER_DATA_BASE_DIR) -> dict[Path, tuple[str, bool]]:
+    """
+    ``{log path: (instance id, is stdout)}`` for the freqtrade logfiles in ``log_dir`` and
+    the pm2 stdout files of the instance directories (see ``stdout_dirs``).
+    """
+    found: dict[Path, tuple[str, bool]] = {}
+    for directory in (Path(log_dir), Path(base_dir)):
+        if not directory.is_dir():
+            continue
+        for entry in directory.iterdir():
+            match = LOG_NAME_RE.match(entry.name)
+            if match and entry.is_file():
+                found[entry] = (match["instance"], False)
+    if Path(base_dir).is_dir():
+        for instance_dir in Path(base_dir).iterdir():
+            if not instance_dir.is_dir():
+                continue
+            for directory in stdout_dirs(instance_dir):
+                if not directory.is_dir():
+                    continue
+                for entry in directory.iterdir():
+                    match = LOG_NAME_RE.match(entry.name)
+                    if match and entry.is_file():
+                        found[entry] = (match["instance"], False)
+                    elif entry.name == STDOUT_LOG:
+                        found[entry] = (instance_dir.name, True)
+    return found
+
+
+class Coalescer:
+    """
+    Passes the first record of a (instance, source, level, template) key through and
+    counts its repeats until ``window`` seconds after that first record.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._open: dict[tuple, tuple[float, LogRecord]] = {}
+        self.suppressed = 0
+
+    def add(self, record: LogRecord, now: float) -> Optional[LogRecord]:
+        key = (record.instance_id, record.source, record.level, record.template())
+        entry = self._open.get(key)
+        if entry is None:
+            self._open[key] = (now, LogRecord(record.instance_id, record.timestamp, record.level,
+                                              record.source, record.message, count=0))
+            return record
+        repeats = entry[1]
+        if repeats.count == 0:
+            repeats.timestamp, repeats.message = record.timestamp, record.message
+        repeats.count += 1
+        repeats.last_timestamp = record.timestamp
+        self.suppressed += 1
+        return None
+
+    def expire(self, now: float, everything: bool = False) -> list[LogRecord]:
+        """
+        Repeat summaries of the windows that closed (or of all windows).
+        """
+        closed = [key for key, (opened, _) in self._open.items() if everything or now - opened >= self.window]
+        summaries = []
+        for key in closed:
+            _, repeats = self._open.pop(key)
+            if repeats.count:
+                summaries.append(repeats)
+        return summaries
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+
+class RateLimiter:
+    """
+    Token bucket: ``rate`` documents per second, bursts up to one second's worth.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def available(self) -> int:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self, count: int) -> None:
+        self.tokens -= count
+
+    def wait_time(self, count: int) -> float:
+        return max(0.0, (count - self.tokens) / self.rate)
+
+
+class _Inotify:
+    """
+    Minimal inotify binding (Linux): directory watches reporting which files changed.
+    """
+
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x2, 0x8, 0x80, 0x100
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+
+    def watch(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        wd = self._add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+            self._watched.add(directory)
+
+    def changed(self, timeout: float) -> set[Path]:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        paths = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return paths
+        position = 0
+        while position < len(data):
+            wd, _, _, length = self._EVENT.unpack_from(data, position)
+            position += self._EVENT.size
+            name = data[position:position + length].rstrip(b"\0")
+            position += length
+            if wd in self._watches:
+                paths.add(self._watches[wd] / os.fsdecode(name) if name else self._watches[wd])
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _StatPoller:
+    """
+    Fallback without inotify: every watched file may have changed after each timeout.
+    """
+
+    def __init__(self):
+        self._watched: set[Path] = set()
+
+    def watch(self, directory: Path) -> None:
+        self._watched.add(directory)
+
+    def changed(self, timeout: float) -> Optional[set[Path]]:
+        time.sleep(timeout)
+        return None  # unknown: check every file
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlLogSink:
+    """
+    Local stand-in for the ``botlogs`` collection: one JSON document per line.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, documents: list[dict[str, Any]]) -> None:
+        with self.path.open("a") as handle:
+            handle.write("".join(json.dumps(doc, default=str) + "\n" for doc in documents))
+
+    def close(self) -> None:
+        pass
+
+
+class MongoLogSink:
+    """
+    Inserts into the API's ``botlogs`` collection (``models/BotLog.js``).
+    """
+
+    def __init__(self, uri: str, database: Optional[str] = None, collection: str = "botlogs"):
+        try:
+            import pymongo
+        except ImportError as e:
+            raise RuntimeError("pymongo is required for --mongo-uri (pip install pymongo)") from e
+        from bson import ObjectId
+
+        self._object_id = ObjectId
+        self.client = pymongo.MongoClient(uri)
+        db = self.client[database] if database else self.client.get_default_database()
+        self.collection = db[collection]
+
+    def write(self, documents: list[dict[str, Any]]) -> None:
+        self.collection.insert_many(
+            [{**doc, "botInstanceId": self._object_id(doc["botInstanceId"])} for doc in documents],
+            ordered=False,
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class LogShipper:
+
+    def __init__(self, sink, state_path: Path = DEFAULT_STATE_PATH, log_dir: Path = ROOT,
+                 base_dir: Path = USER_DATA_BASE_DIR, min_level: str = "INFO", window: float = 60.0,
+                 rate: float = 500.0, batch_size: int = 500, max_pending: int = 10_000,
+                 flush_interval: float = 2.0):
+        self.sink = sink
+        self.state_path = Path(state_path)
+        self.log_dir = Path(log_dir)
+        self.base_dir = Path(base_dir)
+        self.min_level = LEVELS[min_level]
+        self.coalescer = Coalescer(window)
+        self.limiter = RateLimiter(rate)
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.pending: deque[LogRecord] = deque()
+        self.files: dict[Path, TailedFile] = {}
+        self.shipped = 0
+        self.dropped = 0
+        self._retry_at = 0.0
+        self._failures = 0
+        self._listed_at = 0.0
+        self._state_dirty = False
+        try:
+            self.watcher = _Inotify()
+        except (OSError, AttributeError):
+            self.watcher = _StatPoller()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return
+        for path, (instance_id, stdout, inode, offset) in state.items():
+            self.files[Path(path)] = TailedFile(Path(path), instance_id, stdout, inode, offset)
+
+    def _save_state(self) -> None:
+        state = {str(path): [tailed.instance_id, tailed.stdout, tailed.inode, tailed.offset - len(tailed.partial)]
+                 for path, tailed in self.files.items()}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_path)
+        self._state_dirty = False
+
+    def discover(self) -> None:
+        self.watcher.watch(self.log_dir)
+        self.watcher.watch(self.base_dir)
+        if self.base_dir.is_dir():
+            for instance_dir in self.base_dir.iterdir():
+                if instance_dir.is_dir():
+                    for directory in stdout_dirs(instance_dir):
+                        if directory.is_dir():
+                            self.watcher.watch(directory)
+        for path, (instance_id, stdout) in discover_logs(self.log_dir, self.base_dir).items():
+            self.watcher.watch(path.parent)
+            if path not in self.files:
+                # New files are read from the start; files known from the state resume.
+                self.files[path] = TailedFile(path, instance_id, stdout)
+        self._listed_at = time.monotonic()
+
+    def read(self, paths: Optional[set[Path]]) -> int:
+        """
+        Read the changed files while there is room in the pending queue; returns the
+        number of records queued.
+        """
+        queued = 0
+        now, clock = datetime.now(timezone.utc), time.monotonic()
+        candidates = self.files.values() if paths is None else [self.files[p] for p in paths if p in self.files]
+        for tailed in candidates:
+            while len(self.pending) < self.max_pending:
+                lines = tailed.read_lines(READ_CHUNK)
+                if not lines:
+                    break
+                self._state_dirty = True
+                for record in tailed.parser.feed(lines, now):
+                    queued += self._queue(record, clock)
+            if len(self.pending) >= self.max_pending:
+                break
+            for record in tailed.parser.flush():
+                queued += self._queue(record, clock)
+        return queued
+
+    def _queue(self, record: LogRecord, clock: float) -> int:
+        if LEVELS[record.level] < self.min_level:
+            self.dropped += 1
+            return 0
+        passed = self.coalescer.add(record, clock)
+        if passed is None:
+            return 0
+        self.pending.append(passed)
+        return 1
+
+    def ship(self, wait: bool = False, final: bool = False) -> int:
+        """
+        Write pending records in batches within the rate limit (``wait``: sleep for the
+        limit instead of leaving records queued; ``final``: close all repeat windows too).
+        A failing sink is retried with exponential backoff; the records stay queued.
+        """
+        self.pending.extend(self.coalescer.expire(time.monotonic(), everything=final))
+        if time.monotonic() < self._retry_at:
+            return 0
+        written = 0
+        while self.pending:
+            size = min(self.batch_size, len(self.pending), self.limiter.available())
+            if size <= 0:
+                if not wait:
+                    break
+                time.sleep(self.limiter.wait_time(min(self.batch_size, len(self.pending))))
+                continue
+            batch = [self.pending[index].to_document() for index in range(size)]
+            try:
+                self.sink.write(batch)
+            except Exception as e:
+                self._failures += 1
+                delay = min(60.0, 2.0 ** self._failures)
+                self._retry_at = time.monotonic() + delay
+                logger.warning(f"Could not ship {len(batch)} log records ({len(self.pending)} pending), "
+                               f"retrying in {delay:.0f}s: {e}")
+                if final:
+                    raise
+                break
+            self._failures = 0
+            self.limiter.take(size)
+            for _ in range(size):
+                self.pending.popleft()
+            written += size
+        self.shipped += written
+        if not self.pending and self._state_dirty:
+            self._save_state()
+        return written
+
+    def _is_new_log(self, path: Path) -> bool:
+        if path in self.files:
+            return False
+        return path.parent == self.base_dir or bool(LOG_NAME_RE.match(path.name)) or path.name == STDOUT_LOG
+
+    @property
+    def backlogged(self) -> bool:
+        return len(self.pending) >= self.max_pending or any(tailed.pending_bytes for tailed in self.files.values())
+
+    def run_once(self) -> int:
+        """
+        Read everything written so far and ship it, including open repeat windows.
+        """
+        self.discover()
+        while self.read(None) or self.backlogged:
+            self.ship(wait=True)
+        self.ship(wait=True, final=True)
+        return self.shipped
+
+    def run(self) -> None:
+        self.discover()
+        self.read(None)
+        while True:
+            if time.monotonic() - self._listed_at > DISCOVERY_TTL:
+                self.discover()
+            # Only wait for new writes once the files were read up to their end.
+            changed = None if self.backlogged else self.watcher.changed(self.flush_interval)
+            if changed and any(self._is_new_log(path) for path in changed):
+                self.discover()
+            self.read(changed)
+            self.ship()
+            if self.pending and len(self.pending) >= self.max_pending:
+                time.sleep(min(self.flush_interval, max(0.05, self._retry_at - time.monotonic(),
+                                                        self.limiter.wait_time(self.batch_size))))
+
+    def close(self) -> None:
+        self.watcher.close()
+        self.sink.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ship freqtrade instance logs in coalesced, rate-limited batches.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--jsonl", type=Path, help="Append log documents to this JSONL file.")
+    target.add_argument("--mongo-uri", help="Insert into the botlogs collection of this MongoDB.")
+    parser.add_argument("--database", help="Mongo database (default: the one in the URI).")
+    parser.add_argument("--log-dir", type=Path, default=ROOT, help="Directory of the freqtrade_<id>.log files.")
+    parser.add_argument("--base-dir", type=Path, default=USER_DATA_BASE_DIR)
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_PATH)
+    parser.add_argument("--min-level", default="INFO", choices=list(LEVELS))
+    parser.add_argument("--window", type=float, default=60.0, help="Seconds repeats are coalesced for.")
+    parser.add_argument("--rate", type=float, default=500.0, help="Documents per second at most.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-pending", type=int, default=10_000, help="Records held before reading pauses.")
+    parser.add_argument("--nice", type=int, default=10, help="CPU niceness increment for the shipper.")
+    parser.add_argument("--once", action="store_true", help="Ship what is there and exit.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if args.nice:
+        os.nice(args.nice)
+
+    sink = JsonlLogSink(args.jsonl) if args.jsonl else MongoLogSink(args.mongo_uri, args.database)
+    shipper = LogShipper(sink, args.state, args.log_dir, args.base_dir, args.min_level, args.window,
+                         args.rate, args.batch_size, args.max_pending)
+    try:
+        if args.once:
+            shipper.run_once()
+            print(json.dumps({"shipped": shipper.shipped, "coalesced": shipper.coalescer.suppressed,
+                              "below_level": shipper.dropped}))
+        else:
+            shipper.run()
+    except KeyboardInterrupt:
+        shipper.ship(wait=True, final=True)
+    finally:
+        shipper.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Parallel lookahead-bias check.
+
+A strategy without lookahead bias computes the same indicators and signals for a candle
+whether or not later candles exist. This re-runs ``populate_*`` on truncated prefixes
+of the candle history and compares the last row of every prefix with the same row of
+the full run; columns that differ read the future (whole-series ``min()`` / ``max()``
+normalization, ``MinMaxScaler`` fitted on the full frame, ``shift(-n)``, ...).
+
+Instead of replaying every prefix one after another, a sample of prefix lengths is
+spread evenly over the history and split across a process pool; the comparison of all
+sampled rows is one vectorized ``isclose`` per column.
+
+Usage:
+    python -m ftlib.lookahead_check                       # the lookahead_bias/ strategies
+    python -m ftlib.lookahead_check user_data/strategies/Bandtastic.py --samples 64
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from ftlib.strategy_bench import PHASES, load_candles, synthetic_candles
+from ftlib.strategy_loader import DATA_DIR, ROOT, iter_strategy_files, load_module, load_strategy, strategy_classes
+
+
+LOOKAHEAD_DIR = ROOT / "user_data" / "strategies" / "lookahead_bias"
+
+SIGNAL_COLUMNS = ("enter_long", "exit_long", "enter_short", "exit_short", "buy", "sell")
+
+# Relative / absolute tolerance: float noise from recomputing on a shorter frame is not bias.
+RTOL = 1e-6
+ATOL = 1e-9
+
+
+# Fewer post-startup prefixes than this is not a check: a strategy whose startup period
+# covers (almost) the whole history would pass trivially.
+MIN_PREFIXES = 8
+
+# Per-worker state, set once by _init_worker so tasks only carry prefix lengths.
+_worker: dict[str, Any] = {}
+
+
+def analyze(strategy, frame: DataFrame, pair: str) -> DataFrame:
+    dataframe = frame.copy()
+    metadata = {"pair": pair}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for phase in PHASES:
+            dataframe = getattr(strategy, phase)(dataframe, metadata)
+    return dataframe
+
+
+def _init_worker(path: str, class_name: str, pair: str, frame: DataFrame, columns: list[str]) -> None:
+    _worker.update(strategy=load_strategy(path, class_name, pair), pair=pair, frame=frame, columns=columns)
+
+
+def _last_rows(ends: list[int]) -> np.ndarray:
+    """
+    Last row of every prefix ``frame[:end]``, restricted to the checked columns.
+    """
+    frame, columns = _worker["frame"], _worker["columns"]
+    rows = np.full((len(ends), len(columns)), np.nan)
+    for i, end in enumerate(ends):
+        result = analyze(_worker["strategy"], frame.iloc[:end], _worker["pair"])
+        last = result.iloc[-1]
+        rows[i] = [last.get(column, np.nan) for column in columns]
+    return rows
+
+
+def sample_prefixes(candles: int, startup: int, samples: int) -> np.ndarray:
+    """
+    Up to ``samples`` distinct prefix lengths spread evenly between the end of the
+    startup period and the full history (exclusive - the full run is the reference).
+    Empty when the startup period leaves no candle to check.
+    """
+    first = max(startup + 1, 2)
+    if first > candles - 1:
+        return np.array([], dtype=int)
+    return np.unique(np.linspace(first, candles - 1, samples).astype(int))
+
+
+def numeric_columns(frame: DataFrame, exclude: tuple = ("open", "high", "low", "close", "volume")) -> list[str]:
+    return [
+        column for column in frame.columns
+        if column not in exclude and (pd.api.types.is_numeric_dtype(frame[column])
+                                      or pd.api.types.is_bool_dtype(frame[column]))
+    ]
+
+
+def check_strategy(
+    path: Path, class_name: str, frame: DataFrame, pair: str, samples: int = 32, workers: Optional[int] = None,
+    min_prefixes: int = MIN_PREFIXES,
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    strategy = load_strategy(path, class_name, pair)
+    startup = int(getattr(strategy, "startup_candle_count", 0) or 0)
+    ends = sample_prefixes(len(frame), startup, samples)
+    if len(ends) < min(min_prefixes, samples):
+        return {"strategy": class_name, "file": str(path),
+                "error": f"insufficient data - {len(frame)} candles with a startup of {startup} leave "
+                         f"{len(ends)} prefixes to check (need {min(min_prefixes, samples)})"}
+    full = analyze(strategy, frame, pair)
+    columns = numeric_columns(full)
+
+    workers = max(1, min(workers or os.cpu_count(), len(ends)))
+    chunks = [chunk.tolist() for chunk in np.array_split(ends, workers)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(str(path), class_name, pair, frame, columns)
+    ) as pool:
+        prefix_rows = np.vstack(list(pool.map(_last_rows, chunks)))
+
+    reference = full[columns].iloc[ends - 1].to_numpy(dtype=float, na_value=np.nan)
+    differs = ~np.isclose(prefix_rows, reference, rtol=RTOL, atol=ATOL, equal_nan=True)
+    dates = full["date"].iloc[ends - 1].to_numpy()
+
+    biased = []
+    for j in np.flatnonzero(differs.any(axis=0)):
+        rows = np.flatnonzero(differs[:, j])
+        biased.append({
+            "column": columns[j],
+            "signal": columns[j] in SIGNAL_COLUMNS,
+            "mismatches": int(len(rows)),
+            "first_date": str(pd.Timestamp(dates[rows[0]])),
+            "max_abs_diff": float(np.nanmax(np.abs(prefix_rows[rows, j] - reference[rows, j]), initial=0)),
+        })
+    biased.sort(key=lambda entry: (not entry["signal"], -entry["mismatches"]))
+    return {
+        "strategy": class_name,
+        "file": str(path),
+        "candles": len(frame),
+        "samples": len(ends),
+        "columns_checked": len(columns),
+        "biased": biased,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def print_report(results: list[dict[str, Any]]) -> None:
+    for result in results:
+        if "error" in result:
+            print(f"{result['strategy']}: error - {result['error']}")
+            continue
+        verdict = "LOOKAHEAD BIAS" if result["biased"] else "no bias found"
+        print(f"{result['strategy']}: {verdict} ({result['samples']} prefixes of {result['candles']} candles, "
+              f"{result['columns_checked']} columns, {result['seconds']:.1f}s)")
+        for entry in result["biased"]:
+            kind = "signal" if entry["signal"] else "column"
+            print(f"    {kind} {entry['column']:<32} {entry['mismatches']:>4}/{result['samples']} prefixes differ, "
+                  f"first at {entry['first_date']}, max |diff| {entry['max_abs_diff']:.4g}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Detect lookahead bias by replaying sampled prefixes.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories "
+                        "(default: user_data/strategies/lookahead_bias).")
+    parser.add_argument("--pair", default="BTC/USDT")
+    parser.add_argument("--datadir", type=Path, default=DATA_DIR)
+    parser.add_argument("--candles", type=int, default=2000,
+                        help="Only the most recent N candles (0 = full history).")
+    parser.add_argument("--synthetic", action="store_true", help="Use a synthetic series instead of bundled data.")
+    parser.add_argument("--samples", type=int, default=32, help="Prefix lengths to replay per strategy.")
+    parser.add_argument("--min-prefixes", type=int, default=MIN_PREFIXES,
+                        help="Report insufficient data below this many post-startup prefixes.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = []
+    for path in iter_strategy_files(args.paths or [LOOKAHEAD_DIR]):
+        try:
+            classes = strategy_classes(load_module(path))
+        except Exception as e:
+            results.append({"strategy": path.stem, "file": str(path), "error": f"import: {e!r}"})
+            continue
+        for strategy_cls in classes:
+            timeframe = getattr(strategy_cls, "timeframe", "5m")
+            if args.synthetic:
+                frame = synthetic_candles(args.candles or 2000, timeframe)
+            else:
+                frame = load_candles(args.pair, timeframe, args.datadir)
+            if frame is None:
+                results.append({"strategy": strategy_cls.__name__, "file": str(path),
+                                "error": f"no {timeframe} data for {args.pair} in {args.datadir}"})
+                continue
+            if args.candles:
+                frame = frame.iloc[-args.candles:].reset_index(drop=True)
+            try:
+                results.append(check_strategy(path, strategy_cls.__name__, frame, args.pair,
+                                              args.samples, args.workers, args.min_prefixes))
+            except Exception as e:
+                results.append({"strategy": strategy_cls.__name__, "file": str(path), "error": repr(e)})
+            print(f"{strategy_cls.__name__} done", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+    return 1 if any(result.get("biased") or "error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
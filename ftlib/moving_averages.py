@@ -0,0 +1,121 @@
+"""
+Moving averages for many spans at once.
+
+All spans of one series come back as a single ``(spans, T)`` float32 matrix:
+
+- SMA: one cumulative sum, every span is a difference of two shifted views of it.
+- EMA: one Python loop over time on a time-major ``(T, spans)`` array; every step
+  updates all spans with one vectorized multiply-add on a contiguous row.
+- TEMA: ``3 * e1 - 3 * e2 + e3`` from three chained EMA passes.
+
+Results match TA-Lib (EMA seeded with the SMA of its first ``span`` values, leading NaNs
+skipped) to float32 precision, but the EMA loop is interpreted: on 36k candles it takes
+0.10 s for 4 spans and 0.30 s for 365, against 0.09 s for 365 ``talib.EMA`` calls, and it
+holds several float64 ``(T, spans)`` arrays at once. Strategies therefore keep one TA-Lib
+call per span. Only ``sma_matrix`` beats TA-Lib, and only from a few hundred spans.
+"""
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _spans(spans: Iterable[int]) -> np.ndarray:
+    spans = np.asarray(list(spans), dtype=np.int64)
+    if spans.ndim != 1 or (spans < 1).any():
+        raise ValueError("spans must be a flat sequence of positive integers")
+    return spans
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """
+    Index of the first non-NaN value per row (row length if there is none).
+    """
+    finite = ~np.isnan(x)
+    return np.where(finite.any(axis=-1), finite.argmax(axis=-1), x.shape[-1])
+
+
+def sma_matrix(values, spans: Sequence[int], dtype=np.float32) -> np.ndarray:
+    """
+    Simple moving average of ``values`` for every span, shape ``(len(spans), T)``.
+    """
+    x = _as_array(values)
+    spans = _spans(spans)
+    out = np.full((len(spans), len(x)), np.nan, dtype=dtype)
+    start = int(_first_valid(x))
+    csum = np.concatenate(([0.0], np.cumsum(x[start:])))
+    for row, span in enumerate(spans):
+        if len(csum) > span:
+            out[row, start + span - 1:] = (csum[span:] - csum[:-span]) / span
+    return out
+
+
+def ema_columns(x: np.ndarray, spans: np.ndarray, alpha: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    EMA of every column of the time-major ``(T, spans)`` array ``x`` (float64), TA-Lib
+    compatible: seeded with the SMA of the first ``span`` non-NaN values of its column.
+    ``alpha`` defaults to ``2 / (span + 1)``; Wilder smoothing (RSI, ATR) uses ``1 / span``.
+    """
+    length = x.shape[0]
+    if alpha is None:
+        alpha = 2.0 / (spans + 1.0)
+    decay = 1.0 - alpha
+    first = _first_valid(x.T)
+    seed_at = first + spans - 1
+
+    # y[t] = decay * y[t-1] + z[t]: z is alpha * x after the seed, the seed itself at
+    # the seed index and zero before it, so all columns share one loop over time.
+    out = np.multiply(x, alpha)
+    for col in range(len(spans)):
+        if seed_at[col] < length:
+            out[:seed_at[col], col] = 0.0
+            out[seed_at[col], col] = x[first[col]:seed_at[col] + 1, col].mean()
+    step = np.empty(len(spans))
+    for t in range(max(int(seed_at.min()), 0) + 1, length):
+        np.multiply(out[t - 1], decay, out=step)
+        out[t] += step
+    for col in range(len(spans)):
+        out[:min(seed_at[col], length), col] = np.nan
+    return out
+
+
+def _time_major(values, spans: np.ndarray) -> np.ndarray:
+    x = _as_array(values)
+    return np.broadcast_to(x[:, None], (len(x), len(spans)))
+
+
+def ema_matrix(values, spans: Sequence[int], dtype=np.float32) -> np.ndarray:
+    """
+    Exponential moving average of ``values`` for every span, shape ``(len(spans), T)``.
+    """
+    spans = _spans(spans)
+    ema = ema_columns(_time_major(values, spans), spans)
+    return np.ascontiguousarray(ema.T, dtype=dtype)
+
+
+def tema_matrix(values, spans: Sequence[int], dtype=np.float32) -> np.ndarray:
+    """
+    Triple exponential moving average of ``values`` for every span, shape ``(len(spans), T)``.
+    """
+    spans = _spans(spans)
+    e1 = ema_columns(_time_major(values, spans), spans)
+    e2 = ema_columns(e1, spans)
+    tema = ema_columns(e2, spans)
+    tema += 3.0 * (e1 - e2)
+    return np.ascontiguousarray(tema.T, dtype=dtype)
+
+
+def append_columns(dataframe: DataFrame, matrix: np.ndarray, names: Sequence) -> DataFrame:
+    """
+    Add every row of ``matrix`` as a column of ``dataframe`` in a single concat
+    (one insert per span fragments the frame). Existing columns of the same name are replaced.
+    """
+    columns = pd.DataFrame(matrix.T, index=dataframe.index, columns=list(names))
+    return pd.concat([dataframe.drop(columns=columns.columns, errors="ignore"), columns], axis=1)
@@ -0,0 +1,367 @@
+"""
+Incrementally maintained PnL rollups for the chart and stats endpoints.
+
+``chartController.getPerformanceChartData`` and ``statsController.getTradingStats`` group
+every trade of an instance / user on each request. This job keeps hourly, daily and monthly
+buckets per instance and per user instead (profit, gross profit, fees, trades, wins,
+losses) and updates only the buckets touched by trades that changed since its watermark:
+
+- every closed trade contributes once, to the bucket of its ``createdAt`` (the same date
+  the endpoints group by);
+- a ledger remembers each trade's contribution, so a trade that changes again (fee
+  applied later, reopened) is subtracted from its old buckets before the new values are
+  added; deleted trades are not seen and need a ``--rebuild``;
+- bucket updates are ``$inc`` upserts in one unordered ``bulk_write`` per batch, inside a
+  transaction when the deployment supports one.
+
+The endpoints read at most a few hundred small documents from ``pnlrollups``
+(``models/PnlRollup.js``) and fall back to aggregating raw trades while the job's
+heartbeat (``pnl_rollup_state``) is older than a few minutes.
+
+Usage:
+    python -m ftlib.pnl_rollups --mongo-uri "$MONGO_URI"            # follow changes
+    python -m ftlib.pnl_rollups --mongo-uri "$MONGO_URI" --rebuild  # recompute all buckets
+    python -m ftlib.pnl_rollups --jsonl exports/trades.jsonl --out rollups/   # local stand-in
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hourly", "daily", "monthly")
+
+SCOPES = ("instance", "user")
+
+METRICS = ("profit", "grossProfit", "fees", "trades", "wins", "losses")
+
+ROLLUP_COLLECTION = "pnlrollups"
+LEDGER_COLLECTION = "pnl_rollup_ledger"
+STATE_COLLECTION = "pnl_rollup_state"
+
+BATCH_SIZE = 1000
+
+# Trades updated within the last few seconds are left for the next pass, so a write that
+# commits after a later ``updatedAt`` was read cannot slip behind the watermark.
+SETTLE_SECONDS = 5.0
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    if granularity == "hourly":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "daily":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """
+    What one closed trade adds to its buckets.
+    """
+    instance_id: str
+    user_id: Optional[str]
+    created_at: datetime
+    profit: float
+    gross_profit: float
+    fees: float
+
+    def metrics(self, sign: int = 1) -> dict[str, float]:
+        return {
+            "profit": sign * self.profit,
+            "grossProfit": sign * self.gross_profit,
+            "fees": sign * self.fees,
+            "trades": sign,
+            "wins": sign * int(self.profit > 0),
+            "losses": sign * int(self.profit < 0),
+        }
+
+    def bucket_keys(self) -> Iterable[tuple[str, str, str, datetime]]:
+        owners = (("instance", self.instance_id), ("user", self.user_id))
+        for scope, owner in owners:
+            if owner is None:
+                continue
+            for granularity in GRANULARITIES:
+                yield scope, owner, granularity, bucket_start(self.created_at, granularity)
+
+    def to_ledger(self) -> dict[str, Any]:
+        return {
+            "instanceId": self.instance_id, "userId": self.user_id, "createdAt": self.created_at,
+            "profit": self.profit, "grossProfit": self.gross_profit, "fees": self.fees,
+        }
+
+    @classmethod
+    def from_ledger(cls, doc: dict[str, Any]) -> "Contribution":
+        created_at = doc["createdAt"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return cls(str(doc["instanceId"]), doc.get("userId") and str(doc["userId"]), created_at,
+                   float(doc["profit"]), float(doc["grossProfit"]), float(doc["fees"]))
+
+
+BucketKey = tuple[str, str, str, datetime]
+
+
+def bucket_deltas(changes: Iterable[tuple[Optional[Contribution], Optional[Contribution]]]
+                  ) -> dict[BucketKey, dict[str, float]]:
+    """
+    Per-bucket metric deltas for (old, new) contribution pairs; buckets whose delta is
+    all zero (a trade that did not really change) are dropped.
+    """
+    deltas: dict[BucketKey, dict[str, float]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    for old, new in changes:
+        for contribution, sign in ((old, -1), (new, 1)):
+            if contribution is None:
+                continue
+            metrics = contribution.metrics(sign)
+            for key in contribution.bucket_keys():
+                bucket = deltas[key]
+                for name, value in metrics.items():
+                    bucket[name] += value
+    return {key: delta for key, delta in deltas.items() if any(abs(value) > 1e-12 for value in delta.values())}
+
+
+def rollup_id(key: BucketKey) -> str:
+    scope, owner, granularity, start = key
+    return f"{scope}:{owner}:{granularity}:{start.strftime('%Y-%m-%dT%H')}"
+
+
+class MongoRollups:
+    """
+    Follows the API's ``trades`` collection by ``(updatedAt, _id)`` and maintains the
+    ``pnlrollups`` buckets.
+    """
+
+    def __init__(self, uri: str, database: Optional[str] = None, batch_size: int = BATCH_SIZE):
+        try:
+            import pymongo
+        except ImportError as e:
+            raise RuntimeError("pymongo is required for --mongo-uri (pip install pymongo)") from e
+        self._pymongo = pymongo
+        self.client = pymongo.MongoClient(uri, tz_aware=True)
+        self.db = self.client[database] if database else self.client.get_default_database()
+        self.batch_size = batch_size
+        self._owners: dict[Any, Optional[str]] = {}
+
+    def _user_of(self, instance_ids: set) -> None:
+        missing = [instance_id for instance_id in instance_ids if instance_id not in self._owners]
+        if missing:
+            for doc in self.db["botinstances"].find({"_id": {"$in": missing}}, {"userId": 1}):
+                self._owners[doc["_id"]] = str(doc["userId"]) if doc.get("userId") else None
+
+    def _contribution(self, trade: dict[str, Any]) -> Optional[Contribution]:
+        if trade.get("status") != "closed":
+            return None
+        gross = float(trade.get("grossProfit") or 0.0)
+        fees = float(trade.get("platformFee") or 0.0)
+        profit = trade.get("profit")
+        return Contribution(
+            instance_id=str(trade["botInstanceId"]),
+            user_id=self._owners.get(trade["botInstanceId"]),
+            created_at=trade["createdAt"],
+            profit=float(profit if profit is not None else gross - fees),
+            gross_profit=gross,
+            fees=fees,
+        )
+
+    def _state(self) -> dict[str, Any]:
+        return self.db[STATE_COLLECTION].find_one({"_id": "watermark"}) or {}
+
+    def apply(self, trades: list[dict[str, Any]], watermark: dict[str, Any]) -> int:
+        self._user_of({trade["botInstanceId"] for trade in trades})
+        ledger = {doc["_id"]: Contribution.from_ledger(doc)
+                  for doc in self.db[LEDGER_COLLECTION].find({"_id": {"$in": [t["_id"] for t in trades]}})}
+        changes, ledger_ops = [], []
+        for trade in trades:
+            old, new = ledger.get(trade["_id"]), self._contribution(trade)
+            changes.append((old, new))
+            if new is not None:
+                ledger_ops.append(self._pymongo.ReplaceOne({"_id": trade["_id"]}, new.to_ledger(), upsert=True))
+            elif old is not None:
+                ledger_ops.append(self._pymongo.DeleteOne({"_id": trade["_id"]}))
+
+        bucket_ops = [
+            self._pymongo.UpdateOne(
+                {"_id": rollup_id(key)},
+                {"$inc": delta,
+                 "$setOnInsert": {"scope": key[0], "ownerId": key[1], "granularity": key[2], "bucket": key[3]}},
+                upsert=True,
+            )
+            for key, delta in bucket_deltas(changes).items()
+        ]
+        state_op = {"$set": {**watermark, "heartbeat": datetime.now(timezone.utc)}}
+
+        def write(session=None):
+            if bucket_ops:
+                self.db[ROLLUP_COLLECTION].bulk_write(bucket_ops, ordered=False, session=session)
+            if ledger_ops:
+                self.db[LEDGER_COLLECTION].bulk_write(ledger_ops, ordered=False, session=session)
+            self.db[STATE_COLLECTION].update_one({"_id": "watermark"}, state_op, upsert=True, session=session)
+
+        try:
+            with self.client.start_session() as session:
+                session.with_transaction(write)
+        except self._pymongo.errors.OperationFailure as e:
+            # Standalone servers have no transactions; a crash between the writes needs --rebuild.
+            if "Transaction numbers" not in str(e) and e.code not in (20, 263):
+                raise
+            write()
+        return len(bucket_ops)
+
+    def run_once(self) -> int:
+        state = self._state()
+        settled = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+        query: dict[str, Any] = {"updatedAt": {"$lt": settled}}
+        if state.get("updatedAt") is not None:
+            query["$or"] = [{"updatedAt": {"$gt": state["updatedAt"]}},
+                            {"updatedAt": state["updatedAt"], "_id": {"$gt": state["tradeId"]}}]
+        projection = {"botInstanceId": 1, "status": 1, "profit": 1, "grossProfit": 1,
+                      "platformFee": 1, "createdAt": 1, "updatedAt": 1}
+        cursor = self.db["trades"].find(query, projection).sort([("updatedAt", 1), ("_id", 1)])
+        changed = 0
+        batch: list[dict[str, Any]] = []
+        for trade in cursor:
+            batch.append(trade)
+            if len(batch) >= self.batch_size:
+                changed += self.apply(batch, {"updatedAt": batch[-1]["updatedAt"], "tradeId": batch[-1]["_id"]})
+                batch = []
+        if batch:
+            changed += self.apply(batch, {"updatedAt": batch[-1]["updatedAt"], "tradeId": batch[-1]["_id"]})
+        else:
+            self.db[STATE_COLLECTION].update_one(
+                {"_id": "watermark"}, {"$set": {"heartbeat": datetime.now(timezone.utc)}}, upsert=True)
+        return changed
+
+    def rebuild(self) -> int:
+        for name in (ROLLUP_COLLECTION, LEDGER_COLLECTION, STATE_COLLECTION):
+            self.db[name].delete_many({})
+        return self.run_once()
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class JsonlRollups:
+    """
+    Local stand-in: follows the trade exporter's JSONL output (``ftlib.trade_exporter``)
+    and keeps one JSON file per instance under ``out_dir`` (no fees, no user scope).
+    """
+
+    def __init__(self, source: Path, out_dir: Path):
+        self.source = Path(source)
+        self.out_dir = Path(out_dir)
+        self.state_path = self.out_dir / "state.json"
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            state = {"offset": 0, "ledger": {}}
+        self.offset = state["offset"]
+        self.ledger = {key: Contribution.from_ledger(doc) for key, doc in state["ledger"].items()}
+
+    def _owner_path(self, instance_id: str) -> Path:
+        return self.out_dir / "instance" / f"{instance_id}.json"
+
+    def run_once(self) -> int:
+        if not self.source.exists():
+            return 0
+        with self.source.open("rb") as handle:
+            handle.seek(self.offset)
+            lines = handle.readlines()
+        complete = [line for line in lines if line.endswith(b"\n")]
+        if not complete:
+            return 0
+        changes = []
+        for line in complete:
+            document = json.loads(line)["document"]
+            key = f"{document['botInstanceId']}:{document['tradeDetails']['ftTradeId']}"
+            new = None
+            if document["status"] == "closed" and document.get("openDate"):
+                gross = float(document["grossProfit"])
+                new = Contribution(document["botInstanceId"], None, datetime.fromisoformat(document["openDate"]),
+                                   gross, gross, 0.0)
+            changes.append((self.ledger.get(key), new))
+            if new is None:
+                self.ledger.pop(key, None)
+            else:
+                self.ledger[key] = new
+
+        deltas = bucket_deltas(changes)
+        by_owner: dict[str, list[tuple[BucketKey, dict[str, float]]]] = defaultdict(list)
+        for key, delta in deltas.items():
+            by_owner[key[1]].append((key, delta))
+        for owner, updates in by_owner.items():
+            path = self._owner_path(owner)
+            try:
+                rollup = json.loads(path.read_text())
+            except FileNotFoundError:
+                rollup = {granularity: {} for granularity in GRANULARITIES}
+            for (_, _, granularity, start), delta in updates:
+                bucket = rollup[granularity].setdefault(start.isoformat(), dict.fromkeys(METRICS, 0))
+                for name, value in delta.items():
+                    bucket[name] += value
+            _write_json(path, rollup)
+
+        self.offset += sum(len(line) for line in complete)
+        _write_json(self.state_path, {
+            "offset": self.offset,
+            "ledger": {key: {**c.to_ledger(), "createdAt": c.created_at.isoformat()} for key, c in self.ledger.items()},
+        })
+        return len(deltas)
+
+    def close(self) -> None:
+        pass
+
+
+def _write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain hourly / daily / monthly PnL rollups.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--mongo-uri", help="Follow the trades collection of this MongoDB.")
+    source.add_argument("--jsonl", type=Path, help="Follow a trade exporter JSONL file.")
+    parser.add_argument("--database", help="Mongo database (default: the one in the URI).")
+    parser.add_argument("--out", type=Path, default=Path("rollups"), help="Output directory for --jsonl.")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between passes.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+    parser.add_argument("--rebuild", action="store_true", help="Drop and recompute all Mongo rollups.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    rollups = MongoRollups(args.mongo_uri, args.database) if args.mongo_uri else JsonlRollups(args.jsonl, args.out)
+    try:
+        if args.rebuild:
+            if not isinstance(rollups, MongoRollups):
+                parser.error("--rebuild needs --mongo-uri (delete the --out directory instead)")
+            logger.info(f"Rebuilt {rollups.rebuild()} buckets.")
+            return 0
+        while True:
+            start = time.monotonic()
+            updated = rollups.run_once()
+            if updated:
+                logger.info(f"Updated {updated} buckets.")
+            if args.once:
+                return 0
+            time.sleep(max(0.0, args.interval - (time.monotonic() - start)))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        rollups.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Rolling and expanding min / max / normalization without lookahead.
+
+``(x - x.min()) / (x.max() - x.min())`` over a whole column scales every candle with
+the extremes of candles that come after it. The causal replacement scales each candle
+with the extremes of the trailing ``window`` candles only:
+
+    from ftlib.rolling_minmax import rolling_normalize
+
+    dataframe['kst'] = rolling_normalize(dataframe['kst'], 200)
+
+Batch kernels use the van Herk / Gil-Werman block decomposition: the series is cut
+into blocks of ``window`` values, a prefix and a suffix running min/max is taken in each
+block with ``np.minimum.accumulate``, and every window is the min of one suffix and one
+prefix value. That is O(n) regardless of the window, fully vectorized, and min and
+max come out of the same pass. 2-D arrays are processed column-wise in one go.
+
+``RollingMinMax`` keeps monotonic deques for live trading, where one candle arrives at
+a time: each ``update`` is amortized O(1) and returns the same values as the batch kernels.
+
+NaN semantics follow pandas ``rolling(window).min()``: the first ``window - 1`` values and
+any window containing a NaN are NaN. The expanding kernels skip NaN like ``expanding().min()``.
+"""
+from collections import deque
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+
+
+def _as_float(values: ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _like(values: ArrayLike, result: np.ndarray) -> ArrayLike:
+    """
+    Wrap ``result`` the way ``values`` came in (Series / DataFrame keep index and columns).
+    """
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(result, index=values.index, columns=values.columns)
+    return result
+
+
+def _windowed(x: np.ndarray, window: int, ufunc: np.ufunc, fill: float) -> np.ndarray:
+    """
+    Trailing-window reduction of ``x`` along axis 0 with a NaN-propagating ``ufunc``
+    (``np.minimum`` / ``np.maximum``).
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+
+    pad = (-n) % window
+    padded = np.concatenate([x, np.full((pad,) + x.shape[1:], fill)]) if pad else x
+    blocks = padded.reshape((-1, window) + x.shape[1:])
+    prefix = ufunc.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    out[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def rolling_min(values: ArrayLike, window: int) -> ArrayLike:
+    return _like(values, _windowed(_as_float(values), window, np.minimum, np.inf))
+
+
+def rolling_max(values: ArrayLike, window: int) -> ArrayLike:
+    return _like(values, _windowed(_as_float(values), window, np.maximum, -np.inf))
+
+
+def rolling_minmax(values: ArrayLike, window: int) -> tuple[ArrayLike, ArrayLike]:
+    x = _as_float(values)
+    return (
+        _like(values, _windowed(x, window, np.minimum, np.inf)),
+        _like(values, _windowed(x, window, np.maximum, -np.inf)),
+    )
+
+
+def _scale(x: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    # A flat window gives 0 / 0 = NaN, as the whole-series formula did for a flat column.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x - low) / (high - low)
+
+
+def rolling_normalize(values: ArrayLike, window: int) -> ArrayLike:
+    """
+    Scale every value to [0, 1] with the min / max of the trailing ``window`` values
+    (the value itself included).
+    """
+    x = _as_float(values)
+    low = _windowed(x, window, np.minimum, np.inf)
+    high = _windowed(x, window, np.maximum, -np.inf)
+    return _like(values, _scale(x, low, high))
+
+
+def expanding_min(values: ArrayLike) -> ArrayLike:
+    return _like(values, np.fmin.accumulate(_as_float(values), axis=0))
+
+
+def expanding_max(values: ArrayLike) -> ArrayLike:
+    return _like(values, np.fmax.accumulate(_as_float(values), axis=0))
+
+
+def expanding_normalize(values: ArrayLike) -> ArrayLike:
+    """
+    Scale every value with the min / max of all values up to and including it.
+    """
+    x = _as_float(values)
+    return _like(values, _scale(x, np.fmin.accumulate(x, axis=0), np.fmax.accumulate(x, axis=0)))
+
+
+class RollingMinMax:
+    """
+    Incremental trailing-window min / max of a single series, one value at a time.
+
+        tracker = RollingMinMax(200).extend(history)   # warm up from the loaded candles
+        low, high = tracker.update(new_close)          # per new candle
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = window
+        self._count = 0
+        self._last_nan = -window
+        # (position, value), values increasing in _lows and decreasing in _highs.
+        self._lows: deque = deque()
+        self._highs: deque = deque()
+
+    def update(self, value: float) -> tuple[float, float]:
+        position = self._count
+        self._count += 1
+        expired = position - self.window
+
+        if value != value:
+            self._last_nan = position
+            self._lows.clear()
+            self._highs.clear()
+        else:
+            while self._lows and self._lows[-1][1] >= value:
+                self._lows.pop()
+            self._lows.append((position, value))
+            while self._highs and self._highs[-1][1] <= value:
+                self._highs.pop()
+            self._highs.append((position, value))
+            if self._lows[0][0] <= expired:
+                self._lows.popleft()
+            if self._highs[0][0] <= expired:
+                self._highs.popleft()
+
+        if self._count < self.window or position - self._last_nan < self.window:
+            return np.nan, np.nan
+        return self._lows[0][1], self._highs[0][1]
+
+    def extend(self, values) -> "RollingMinMax":
+        for value in np.asarray(values, dtype=float):
+            self.update(value)
+        return self
+
+    def normalize(self, value: float) -> float:
+        """
+        Add ``value`` and return it scaled with the current window.
+        """
+        low, high = self.update(value)
+        return float(_scale(np.float64(value), low, high))
@@ -0,0 +1,120 @@
+"""
+OHLCV candles in shared memory.
+
+The parent process publishes each pair's candles once; worker processes attach by
+name and get DataFrames whose price columns are views on the shared buffer
+(no copy, no feather re-read). Buffers are read-only for workers - freqtrade copies
+the frame before populating indicators, so strategies never write into them.
+"""
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """
+    Picklable handle to one pair's candles: ``rows`` dates (int64 ns, UTC)
+    followed by a ``5 x rows`` float64 block of open/high/low/close/volume.
+    """
+    pair: str
+    shm_name: str
+    rows: int
+
+
+def _layout(buf, rows: int) -> tuple[np.ndarray, np.ndarray]:
+    dates = np.ndarray((rows,), dtype=np.int64, buffer=buf, offset=0)
+    prices = np.ndarray((len(PRICE_COLUMNS), rows), dtype=np.float64, buffer=buf, offset=rows * 8)
+    return dates, prices
+
+
+class SharedCandles:
+    """
+    Owner side: copies ``{pair: DataFrame}`` into shared memory blocks.
+    Use as a context manager, or call ``close()`` - the blocks are unlinked then.
+    """
+
+    def __init__(self, data: dict[str, DataFrame]):
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self.specs: list[SharedFrameSpec] = []
+        for pair, frame in data.items():
+            rows = len(frame)
+            size = max(rows * 8 * (1 + len(PRICE_COLUMNS)), 1)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks.append(block)
+            dates, prices = _layout(block.buf, rows)
+            dates[:] = frame["date"].to_numpy(dtype="datetime64[ns]").view("i8")
+            prices[:] = frame[PRICE_COLUMNS].to_numpy(dtype=np.float64).T
+            self.specs.append(SharedFrameSpec(pair, block.name, rows))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.size for block in self._blocks)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedCandles":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# Attached blocks must outlive the frames viewing them - only ``release`` unmaps them.
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _block(spec: SharedFrameSpec) -> shared_memory.SharedMemory:
+    block = _attached.get(spec.shm_name)
+    if block is None:
+        block = _attached[spec.shm_name] = shared_memory.SharedMemory(name=spec.shm_name)
+    return block
+
+
+def attach(specs: list[SharedFrameSpec]) -> dict[str, DataFrame]:
+    """
+    Worker side: map the published candles into DataFrames without copying the price data.
+    """
+    data = {}
+    for spec in specs:
+        dates, prices = _layout(_block(spec).buf, spec.rows)
+        prices.flags.writeable = False
+        frame = pd.DataFrame(prices.T, columns=PRICE_COLUMNS, copy=False)
+        frame.insert(0, "date", pd.Series(dates.view("M8[ns]")).dt.tz_localize("UTC"))
+        data[spec.pair] = frame
+    return data
+
+
+def copy_range(spec: SharedFrameSpec, start=None, end=None) -> DataFrame:
+    """
+    Worker side: a private copy of the candles dated in ``[start, end]`` (UTC timestamps,
+    None for open ends). Unlike ``attach`` frames, copies stay valid after ``release``.
+    """
+    dates, prices = _layout(_block(spec).buf, spec.rows)
+    first = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, "left"))
+    last = spec.rows if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, "right"))
+    frame = pd.DataFrame(prices[:, first:last].T.copy(), columns=PRICE_COLUMNS)
+    frame.insert(0, "date", pd.Series(dates[first:last].copy().view("M8[ns]")).dt.tz_localize("UTC"))
+    del dates, prices
+    return frame
+
+
+def release(shm_names: list[str]) -> None:
+    """
+    Unmap blocks the owner dropped. Only for workers that read with ``copy_range``: frames
+    from ``attach`` view the mapping and must not outlive it.
+    """
+    for name in shm_names:
+        block = _attached.pop(name, None)
+        if block is not None:
+            block.close()
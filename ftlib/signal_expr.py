@@ -0,0 +1,312 @@
+"""
+Declarative entry / exit conditions compiled into a shared evaluation plan.
+
+Conditions are written like the pandas expressions they replace, over named columns:
+
+    from ftlib.signal_expr import col, compile_signals, var
+
+    close = col('close')
+    entry = (close > close.shift(2) ** var('pow')) & (close.shift(1) > close.shift(3) ** var('pow'))
+    plan = compile_signals(enter_long=entry)
+    ...
+    plan.apply(dataframe, pow=self.buy_pow.value)    # dataframe.loc[entry, 'enter_long'] = 1
+
+Compiling turns the expression trees into one list of NumPy steps:
+
+- identical sub-expressions are computed once (``close.shift(2)`` used in five terms is
+  one shift);
+- shifts are hoisted out of element-wise operations whose operands are shifted alike,
+  so ``a.shift(5) > a.shift(4)``, ``a.shift(4) > a.shift(3)`` ... share one comparison
+  ``a.shift(1) > a`` and only its boolean result is shifted;
+- every step writes into a scratch buffer that is returned to a pool after its last
+  use, so a plan needs a handful of arrays however long the condition chain is.
+
+Semantics follow pandas: a comparison involving NaN is False, shifted booleans are
+False in the rows shifted in, ``~`` is applied after shifting.
+"""
+from typing import Any, Callable, Union
+
+import numpy as np
+from pandas import DataFrame
+
+
+Key = tuple
+
+
+class Expr:
+    """
+    Node of a signal expression. ``key`` identifies the node structurally; the
+    comparison operators build new nodes, so ``Expr`` is never used as a dict key.
+    """
+
+    __slots__ = ("key", "args", "boolean")
+
+    def __init__(self, key: Key, args: tuple = (), boolean: bool = False):
+        self.key = key
+        self.args = args
+        self.boolean = boolean
+
+    def __bool__(self):
+        raise TypeError("Use & / | / ~ to combine conditions, not and / or / not.")
+
+    def shift(self, periods: int = 1) -> "Expr":
+        return _shift(self, int(periods))
+
+    def abs(self) -> "Expr":
+        return _unary("abs", self)
+
+    def __neg__(self):
+        return _unary("neg", self)
+
+    def __invert__(self):
+        return _unary("not", self)
+
+    def __and__(self, other):
+        return _binary("and", self, other)
+
+    def __or__(self, other):
+        return _binary("or", self, other)
+
+    def __rand__(self, other):
+        return _binary("and", other, self)
+
+    def __ror__(self, other):
+        return _binary("or", other, self)
+
+    def __repr__(self) -> str:
+        return f"Expr{self.key}"
+
+
+def _make_binary(name: str, reflected: bool = False) -> Callable:
+    if reflected:
+        return lambda self, other: _binary(name, other, self)
+    return lambda self, other: _binary(name, self, other)
+
+
+for _name in ("add", "sub", "mul", "truediv", "pow", "lt", "le", "gt", "ge", "eq", "ne"):
+    setattr(Expr, f"__{_name}__", _make_binary(_name))
+for _name in ("add", "sub", "mul", "truediv", "pow"):
+    setattr(Expr, f"__r{_name}__", _make_binary(_name, reflected=True))
+
+
+COMPARISONS = {"lt": np.less, "le": np.less_equal, "gt": np.greater, "ge": np.greater_equal,
+               "eq": np.equal, "ne": np.not_equal}
+ARITHMETIC = {"add": np.add, "sub": np.subtract, "mul": np.multiply, "truediv": np.true_divide,
+              "pow": np.power}
+LOGICAL = {"and": np.logical_and, "or": np.logical_or}
+UNARY = {"neg": np.negative, "abs": np.absolute, "not": np.logical_not}
+
+# Ops where f(shift(a, k), shift(b, k)) == shift(f(a, b), k) including the shifted-in rows
+# (NaN for floats, False for booleans). Not ``ne`` (NaN != NaN is True) and not ``pow``
+# (NaN ** 0 and 1 ** NaN are 1).
+_HOISTABLE = {"add", "sub", "mul", "truediv", "and", "or", "lt", "le", "gt", "ge", "eq"}
+
+
+def col(name: Any) -> Expr:
+    return Expr(("col", name))
+
+
+def var(name: str) -> Expr:
+    """
+    Scalar supplied at evaluation time (hyperopt parameter values).
+    """
+    return Expr(("var", name))
+
+
+def const(value: Union[int, float, bool]) -> Expr:
+    return Expr(("const", value), boolean=isinstance(value, (bool, np.bool_)))
+
+
+def _wrap(value) -> Expr:
+    return value if isinstance(value, Expr) else const(value)
+
+
+def _is_scalar(expr: Expr) -> bool:
+    return expr.key[0] in ("const", "var")
+
+
+def _split_shift(expr: Expr) -> tuple[Expr, int]:
+    if expr.key[0] == "shift":
+        return expr.args[0], expr.key[2]
+    return expr, 0
+
+
+def _shift(expr: Expr, periods: int) -> Expr:
+    if periods == 0 or _is_scalar(expr):
+        return expr
+    base, inner = _split_shift(expr)
+    if inner + periods == 0 or (inner and (inner > 0) != (periods > 0)):
+        # Opposite shifts do not cancel - the rows shifted out are lost.
+        return Expr(("shift", expr.key, periods), (expr,), expr.boolean)
+    periods += inner
+    return Expr(("shift", base.key, periods), (base,), base.boolean)
+
+
+def _unary(op: str, expr: Expr) -> Expr:
+    if op != "not":
+        base, periods = _split_shift(expr)
+        if periods:
+            return _shift(_unary(op, base), periods)
+    return Expr((op, expr.key), (expr,), op == "not")
+
+
+def _binary(op: str, left, right) -> Expr:
+    left, right = _wrap(left), _wrap(right)
+    if op in _HOISTABLE:
+        (lbase, lshift), (rbase, rshift) = _split_shift(left), _split_shift(right)
+        shifts = [shift for expr, shift in ((left, lshift), (right, rshift)) if not _is_scalar(expr)]
+        common = min(shifts, default=0) if shifts and all(s > 0 for s in shifts) else 0
+        if common:
+            inner_left = left if _is_scalar(left) else _shift(lbase, lshift - common)
+            inner_right = right if _is_scalar(right) else _shift(rbase, rshift - common)
+            return _shift(_binary(op, inner_left, inner_right), common)
+    boolean = op in COMPARISONS or op in LOGICAL
+    return Expr((op, left.key, right.key), (left, right), boolean)
+
+
+def all_of(*conditions) -> Expr:
+    return _reduce("and", conditions)
+
+
+def any_of(*conditions) -> Expr:
+    return _reduce("or", conditions)
+
+
+def _reduce(op: str, conditions) -> Expr:
+    conditions = [_wrap(c) for c in conditions]
+    if not conditions:
+        raise ValueError("at least one condition is required")
+    result = conditions[0]
+    for condition in conditions[1:]:
+        result = _binary(op, result, condition)
+    return result
+
+
+class SignalPlan:
+    """
+    Compiled, de-duplicated evaluation steps for one or more named output conditions.
+    """
+
+    def __init__(self, outputs: dict[str, Expr]):
+        self.outputs = {name: _wrap(expr) for name, expr in outputs.items()}
+        self.columns: list[Any] = []
+        self.variables: list[str] = []
+        self._slots: dict[Key, int] = {}
+        self._order: list[Expr] = []
+        for expr in self.outputs.values():
+            self._visit(expr)
+        self._plan_buffers()
+
+    def _visit(self, expr: Expr) -> None:
+        if expr.key in self._slots:
+            return
+        for arg in expr.args:
+            self._visit(arg)
+        self._slots[expr.key] = len(self._order)
+        self._order.append(expr)
+        kind = expr.key[0]
+        if kind == "col":
+            self.columns.append(expr.key[1])
+        elif kind == "var":
+            self.variables.append(expr.key[1])
+
+    def _plan_buffers(self) -> None:
+        """
+        Assign scratch buffers: a node's buffer goes back to the pool after its last reader.
+        """
+        last_use = {}
+        for index, expr in enumerate(self._order):
+            for arg in expr.args:
+                last_use[self._slots[arg.key]] = index
+        keep = {self._slots[expr.key] for expr in self.outputs.values()}
+        free: dict[bool, list[int]] = {True: [], False: []}
+        self.buffers = {True: 0, False: 0}
+        self._buffer_of: dict[int, tuple[bool, int]] = {}
+        for index, expr in enumerate(self._order):
+            if expr.key[0] in ("col", "var", "const"):
+                continue
+            pool = free[expr.boolean]
+            if pool:
+                buffer = pool.pop()
+            else:
+                buffer = self.buffers[expr.boolean]
+                self.buffers[expr.boolean] += 1
+            self._buffer_of[index] = (expr.boolean, buffer)
+            for slot in {self._slots[arg.key] for arg in expr.args}:
+                if last_use[slot] == index and slot in self._buffer_of and slot not in keep:
+                    released_kind, released = self._buffer_of[slot]
+                    free[released_kind].append(released)
+
+    def evaluate(self, dataframe: DataFrame, **variables) -> dict[str, np.ndarray]:
+        length = len(dataframe)
+        pools = {
+            True: [np.empty(length, dtype=bool) for _ in range(self.buffers[True])],
+            False: [np.empty(length, dtype=np.float64) for _ in range(self.buffers[False])],
+        }
+        values: list[Any] = [None] * len(self._order)
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            for index, expr in enumerate(self._order):
+                values[index] = self._step(expr, index, values, dataframe, variables, pools)
+        results = {}
+        for name, expr in self.outputs.items():
+            value = values[self._slots[expr.key]]
+            if np.ndim(value) == 0:
+                value = np.full(length, bool(value))
+            results[name] = np.array(value, dtype=bool, copy=True)
+        return results
+
+    def _step(self, expr: Expr, index: int, values: list, dataframe: DataFrame, variables: dict, pools):
+        kind = expr.key[0]
+        if kind == "col":
+            column = dataframe[expr.key[1]]
+            return column.to_numpy(dtype=bool if column.dtype == bool else np.float64)
+        if kind == "var":
+            try:
+                return variables[expr.key[1]]
+            except KeyError:
+                raise KeyError(f"signal plan variable {expr.key[1]!r} was not supplied") from None
+        if kind == "const":
+            return expr.key[1]
+
+        boolean, buffer = self._buffer_of[index]
+        out = pools[boolean][buffer]
+        args = [values[self._slots[arg.key]] for arg in expr.args]
+        if kind == "shift":
+            source, periods = args[0], expr.key[2]
+            if np.ndim(source) == 0:
+                out[:] = source
+                return out
+            fill = False if boolean else np.nan
+            if abs(periods) >= len(out):
+                out[:] = fill
+            elif periods > 0:
+                out[periods:] = source[:-periods]
+                out[:periods] = fill
+            else:
+                out[:periods] = source[-periods:]
+                out[periods:] = fill
+            return out
+        if kind in UNARY:
+            return UNARY[kind](args[0], out=out)
+        ufunc = COMPARISONS.get(kind) or ARITHMETIC.get(kind) or LOGICAL[kind]
+        return ufunc(args[0], args[1], out=out)
+
+    def apply(self, dataframe: DataFrame, value: Any = 1, **variables) -> DataFrame:
+        """
+        ``dataframe.loc[condition, name] = value`` for every output, in place.
+        """
+        for name, mask in self.evaluate(dataframe, **variables).items():
+            if name in dataframe.columns:
+                dataframe.loc[mask, name] = value
+            else:
+                dataframe[name] = np.where(mask, value, np.nan)
+        return dataframe
+
+    def __repr__(self) -> str:
+        steps = len([expr for expr in self._order if expr.key[0] not in ("col", "var", "const")])
+        return (f"<SignalPlan outputs={list(self.outputs)} steps={steps} "
+                f"buffers={self.buffers[False]} float + {self.buffers[True]} bool>")
+
+
+def compile_signals(**outputs: Expr) -> SignalPlan:
+    return SignalPlan(outputs)
@@ -0,0 +1,133 @@
+"""
+Per-loop balance snapshot and stake reservations for ``custom_stake_amount`` / DCA.
+
+``self.wallets.get_available_stake_amount()`` recomputes the free stake from the wallet
+and the open trades on every call; strategies that size every entry and every DCA order
+from it pay for that once per decision, and two decisions in the same bot iteration both
+see the balance from before the other's order. ``StakeSizingMixin`` takes one snapshot
+per bot iteration (``bot_loop_start``) and hands out stake from it under a lock, so every
+decision is O(1) and the stake granted within one iteration never exceeds the snapshot -
+including forced entries from the API thread:
+
+    class SmartScalpingDCA(StakeSizingMixin, IStrategy):
+
+        def custom_stake_amount(self, pair, current_time, current_rate, proposed_stake,
+                                min_stake, max_stake, leverage, entry_tag, side, **kwargs):
+            return self.stake_sizer.risk_stake(pair, 0.02, min_stake, max_stake, leverage,
+                                               fallback=proposed_stake)
+
+Reservations are dropped with the next snapshot, which already reflects the orders placed.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BalanceSnapshot:
+    available: float
+    total: float
+    taken_at: datetime
+
+
+class StakeSizer:
+    """
+    Stake sizing against one balance snapshot; ``reserve`` is atomic across threads.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[BalanceSnapshot] = None
+        self.reserved = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, wallets, current_time: Optional[datetime] = None) -> Optional[BalanceSnapshot]:
+        """
+        Take a new snapshot from freqtrade's ``Wallets`` and drop the reservations.
+        Without wallets (strategy loaded outside a bot) the sizer has no snapshot.
+        """
+        snapshot = None
+        if wallets is not None:
+            try:
+                snapshot = BalanceSnapshot(
+                    available=float(wallets.get_available_stake_amount()),
+                    total=float(wallets.get_total_stake_amount()),
+                    taken_at=current_time or datetime.now(timezone.utc),
+                )
+            except Exception as e:
+                logger.warning(f"Could not read the wallet balance for stake sizing: {e}")
+        with self._lock:
+            self.snapshot = snapshot
+            self.reserved = 0.0
+        return snapshot
+
+    @property
+    def remaining(self) -> float:
+        """
+        Available stake of the snapshot minus the stake reserved since (0 without snapshot).
+        """
+        if self.snapshot is None:
+            return 0.0
+        return max(0.0, self.snapshot.available - self.reserved)
+
+    def reserve(self, pair: str, stake: float, min_stake: Optional[float] = None,
+                max_stake: Optional[float] = None, fallback: Optional[float] = None) -> Optional[float]:
+        """
+        Clamp ``stake`` to ``[min_stake, max_stake]`` and to the remaining balance and reserve it.
+
+        :param fallback: returned as-is (without reservation) when there is no snapshot.
+        :return: the reserved stake, or None if less than ``min_stake`` remains.
+        """
+        if max_stake is not None:
+            stake = min(stake, max_stake)
+        if min_stake:
+            stake = max(stake, min_stake)
+        with self._lock:
+            if self.snapshot is None:
+                return fallback
+            remaining = self.snapshot.available - self.reserved
+            stake = min(stake, remaining)
+            if stake <= 0 or (min_stake and stake < min_stake):
+                logger.info(f"{pair}: no stake left in this iteration ({remaining:.2f} remaining, "
+                            f"min stake {min_stake}).")
+                return None
+            self.reserved += stake
+            return stake
+
+    def risk_stake(self, pair: str, risk: float, min_stake: Optional[float] = None,
+                   max_stake: Optional[float] = None, leverage: float = 1.0, basis: str = "available",
+                   balance_cap: Optional[float] = None, fallback: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve ``risk`` (a fraction) of the snapshot balance, divided by ``leverage``.
+
+        :param basis: "available" (free stake) or "total" (free stake plus open trades).
+        :param balance_cap: size as if the balance were at most this much.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return fallback
+        balance = snapshot.total if basis == "total" else snapshot.available
+        if balance_cap is not None:
+            balance = min(balance, balance_cap)
+        effective_leverage = leverage if leverage and leverage > 0 else 1.0
+        return self.reserve(pair, balance * risk / effective_leverage, min_stake, max_stake, fallback)
+
+
+class StakeSizingMixin:
+    """
+    Provides ``self.stake_sizer``, refreshed at the start of every bot iteration (and
+    every backtest candle). Put it before ``IStrategy`` in the bases; strategies
+    overriding ``bot_loop_start`` must call ``super().bot_loop_start(...)``.
+    """
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        self.stake_sizer = StakeSizer()
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        self.stake_sizer.refresh(getattr(self, "wallets", None), current_time)
+        super().bot_loop_start(current_time=current_time, **kwargs)
@@ -0,0 +1,187 @@
+"""
+Cold-start cost of the libraries a strategy imports.
+
+For every module-level import of a strategy file, a fresh interpreter imports
+``freqtrade.strategy`` (paid by every bot regardless) and then only that library,
+measuring the extra import time and resident memory. Imports are also checked against
+the module's names, so libraries imported but never used stand out - those are the
+first candidates for ``ftlib.lazy_import`` or removal.
+
+Usage:
+    python -m ftlib.startup_profile user_data/strategies/NostalgiaForInfinityNext.py
+    python -m ftlib.startup_profile --json user_data/strategies
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from ftlib.strategy_loader import ROOT, iter_strategy_files
+
+
+BASELINE_MODULE = "freqtrade.strategy"
+
+# ``pta = lazy_import("pandas_ta")`` only costs its import once ``pta`` is first used.
+LAZY_FACTORIES = {"lazy_import", "lazy_attr"}
+
+# Strategy methods every bot runs before or on its first candle. A lazy import used from
+# these (or from methods they call on ``self``) is paid at startup all the same.
+STARTUP_METHODS = {
+    "__init__", "bot_start", "informative_pairs", "populate_indicators", "populate_entry_trend",
+    "populate_exit_trend", "populate_buy_trend", "populate_sell_trend",
+}
+
+# Runs in a fresh interpreter: import the baseline, then the library, report the deltas.
+_MEASURE = """
+import importlib, json, os, sys, time
+def rss():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import psutil
+        return psutil.Process().memory_info().rss
+importlib.import_module({baseline!r})
+rss0, t0 = rss(), time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(json.dumps({{"seconds": time.perf_counter() - t0, "rss_bytes": rss() - rss0}}))
+"""
+
+
+def module_imports(path: Path) -> list[dict[str, Any]]:
+    """
+    Module-level imports of a strategy file, with the names they bind and whether
+    any of those names is referenced in the module. ``lazy_import`` / ``lazy_attr``
+    assignments are listed too, marked ``lazy``, with ``startup`` when a name is used on
+    the startup path (``STARTUP_METHODS``) - deferring those saves nothing.
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    referenced = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    on_startup = _startup_names(tree)
+    imports = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                bound = (alias.asname or alias.name).split(".")[0]
+                imports.append({"module": alias.name, "line": node.lineno, "names": [bound]})
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imports.append({
+                "module": node.module,
+                "line": node.lineno,
+                "names": [alias.asname or alias.name for alias in node.names],
+            })
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                and getattr(node.value.func, "id", None) in LAZY_FACTORIES and node.value.args \
+                and isinstance(node.value.args[0], ast.Constant):
+            imports.append({
+                "module": node.value.args[0].value,
+                "line": node.lineno,
+                "names": [target.id for target in node.targets if isinstance(target, ast.Name)],
+                "lazy": True,
+            })
+    for entry in imports:
+        entry["used"] = [name for name in entry["names"] if name in referenced]
+        if entry.get("lazy"):
+            entry["startup"] = any(name in on_startup for name in entry["names"])
+    return imports
+
+
+def _startup_names(tree: ast.Module) -> set[str]:
+    """
+    Names referenced by the ``STARTUP_METHODS`` of the module's classes and the methods
+    they call on ``self`` (and by ``@informative`` methods).
+    """
+    names: set[str] = set()
+    for cls in (node for node in tree.body if isinstance(node, ast.ClassDef)):
+        methods = {node.name: node for node in cls.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        pending = [name for name, node in methods.items() if name in STARTUP_METHODS or any(
+            getattr(decorator, "id", None) == "informative"
+            or getattr(getattr(decorator, "func", None), "id", None) == "informative"
+            for decorator in node.decorator_list)]
+        seen: set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen or name not in methods:
+                continue
+            seen.add(name)
+            for node in ast.walk(methods[name]):
+                if isinstance(node, ast.Name):
+                    names.add(node.id)
+                elif isinstance(node, ast.Attribute) and getattr(node.value, "id", None) == "self":
+                    pending.append(node.attr)
+    return names
+
+
+def measure_import(module: str, python: str = sys.executable) -> dict[str, Any]:
+    """
+    Marginal import time and RSS of ``module`` on top of freqtrade, in a fresh interpreter.
+    """
+    proc = subprocess.run(
+        [python, "-c", _MEASURE.format(baseline=BASELINE_MODULE), module], cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["failed"]
+        return {"error": tail[0]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def profile(paths: Optional[list[Path]] = None, workers: Optional[int] = None) -> list[dict[str, Any]]:
+    """
+    Per strategy file: every top-level import with its marginal cold-start cost.
+    Each distinct library is measured once and shared between files.
+    """
+    files = iter_strategy_files(paths)
+    per_file = {str(path): module_imports(path) for path in files}
+    modules = sorted({entry["module"] for imports in per_file.values() for entry in imports})
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        costs = dict(zip(modules, pool.map(measure_import, modules)))
+
+    results = []
+    for path, imports in per_file.items():
+        for entry in imports:
+            entry.update(costs[entry["module"]])
+        imports.sort(key=lambda entry: -entry.get("seconds", 0))
+        results.append({"path": path, "imports": imports})
+    return results
+
+
+def print_report(results: list[dict[str, Any]], min_ms: float = 1.0) -> None:
+    for result in results:
+        rows = [entry for entry in result["imports"]
+                if "error" in entry or entry.get("seconds", 0) * 1e3 >= min_ms]
+        if not rows:
+            continue
+        print(os.path.relpath(result["path"], ROOT))
+        for entry in rows:
+            usage = "used" if entry["used"] else "UNUSED"
+            if entry.get("lazy"):
+                usage += ", lazy but loaded on startup" if entry.get("startup") else ", deferred"
+            if "error" in entry:
+                cost = entry["error"]
+            else:
+                cost = f"{entry['seconds'] * 1e3:8.1f} ms {entry['rss_bytes'] / 1e6:7.1f} MB"
+            print(f"    line {entry['line']:<4} {entry['module']:<40} {cost}  {usage}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Cold-start import cost per strategy library.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Hide cheaper imports.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = profile(args.paths or None, args.workers)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.min_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Strategy performance benchmark with per-indicator cost attribution.
+
+Runs ``populate_indicators``, ``populate_entry_trend`` and ``populate_exit_trend`` of
+every strategy on the bundled candles (or synthetic series of a given length) and records
+wall time, peak memory and the time spent in each TA-Lib / qtpylib / pandas_ta /
+technical call. Every run is appended to a JSONL + CSV history, so regressions and the
+heaviest indicators stay visible over time.
+
+Usage:
+    python -m ftlib.strategy_bench                        # all strategies, bundled data
+    python -m ftlib.strategy_bench user_data/strategies/Bandtastic.py --repeat 5
+    python -m ftlib.strategy_bench --synthetic 1000 10000 100000 --filter Bandtastic MultiMa
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from ftlib.strategy_loader import DATA_DIR, ROOT, iter_strategy_files, load_module, load_strategy, strategy_classes
+
+
+HISTORY_DIR = ROOT / "user_data" / "benchmarks"
+
+PHASES = ("populate_indicators", "populate_entry_trend", "populate_exit_trend")
+
+# Indicator libraries whose public callables are timed, with the label used in reports.
+INSTRUMENTED_MODULES = (
+    ("talib.abstract", "talib"),
+    ("talib", "talib"),
+    ("freqtrade.vendor.qtpylib.indicators", "qtpylib"),
+    ("pandas_ta", "pandas_ta"),
+    ("technical.indicators", "technical"),
+)
+
+CSV_FIELDS = (
+    "run_id", "timestamp", "commit", "strategy", "source", "candles",
+    "phase", "name", "calls", "seconds", "peak_mb",
+)
+
+
+class _Timed:
+    """
+    Callable stand-in for an indicator function. Only the outermost instrumented call is
+    timed, so qtpylib helpers calling each other are not counted twice.
+    """
+
+    def __init__(self, profiler: "IndicatorProfiler", label: str, func):
+        self._profiler = profiler
+        self._label = label
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        profiler = self._profiler
+        if not profiler.active or profiler.depth:
+            return self.__wrapped__(*args, **kwargs)
+        profiler.depth += 1
+        start = time.perf_counter()
+        try:
+            return self.__wrapped__(*args, **kwargs)
+        finally:
+            profiler.record(self._label, time.perf_counter() - start)
+            profiler.depth -= 1
+
+    def __getattr__(self, name):
+        # Function objects from talib.abstract carry metadata (info, parameters, ...)
+        if name == "__wrapped__":
+            raise AttributeError(name)
+        return getattr(self.__wrapped__, name)
+
+
+class IndicatorProfiler:
+    """
+    Replaces the public functions of the indicator libraries with timed stand-ins.
+
+    Install it before strategy modules are imported, so ``from x import y`` style
+    imports bind the timed version as well.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.depth = 0
+        self.calls: dict[str, int] = defaultdict(int)
+        self.seconds: dict[str, float] = defaultdict(float)
+        self._installed = False
+
+    def install(self) -> list[str]:
+        """
+        Patch every importable library. Returns the labels of the patched libraries.
+        """
+        import importlib
+
+        patched = []
+        if self._installed:
+            return patched
+        for module_name, prefix in INSTRUMENTED_MODULES:
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            for attr in dir(module):
+                if attr.startswith("_"):
+                    continue
+                func = getattr(module, attr)
+                if not callable(func) or isinstance(func, (type, _Timed)):
+                    continue
+                if getattr(func, "__module__", module_name).split(".")[0] != module_name.split(".")[0]:
+                    # Re-exported helpers (numpy, pandas, ...) are not indicators.
+                    continue
+                setattr(module, attr, _Timed(self, f"{prefix}.{attr}", func))
+            patched.append(module_name)
+        self._installed = True
+        return patched
+
+    def record(self, label: str, seconds: float) -> None:
+        self.calls[label] += 1
+        self.seconds[label] += seconds
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.seconds.clear()
+
+    @contextlib.contextmanager
+    def recording(self):
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+
+
+def timeframe_minutes(timeframe: str) -> int:
+    units = {"m": 1, "h": 60, "d": 1440, "w": 10080}
+    return int(timeframe[:-1]) * units[timeframe[-1]]
+
+
+def _read_candles(path: Path) -> DataFrame:
+    if path.suffix == ".feather":
+        frame = pd.read_feather(path)
+    else:
+        frame = pd.DataFrame(
+            json.loads(path.read_text()), columns=["date", "open", "high", "low", "close", "volume"]
+        )
+        frame["date"] = pd.to_datetime(frame["date"], unit="ms", utc=True)
+    return frame
+
+
+def _coverage(path: Path) -> pd.Timedelta:
+    dates = pd.read_feather(path, columns=["date"])["date"] if path.suffix == ".feather" else _read_candles(path)["date"]
+    return dates.max() - dates.min() if len(dates) else pd.Timedelta(0)
+
+
+def load_candles(pair: str, timeframe: str, datadir: Path = DATA_DIR) -> Optional[DataFrame]:
+    """
+    Candles for ``pair`` / ``timeframe`` from ``datadir``: of the file for that timeframe
+    and the files of timeframes dividing it (resampled), the one covering the longest
+    period - finer files often hold a much shorter history (4h from 1m data: 181 candles,
+    from 15m data: 2250).
+    """
+    wanted = timeframe_minutes(timeframe)
+    candidates = []
+    for path in datadir.glob(f"{pair.replace('/', '_')}-*"):
+        if path.suffix not in (".feather", ".json"):
+            continue
+        try:
+            minutes = timeframe_minutes(path.stem.split("-")[-1])
+        except (KeyError, ValueError):
+            continue
+        if minutes <= wanted and wanted % minutes == 0:
+            # Longest coverage first, then the coarsest timeframe, then feather over json.
+            candidates.append((_coverage(path), minutes, path.suffix == ".feather", path))
+    if not candidates:
+        return None
+    _, minutes, _, path = max(candidates)
+    frame = _read_candles(path)
+    if minutes == wanted:
+        return frame
+    return (
+        frame.resample(f"{wanted}min", on="date")
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        .dropna()
+        .reset_index()
+    )
+
+
+def synthetic_candles(candles: int, timeframe: str = "5m", seed: int = 1) -> DataFrame:
+    """
+    Geometric random walk OHLCV series of the requested length.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, candles)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, candles)) * close
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=candles, freq=f"{timeframe_minutes(timeframe)}min", tz="UTC"),
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.lognormal(3, 1, candles),
+    })
+
+
+def _run_phases(strategy, frame: DataFrame, metadata: dict, timings: dict, peaks: Optional[dict]) -> None:
+    dataframe = frame.copy()
+    for phase in PHASES:
+        if peaks is not None:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        dataframe = getattr(strategy, phase)(dataframe, metadata)
+        elapsed = time.perf_counter() - start
+        timings[phase] = min(timings.get(phase, elapsed), elapsed)
+        if peaks is not None:
+            peaks[phase] = (tracemalloc.get_traced_memory()[1] - before) / 1e6
+
+
+def bench_strategy(
+    path: Path, class_name: str, frame: DataFrame, pair: str, profiler: IndicatorProfiler, repeat: int = 3
+) -> dict[str, Any]:
+    """
+    Best-of-``repeat`` wall time per phase, peak memory per phase (separate traced run,
+    tracemalloc skews timings) and mean per-indicator time over the timed runs.
+    """
+    strategy = load_strategy(path, class_name, pair)
+    metadata = {"pair": pair}
+    timings: dict[str, float] = {}
+    peaks: dict[str, float] = {}
+
+    # Strategies printing per pair (MultiMa) would drown the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        profiler.reset()
+        with profiler.recording():
+            for _ in range(repeat):
+                _run_phases(strategy, frame, metadata, timings, None)
+        indicators = {
+            label: {"calls": profiler.calls[label] // repeat, "seconds": profiler.seconds[label] / repeat}
+            for label in profiler.seconds
+        }
+        tracemalloc.start()
+        try:
+            _run_phases(strategy, frame, metadata, {}, peaks)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "phases": {phase: {"seconds": timings[phase], "peak_mb": peaks[phase]} for phase in PHASES},
+        "total_seconds": sum(timings.values()),
+        "indicators": dict(sorted(indicators.items(), key=lambda item: -item[1]["seconds"])),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _previous_totals(history_file: Path) -> dict[tuple, float]:
+    totals: dict[tuple, float] = {}
+    if not history_file.is_file():
+        return totals
+    with history_file.open() as fh:
+        for line in fh:
+            run = json.loads(line)
+            for entry in run["results"]:
+                if "total_seconds" in entry:
+                    totals[(entry["strategy"], entry["source"], entry["candles"])] = entry["total_seconds"]
+    return totals
+
+
+def write_history(run: dict[str, Any], history_dir: Path) -> None:
+    history_dir.mkdir(parents=True, exist_ok=True)
+    with (history_dir / "strategy_bench.jsonl").open("a") as fh:
+        fh.write(json.dumps(run) + "\n")
+
+    csv_path = history_dir / "strategy_bench.csv"
+    new_file = not csv_path.is_file()
+    with csv_path.open("a", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+        base = {"run_id": run["run_id"], "timestamp": run["timestamp"], "commit": run["commit"]}
+        for entry in run["results"]:
+            if "error" in entry:
+                continue
+            row = {**base, "strategy": entry["strategy"], "source": entry["source"], "candles": entry["candles"]}
+            for phase, values in entry["phases"].items():
+                writer.writerow({**row, "phase": phase, "seconds": values["seconds"], "peak_mb": values["peak_mb"]})
+            for name, values in entry["indicators"].items():
+                writer.writerow({**row, "phase": "indicator", "name": name, **values})
+
+
+def print_report(run: dict[str, Any], previous: dict[tuple, float], top: int = 10) -> None:
+    results = [entry for entry in run["results"] if "error" not in entry]
+    print(f"\n{'Strategy':<36} {'Candles':>8} {'Total ms':>10} {'Peak MB':>8} {'vs last':>8}")
+    for entry in sorted(results, key=lambda entry: -entry["total_seconds"]):
+        peak = max(values["peak_mb"] for values in entry["phases"].values())
+        last = previous.get((entry["strategy"], entry["source"], entry["candles"]))
+        change = f"{(entry['total_seconds'] / last - 1) * 100:+.0f}%" if last else ""
+        print(
+            f"{entry['strategy']:<36} {entry['candles']:>8} {entry['total_seconds'] * 1e3:>10.1f} "
+            f"{peak:>8.1f} {change:>8}"
+        )
+
+    totals: dict[str, list] = defaultdict(lambda: [0, 0.0])
+    for entry in results:
+        for name, values in entry["indicators"].items():
+            totals[name][0] += values["calls"]
+            totals[name][1] += values["seconds"]
+    if totals:
+        print(f"\n{'Heaviest indicators':<36} {'Calls':>8} {'Total ms':>10}")
+        for name, (calls, seconds) in sorted(totals.items(), key=lambda item: -item[1][1])[:top]:
+            print(f"{name:<36} {calls:>8} {seconds * 1e3:>10.1f}")
+
+    for entry in run["results"]:
+        if "error" in entry:
+            print(f"\n{entry['strategy']} ({entry['file']}): {entry['error']}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark strategy populate_* methods.")
+    parser.add_argument("paths", nargs="*", type=Path, help="Strategy files or directories.")
+    parser.add_argument("--pair", default="BTC/USDT")
+    parser.add_argument("--datadir", type=Path, default=DATA_DIR)
+    parser.add_argument("--synthetic", type=int, nargs="+", metavar="CANDLES",
+                        help="Use synthetic series of these lengths instead of the bundled data.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", nargs="+", metavar="STRATEGY", help="Only these strategy classes.")
+    parser.add_argument("--history-dir", type=Path, default=HISTORY_DIR)
+    parser.add_argument("--no-history", action="store_true", help="Do not append to the history files.")
+    args = parser.parse_args(argv)
+
+    profiler = IndicatorProfiler()
+    patched = profiler.install()
+    print(f"Instrumented: {', '.join(patched) or 'nothing'}")
+
+    run = {
+        "run_id": datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S"),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "pair": args.pair,
+        "results": [],
+    }
+    for path in iter_strategy_files(args.paths or None):
+        try:
+            classes = strategy_classes(load_module(path))
+        except Exception as e:
+            run["results"].append({"strategy": path.stem, "file": str(path), "error": f"import: {e!r}"})
+            continue
+        for strategy_cls in classes:
+            if args.filter and strategy_cls.__name__ not in args.filter:
+                continue
+            timeframe = getattr(strategy_cls, "timeframe", "5m")
+            if args.synthetic:
+                series = [(f"synthetic-{timeframe}", synthetic_candles(n, timeframe)) for n in args.synthetic]
+            else:
+                frame = load_candles(args.pair, timeframe, args.datadir)
+                series = [(f"{args.pair} {timeframe}", frame)] if frame is not None else []
+            if not series:
+                run["results"].append({
+                    "strategy": strategy_cls.__name__, "file": str(path),
+                    "error": f"no {timeframe} data for {args.pair} in {args.datadir}",
+                })
+            for source, frame in series:
+                entry = {"strategy": strategy_cls.__name__, "file": str(path), "source": source,
+                         "candles": len(frame)}
+                try:
+                    entry.update(bench_strategy(path, strategy_cls.__name__, frame, args.pair, profiler,
+                                                args.repeat))
+                except Exception as e:
+                    entry["error"] = repr(e)
+                run["results"].append(entry)
+                print(f"{strategy_cls.__name__} [{source}, {len(frame)} candles] done", file=sys.stderr)
+
+    history_file = args.history_dir / "strategy_bench.jsonl"
+    print_report(run, _previous_totals(history_file))
+    if not args.no_history:
+        write_history(run, args.history_dir)
+
+
+if __name__ == "__main__":
+    main()
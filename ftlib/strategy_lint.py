@@ -0,0 +1,213 @@
+"""
+Static performance linter for strategy files.
+
+Walks the AST of a strategy and flags patterns known to be slow on full candle
+histories: row iteration (``iterrows``, ``range(len(df))`` loops with ``.iat`` / ``.loc``),
+frame copies or concats inside loops, nested row loops, ``print`` in ``populate_*``
+and per-iteration column inserts. Each finding carries a line number and a cost class;
+the verdict of a file is its worst finding.
+
+Nothing is imported or executed, so it is safe to run on untrusted uploads.
+"""
+import ast
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+# Cost classes, cheapest first. The verdict of a file is the worst class found.
+COST_CLASSES = ("ok", "moderate", "heavy", "quadratic")
+
+POPULATE_METHODS = {
+    "populate_indicators", "populate_entry_trend", "populate_exit_trend",
+    "populate_buy_trend", "populate_sell_trend",
+}
+
+# Methods called once per candle / trade by freqtrade - slow code here multiplies quickly.
+CALLBACKS = {
+    "custom_stoploss", "custom_exit", "custom_stake_amount", "adjust_trade_position",
+    "confirm_trade_entry", "confirm_trade_exit", "custom_entry_price", "custom_exit_price",
+}
+
+ROW_ITERATORS = {"iterrows", "itertuples", "iteritems"}
+SCALAR_INDEXERS = {"iat", "at", "loc", "iloc"}
+# list.append / str.join share names with the DataFrame methods, so they are not flagged.
+FRAME_COPIES = {"copy", "concat", "merge"}
+
+
+@dataclass
+class Finding:
+    rule: str
+    line: int
+    cost: str
+    message: str
+    function: Optional[str] = None
+
+
+@dataclass
+class LintReport:
+    path: str
+    findings: list[Finding] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def verdict(self) -> str:
+        if self.error:
+            return "error"
+        worst = max((COST_CLASSES.index(f.cost) for f in self.findings), default=0)
+        return COST_CLASSES[worst]
+
+    def passes(self, max_cost: str = "heavy") -> bool:
+        """
+        True if no finding is worse than ``max_cost``.
+        """
+        return self.verdict != "error" and COST_CLASSES.index(self.verdict) <= COST_CLASSES.index(max_cost)
+
+    def to_dict(self, max_cost: str = "heavy") -> dict:
+        return {
+            "path": self.path,
+            "verdict": self.verdict,
+            "ok": self.passes(max_cost),
+            "error": self.error,
+            "findings": [asdict(f) for f in sorted(self.findings, key=lambda f: f.line)],
+        }
+
+
+def _attr_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _is_row_loop(loop: ast.For) -> bool:
+    """
+    ``for ... in df.iterrows()`` / ``range(len(df))`` / ``range(n, len(df))`` / ``df.index``.
+    """
+    it = loop.iter
+    if isinstance(it, ast.Call):
+        name = _attr_name(it)
+        if name in ROW_ITERATORS and isinstance(it.func, ast.Attribute):
+            return True
+        if name == "range":
+            return any(
+                isinstance(sub, ast.Call) and _attr_name(sub) == "len"
+                for arg in it.args for sub in ast.walk(arg)
+            )
+    return isinstance(it, ast.Attribute) and it.attr == "index"
+
+
+class _Visitor(ast.NodeVisitor):
+
+    def __init__(self, report: LintReport):
+        self.report = report
+        self.function: Optional[str] = None
+        # Stack of enclosing loops: True for loops over candles.
+        self.loops: list[bool] = []
+
+    def add(self, rule: str, node: ast.AST, cost: str, message: str) -> None:
+        line = getattr(node, "lineno", 0)
+        if any(f.rule == rule and f.line == line for f in self.report.findings):
+            return
+        self.report.findings.append(Finding(rule, line, cost, message, self.function))
+
+    @property
+    def in_row_loop(self) -> bool:
+        return any(self.loops)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        outer_function, outer_loops = self.function, self.loops
+        self.function, self.loops = node.name, []
+        self.generic_visit(node)
+        self.function, self.loops = outer_function, outer_loops
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _visit_loop(self, node: ast.AST, row_loop: bool) -> None:
+        if row_loop and self.in_row_loop:
+            self.add("nested-row-loop", node, "quadratic",
+                     "Loop over candles nested in another loop over candles is O(n^2).")
+        elif row_loop and self.function in CALLBACKS:
+            self.add("row-loop-in-callback", node, "heavy",
+                     f"Loop over candles in {self.function}, which runs per trade / per candle.")
+        self.loops.append(row_loop)
+        self.generic_visit(node)
+        self.loops.pop()
+
+    def visit_For(self, node: ast.For) -> None:
+        row_loop = _is_row_loop(node)
+        if row_loop and _attr_name(node.iter) in ROW_ITERATORS:
+            self.add("iterrows", node, "heavy",
+                     f"DataFrame.{_attr_name(node.iter)}() builds a Series per row; use vectorized "
+                     "column operations or a NumPy loop.")
+        self._visit_loop(node, row_loop)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop(node, False)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        if isinstance(node.value, ast.Attribute) and node.value.attr in SCALAR_INDEXERS and self.in_row_loop:
+            self.add("scalar-indexing-in-loop", node, "heavy",
+                     f"Per-row .{node.value.attr}[] access inside a loop over candles; work on "
+                     ".to_numpy() arrays and assign the column once.")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _attr_name(node)
+        if name == "print" and isinstance(node.func, ast.Name) and (
+            self.function in POPULATE_METHODS or self.function in CALLBACKS
+        ):
+            self.add("print", node, "moderate",
+                     f"print() in {self.function} writes to stdout on every analysis of every pair; "
+                     "use logger.debug or remove it.")
+        elif name in FRAME_COPIES and isinstance(node.func, ast.Attribute) and self.loops:
+            cost = "quadratic" if self.in_row_loop else "moderate"
+            self.add(f"{name}-in-loop", node, cost,
+                     f".{name}() inside a loop copies the whole frame every iteration.")
+        elif name == "apply" and isinstance(node.func, ast.Attribute):
+            if any(kw.arg == "axis" and isinstance(kw.value, ast.Constant) and kw.value.value in (1, "columns")
+                   for kw in node.keywords):
+                self.add("apply-axis-1", node, "heavy",
+                         "DataFrame.apply(axis=1) calls Python once per row; vectorize it.")
+            elif isinstance(node.func.value, ast.Call) and _attr_name(node.func.value) == "rolling":
+                self.add("rolling-apply", node, "heavy",
+                         "rolling().apply() calls Python once per window; use a built-in rolling "
+                         "aggregation or raw=True with a NumPy function.")
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if self.loops and not self.in_row_loop and self.function in POPULATE_METHODS:
+            for target in node.targets:
+                if isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) \
+                        and not isinstance(target.slice, ast.Tuple):
+                    self.add("column-insert-in-loop", node, "moderate",
+                             "Inserting a column per loop iteration fragments the frame; collect "
+                             "the columns in a dict and pd.concat them once.")
+        self.generic_visit(node)
+
+
+def lint_source(source: str, path: str = "<string>") -> LintReport:
+    report = LintReport(path)
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        report.error = f"SyntaxError: {e.msg} (line {e.lineno})"
+        return report
+    _Visitor(report).visit(tree)
+    return report
+
+
+def lint_file(path: Path) -> LintReport:
+    path = Path(path)
+    try:
+        source = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        report = LintReport(str(path))
+        report.error = str(e)
+        return report
+    return lint_source(source, str(path))
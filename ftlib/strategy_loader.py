@@ -0,0 +1,121 @@
+"""
+Find and load strategy classes from the strategy directories, outside of a running bot.
+
+Modules are imported under a name derived from their path, so files with the same
+name in different directories (``SampleEmaRsiStrategy.py`` is in several) do not clash.
+"""
+import hashlib
+import importlib.util
+import inspect
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterable, Optional
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Strategy libraries shipped with the backend; instance copies under data/ft_user_data are not scanned.
+STRATEGY_DIRS = (ROOT / "user_data" / "strategies", ROOT / "freqtrade_strategies")
+
+DATA_DIR = ROOT / "user_data" / "data" / "binance"
+
+
+def iter_strategy_files(dirs: Optional[Iterable[Path]] = None) -> list[Path]:
+    """
+    All python files below the given directories (recursively), sorted.
+    """
+    files = []
+    for directory in dirs or STRATEGY_DIRS:
+        directory = Path(directory)
+        if directory.is_file():
+            files.append(directory)
+            continue
+        files.extend(
+            path for path in directory.rglob("*.py")
+            if "__pycache__" not in path.parts and path.name != "__init__.py"
+        )
+    return sorted(files)
+
+
+def module_name(path: Path) -> str:
+    digest = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    return f"ftlib_strategy_{Path(path).stem}_{digest}"
+
+
+def load_module(path: Path) -> ModuleType:
+    """
+    Import a strategy file by path. Raises whatever the module raises on import.
+    """
+    name = module_name(path)
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def strategy_classes(module: ModuleType) -> list[type]:
+    """
+    IStrategy subclasses defined in ``module`` (imported base classes are skipped).
+    """
+    from freqtrade.strategy import IStrategy
+
+    return [
+        obj for _, obj in inspect.getmembers(module, inspect.isclass)
+        if issubclass(obj, IStrategy) and obj is not IStrategy and obj.__module__ == module.__name__
+    ]
+
+
+def minimal_config(strategy_cls: type, pair: str = "BTC/USDT") -> dict[str, Any]:
+    """
+    Smallest config a strategy can be instantiated with outside of a bot.
+    """
+    stake_currency = pair.split("/")[1] if "/" in pair else "USDT"
+    return {
+        "strategy": strategy_cls.__name__,
+        "timeframe": getattr(strategy_cls, "timeframe", "5m"),
+        "stake_currency": stake_currency,
+        "stake_amount": "unlimited",
+        "max_open_trades": 1,
+        "dry_run": True,
+        "trading_mode": "spot",
+        "margin_mode": "",
+        "exchange": {"name": "binance", "pair_whitelist": [pair], "pair_blacklist": []},
+        "pairlists": [{"method": "StaticPairList"}],
+    }
+
+
+def instantiate(strategy_cls: type, pair: str = "BTC/USDT"):
+    strategy = strategy_cls(minimal_config(strategy_cls, pair))
+    strategy.dp = None
+    strategy.wallets = None
+    return strategy
+
+
+class StaticWhitelist:
+    """
+    Minimal data provider for strategies that ask for the whitelist (DevilStra, GodStraNew).
+    """
+
+    def __init__(self, pair: str):
+        self._pairs = [pair]
+
+    def current_whitelist(self) -> list[str]:
+        return list(self._pairs)
+
+
+def load_strategy(path: Path, class_name: str, pair: str = "BTC/USDT"):
+    """
+    Instantiate strategy ``class_name`` from ``path``, with a single-pair whitelist.
+    """
+    strategy_cls = next(cls for cls in strategy_classes(load_module(Path(path))) if cls.__name__ == class_name)
+    strategy = instantiate(strategy_cls, pair)
+    strategy.dp = StaticWhitelist(pair)
+    return strategy
@@ -0,0 +1,163 @@
+"""
+Parallel strategy import validator with import-time profiling.
+
+Every strategy file is imported in its own ``python -X importtime`` subprocess (so one
+broken or slow module cannot affect the others), its IStrategy subclasses are
+instantiated with a minimal config, and the child reports:
+
+- module load time, split into the module body itself (e.g. DevilStra's ``spell_pot``
+  or GodStraNew's gene lists built at import) and the libraries it pulled in,
+- the heaviest transitive imports, grouped by top-level package (pandas_ta, sklearn,
+  technical, ta, ...),
+- instantiation time and errors per class.
+
+freqtrade itself is imported before the measurement starts - every bot pays for it anyway.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ftlib.strategy_loader import ROOT, iter_strategy_files
+
+
+START_MARKER = "ftlib-validate: start"
+END_MARKER = "ftlib-validate: end"
+
+CHILD_TIMEOUT = 120
+
+
+def parse_importtime(lines: Iterable[str]) -> dict[str, float]:
+    """
+    Cumulative seconds per top-level package, from the ``-X importtime`` lines of the
+    imports triggered directly by the measured code (outermost nesting level only).
+    """
+    packages: dict[str, float] = defaultdict(float)
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            cumulative_us = int(cumulative)
+        except ValueError:
+            # header line
+            continue
+        if name.startswith("  "):
+            # nested - already part of an outer entry's cumulative time
+            continue
+        packages[name.strip().split(".")[0]] += cumulative_us / 1e6
+    return dict(packages)
+
+
+def _child(path: str) -> dict[str, Any]:
+    from ftlib.strategy_loader import instantiate, load_module, strategy_classes
+
+    result: dict[str, Any] = {"path": path, "classes": [], "error": None}
+    start = time.perf_counter()
+    try:
+        import freqtrade.strategy  # noqa: F401
+    except ImportError as e:
+        result["error"] = f"freqtrade not importable: {e!r}"
+        return result
+    result["baseline_seconds"] = time.perf_counter() - start
+
+    print(START_MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    try:
+        module = load_module(Path(path))
+    except BaseException as e:
+        result["error"] = f"import failed: {e!r}"
+        return result
+    finally:
+        result["load_seconds"] = time.perf_counter() - start
+        print(END_MARKER, file=sys.stderr, flush=True)
+
+    for strategy_cls in strategy_classes(module):
+        entry: dict[str, Any] = {"name": strategy_cls.__name__, "error": None}
+        start = time.perf_counter()
+        try:
+            instantiate(strategy_cls)
+        except Exception as e:
+            entry["error"] = repr(e)
+        entry["instantiate_seconds"] = time.perf_counter() - start
+        result["classes"].append(entry)
+    if not result["classes"]:
+        result["error"] = "no IStrategy subclass found"
+    return result
+
+
+def validate_file(path: Path, python: str = sys.executable) -> dict[str, Any]:
+    """
+    Import one strategy file in an isolated ``-X importtime`` subprocess.
+    """
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-m", "ftlib.strategy_validate", "--child", str(path)],
+            cwd=ROOT, capture_output=True, text=True, timeout=CHILD_TIMEOUT,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+    except subprocess.TimeoutExpired:
+        return {"path": str(path), "classes": [], "error": f"timed out after {CHILD_TIMEOUT}s"}
+
+    try:
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        tail = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+        return {"path": str(path), "classes": [], "error": f"child crashed: {tail[0]}"}
+
+    lines = proc.stderr.splitlines()
+    if START_MARKER in lines:
+        begin = lines.index(START_MARKER) + 1
+        end = lines.index(END_MARKER) if END_MARKER in lines else len(lines)
+        imports = parse_importtime(lines[begin:end])
+    else:
+        imports = {}
+    result["imports"] = dict(sorted(imports.items(), key=lambda item: -item[1]))
+    result["module_body_seconds"] = max(result.get("load_seconds", 0) - sum(imports.values()), 0)
+    result["wall_seconds"] = time.perf_counter() - start
+    return result
+
+
+def validate(paths: Optional[Iterable[Path]] = None, workers: Optional[int] = None) -> list[dict[str, Any]]:
+    """
+    Validate every strategy file below ``paths`` (default: the strategy directories) in parallel.
+    Threads are enough - each one only waits for its subprocess.
+    """
+    files = iter_strategy_files(paths)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(validate_file, files))
+
+
+def print_report(results: list[dict[str, Any]], top_imports: int = 3) -> None:
+    print(f"{'Strategy file':<48} {'Load ms':>8} {'Body ms':>8}  Heaviest imports")
+    for result in sorted(results, key=lambda result: -result.get("load_seconds", 0)):
+        name = os.path.relpath(result["path"], ROOT)
+        heaviest = ", ".join(
+            f"{package} {seconds * 1e3:.0f}ms"
+            for package, seconds in list(result.get("imports", {}).items())[:top_imports]
+        )
+        print(
+            f"{name:<48} {result.get('load_seconds', 0) * 1e3:>8.0f} "
+            f"{result.get('module_body_seconds', 0) * 1e3:>8.0f}  {heaviest}"
+        )
+
+    failures = [
+        (result["path"], result["error"]) for result in results if result["error"]
+    ] + [
+        (f"{result['path']}::{cls['name']}", cls["error"])
+        for result in results for cls in result["classes"] if cls["error"]
+    ]
+    if failures:
+        print("\nFailures:")
+        for where, error in failures:
+            print(f"  {os.path.relpath(where, ROOT)}: {error}")
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--child"]:
+    print(json.dumps(_child(sys.argv[2])))
@@ -0,0 +1,421 @@
+"""
+Incremental export of bot trades from the per-instance SQLite databases.
+
+Without Postgres every instance keeps its trades in
+``data/ft_user_data/<instanceId>/tradesv3.sqlite`` (``services/freqtrade/dbUrls.js``),
+while the API reads the Mongo ``trades`` collection. The exporter tails all instance
+databases and upserts the trades that changed since the last pass:
+
+- new trades: ``trades.id`` above the trade-id watermark,
+- trades with new orders (entries, DCA, exits): ``orders.id`` above the order-id watermark,
+- trades that were open in the previous pass - this catches fills and closes of existing
+  orders (stoploss on exchange) without scanning ``close_date``.
+
+All three are primary-key / indexed lookups; a database whose file and WAL are unchanged
+since the last pass is not opened at all. Open trades are only re-emitted when their row
+changed. Upserts are written in batches (``bulk_write`` for Mongo, one append per batch for
+JSONL); an instance's watermark is persisted once all of its batches are written, so a
+crash re-exports the changes of that instance's current pass - harmless, the upserts are
+idempotent.
+
+The exporter owns the documents of bot trades (keyed on ``botInstanceId`` and
+``tradeDetails.ftTradeId``, unique in ``models/Trade.js``) and charges their platform fee
+the way ``createTrade`` does for trades posted to the API: once a trade is closed with a
+profit, ``profitFee`` of the bot (20% if unset) is deducted from the owner's balance and
+the instance is paused when the balance drops below zero. ``feeChargedAt`` marks charged
+trades, so re-exports and trades also posted to the API are charged once.
+
+Usage:
+    python -m ftlib.trade_exporter --jsonl exports/trades.jsonl --once
+    python -m ftlib.trade_exporter --mongo-uri "$MONGO_URI" --interval 2
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ftlib.strategy_loader import ROOT
+
+
+logger = logging.getLogger(__name__)
+
+USER_DATA_BASE_DIR = Path(os.environ.get("FREQTRADE_USER_DATA_DIR") or ROOT / "data" / "ft_user_data")
+
+DEFAULT_STATE_PATH = USER_DATA_BASE_DIR / ".trade_exporter_state.json"
+
+DB_FILENAME = "tradesv3.sqlite"
+
+BATCH_SIZE = 500
+
+# SQLite limits bound parameters per statement (999 on older builds).
+MAX_SQL_PARAMS = 900
+
+# As in controllers/tradeController.js createTrade.
+FALLBACK_PROFIT_FEE = 0.20
+FEE_WALLET_THRESHOLD = 0
+
+
+@dataclass
+class Watermark:
+    trade_id: int = 0
+    order_id: int = 0
+    # Trade id -> fingerprint of the last exported row, for trades still open at that time.
+    open_trades: dict[str, str] = field(default_factory=dict)
+    # (mtime_ns, size) of the database and its WAL at the last pass.
+    file_stamp: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Watermark":
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+
+def load_state(path: Path) -> dict[str, Watermark]:
+    try:
+        data = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+    return {instance: Watermark.from_dict(mark) for instance, mark in data.items()}
+
+
+def save_state(path: Path, state: dict[str, Watermark]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({instance: mark.__dict__ for instance, mark in state.items()}, indent=1))
+    os.replace(tmp, path)
+
+
+def instance_databases(base_dir: Path = USER_DATA_BASE_DIR) -> dict[str, Path]:
+    """
+    Instance id -> trade database, for every instance directory that has one.
+    """
+    return {path.parent.name: path for path in sorted(Path(base_dir).glob(f"*/{DB_FILENAME}"))}
+
+
+def file_stamp(db_path: Path) -> list:
+    stamp = []
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            stat = path.stat()
+            stamp.append([stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            stamp.append(None)
+    return stamp
+
+
+def _chunks(values: list, size: int = MAX_SQL_PARAMS) -> Iterable[list]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _iso(value: Optional[str]) -> Optional[str]:
+    """
+    SQLite datetime text (naive UTC) to ISO 8601 with offset.
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value)).replace(tzinfo=timezone.utc).isoformat()
+
+
+def _fingerprint(row: dict, orders: list[dict]) -> str:
+    payload = json.dumps([row, orders], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()
+
+
+def trade_document(instance_id: str, row: dict, orders: list[dict]) -> dict[str, Any]:
+    """
+    Fields of the platform ``Trade`` model for one freqtrade trade row.
+    """
+    is_open = bool(row.get("is_open"))
+    gross = row.get("close_profit_abs") if not is_open else row.get("realized_profit")
+    return {
+        "botInstanceId": instance_id,
+        "status": "open" if is_open else "closed",
+        "grossProfit": float(gross or 0.0),
+        "openDate": _iso(row.get("open_date")),
+        "tradeDetails": {
+            "ftTradeId": row["id"],
+            "pair": row.get("pair"),
+            "side": "short" if row.get("is_short") else "long",
+            "entryPrice": row.get("open_rate"),
+            "exitPrice": row.get("close_rate"),
+            "amount": row.get("amount"),
+            "stakeAmount": row.get("stake_amount"),
+            "leverage": row.get("leverage"),
+            "openDate": _iso(row.get("open_date")),
+            "closeDate": _iso(row.get("close_date")),
+            "profitRatio": row.get("close_profit"),
+            "exitReason": row.get("exit_reason"),
+            "enterTag": row.get("enter_tag"),
+            "strategy": row.get("strategy"),
+            "exchange": row.get("exchange"),
+            "orders": [
+                {
+                    "orderId": order.get("order_id"),
+                    "side": order.get("ft_order_side"),
+                    "type": order.get("order_type"),
+                    "status": order.get("status"),
+                    "price": order.get("average") or order.get("price"),
+                    "amount": order.get("amount"),
+                    "filled": order.get("filled"),
+                    "cost": order.get("cost"),
+                    "orderDate": _iso(order.get("order_date")),
+                    "filledDate": _iso(order.get("order_filled_date")),
+                }
+                for order in orders
+            ],
+        },
+    }
+
+
+def read_changes(db_path: Path, mark: Watermark) -> tuple[list[tuple[dict, list[dict]]], Watermark]:
+    """
+    Trades (with their orders) changed since ``mark``, and the watermark after them.
+    """
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+    connection.row_factory = sqlite3.Row
+    try:
+        cursor = connection.cursor()
+        max_trade = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+        max_order = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM orders").fetchone()[0]
+
+        candidates = {row[0] for row in cursor.execute(
+            "SELECT id FROM trades WHERE id > ? AND id <= ?", (mark.trade_id, max_trade))}
+        candidates.update(row[0] for row in cursor.execute(
+            "SELECT DISTINCT ft_trade_id FROM orders WHERE id > ? AND id <= ?", (mark.order_id, max_order)))
+        candidates.update(int(trade_id) for trade_id in mark.open_trades)
+        candidates.update(row[0] for row in cursor.execute("SELECT id FROM trades WHERE is_open = 1"))
+
+        ids = sorted(candidates)
+        trades: dict[int, dict] = {}
+        orders: dict[int, list[dict]] = {trade_id: [] for trade_id in ids}
+        for chunk in _chunks(ids):
+            marks = ",".join("?" * len(chunk))
+            for row in cursor.execute(f"SELECT * FROM trades WHERE id IN ({marks})", chunk):
+                trades[row["id"]] = dict(row)
+            for row in cursor.execute(f"SELECT * FROM orders WHERE ft_trade_id IN ({marks}) ORDER BY id", chunk):
+                orders[row["ft_trade_id"]].append(dict(row))
+    finally:
+        connection.close()
+
+    changed = []
+    open_trades = {}
+    for trade_id, row in trades.items():
+        fingerprint = _fingerprint(row, orders[trade_id])
+        if row.get("is_open"):
+            open_trades[str(trade_id)] = fingerprint
+        if mark.open_trades.get(str(trade_id)) != fingerprint:
+            changed.append((row, orders[trade_id]))
+    new_mark = Watermark(trade_id=max_trade, order_id=max_order, open_trades=open_trades,
+                         file_stamp=mark.file_stamp)
+    return changed, new_mark
+
+
+class JsonlSink:
+    """
+    Local stand-in for the platform store: one ``{"filter", "document"}`` line per upsert.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, documents: list[dict[str, Any]]) -> None:
+        lines = [
+            json.dumps({"filter": {"botInstanceId": doc["botInstanceId"],
+                                   "tradeDetails.ftTradeId": doc["tradeDetails"]["ftTradeId"]},
+                        "document": doc}, default=str)
+            for doc in documents
+        ]
+        with self.path.open("a") as handle:
+            handle.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class MongoSink:
+    """
+    Upserts into the API's ``trades`` collection with one unordered ``bulk_write`` per batch.
+    """
+
+    def __init__(self, uri: str, database: Optional[str] = None, collection: str = "trades"):
+        try:
+            import pymongo
+        except ImportError as e:
+            raise RuntimeError("pymongo is required for --mongo-uri (pip install pymongo)") from e
+        from bson import ObjectId
+
+        self._pymongo = pymongo
+        self._object_id = ObjectId
+        self.client = pymongo.MongoClient(uri)
+        self.db = self.client[database] if database else self.client.get_default_database()
+        self.collection = self.db[collection]
+
+    def _update(self, doc: dict[str, Any]):
+        instance_id = self._object_id(doc["botInstanceId"])
+        opened = datetime.fromisoformat(doc["openDate"]) if doc["openDate"] else None
+        # Pipeline update: keeps the charged platformFee (charge_fees) and derives netProfit / profit from it.
+        pipeline = [{"$set": {
+            "botInstanceId": instance_id,
+            "tradeDetails": {"$literal": doc["tradeDetails"]},
+            "status": doc["status"],
+            "grossProfit": doc["grossProfit"],
+            "platformFee": {"$ifNull": ["$platformFee", 0]},
+            "createdAt": {"$ifNull": ["$createdAt", opened or "$$NOW"]},
+            "updatedAt": "$$NOW",
+        }}, {"$set": {
+            "netProfit": {"$subtract": ["$grossProfit", "$platformFee"]},
+            "profit": {"$subtract": ["$grossProfit", "$platformFee"]},
+        }}]
+        return self._pymongo.UpdateOne(
+            {"botInstanceId": instance_id, "tradeDetails.ftTradeId": doc["tradeDetails"]["ftTradeId"]},
+            pipeline, upsert=True,
+        )
+
+    def _profit_fee(self, instance_id) -> tuple[Optional[Any], float]:
+        """
+        Owner and fee ratio of an instance, as ``createTrade`` reads them.
+        """
+        instance = self.db["botinstances"].find_one({"_id": instance_id}, {"userId": 1, "botId": 1})
+        if instance is None:
+            return None, 0.0
+        bot = self.db["bots"].find_one({"_id": instance.get("botId")}, {"profitFee": 1})
+        return instance.get("userId"), (bot or {}).get("profitFee") or FALLBACK_PROFIT_FEE
+
+    def charge_fees(self, documents: list[dict[str, Any]]) -> int:
+        """
+        Charge the platform fee of the profitable closed trades in ``documents`` not charged
+        yet. Returns the number charged.
+        """
+        charged = 0
+        fees: dict[str, tuple] = {}
+        for doc in documents:
+            if doc["status"] != "closed" or doc["grossProfit"] <= 0:
+                continue
+            if doc["botInstanceId"] not in fees:
+                fees[doc["botInstanceId"]] = self._profit_fee(self._object_id(doc["botInstanceId"]))
+            user_id, ratio = fees[doc["botInstanceId"]]
+            if user_id is None:
+                logger.error(f"Instance {doc['botInstanceId']} not found, trade {doc['tradeDetails']['ftTradeId']}"
+                             " not charged.")
+                continue
+            instance_id = self._object_id(doc["botInstanceId"])
+            fee = doc["grossProfit"] * ratio
+            claimed = self.collection.update_one(
+                {"botInstanceId": instance_id, "tradeDetails.ftTradeId": doc["tradeDetails"]["ftTradeId"],
+                 "status": "closed", "feeChargedAt": None},
+                [{"$set": {
+                    "platformFee": fee,
+                    "netProfit": {"$subtract": ["$grossProfit", fee]},
+                    "profit": {"$subtract": ["$grossProfit", fee]},
+                    "feeChargedAt": "$$NOW",
+                }}],
+            )
+            if not claimed.modified_count:
+                continue
+            user = self.db["users"].find_one_and_update(
+                {"_id": user_id}, {"$inc": {"accountBalance": -fee}},
+                projection={"accountBalance": 1}, return_document=self._pymongo.ReturnDocument.AFTER,
+            )
+            if user is not None and user.get("accountBalance", 0) < FEE_WALLET_THRESHOLD:
+                self.db["botinstances"].update_one(
+                    {"_id": instance_id}, {"$set": {"status": "PAUSED", "isActive": False}})
+                logger.warning(f"User {user_id} balance ({user['accountBalance']}) below threshold."
+                               f" Pausing bot instance {doc['botInstanceId']}.")
+            charged += 1
+        return charged
+
+    def write(self, documents: list[dict[str, Any]]) -> None:
+        self.collection.bulk_write([self._update(doc) for doc in documents], ordered=False)
+        self.charge_fees(documents)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class TradeExporter:
+
+    def __init__(self, sink, state_path: Path = DEFAULT_STATE_PATH, base_dir: Path = USER_DATA_BASE_DIR,
+                 batch_size: int = BATCH_SIZE):
+        self.sink = sink
+        self.state_path = Path(state_path)
+        self.base_dir = Path(base_dir)
+        self.batch_size = batch_size
+        self.state = load_state(self.state_path)
+
+    def export_instance(self, instance_id: str, db_path: Path) -> int:
+        mark = self.state.get(instance_id, Watermark())
+        stamp = file_stamp(db_path)
+        if stamp == mark.file_stamp:
+            return 0
+        changed, new_mark = read_changes(db_path, mark)
+        new_mark.file_stamp = stamp
+        documents = [trade_document(instance_id, row, orders) for row, orders in changed]
+        for start in range(0, len(documents), self.batch_size):
+            self.sink.write(documents[start:start + self.batch_size])
+        self.state[instance_id] = new_mark
+        save_state(self.state_path, self.state)
+        return len(documents)
+
+    def run_once(self) -> dict[str, int]:
+        exported = {}
+        for instance_id, db_path in instance_databases(self.base_dir).items():
+            try:
+                count = self.export_instance(instance_id, db_path)
+            except sqlite3.Error as e:
+                # Locked or mid-migration database: retried on the next pass from the old watermark.
+                logger.warning(f"Instance {instance_id}: could not read {db_path}: {e}")
+                continue
+            if count:
+                exported[instance_id] = count
+        return exported
+
+    def run(self, interval: float = 2.0) -> None:
+        while True:
+            start = time.monotonic()
+            exported = self.run_once()
+            if exported:
+                logger.info(f"Exported {sum(exported.values())} trades from {len(exported)} instances.")
+            time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export changed trades from instance SQLite databases.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--jsonl", type=Path, help="Append upserts to this JSONL file.")
+    target.add_argument("--mongo-uri", help="Upsert into the trades collection of this MongoDB.")
+    parser.add_argument("--database", help="Mongo database (default: the one in the URI).")
+    parser.add_argument("--base-dir", type=Path, default=USER_DATA_BASE_DIR)
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_PATH)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between passes.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    sink = JsonlSink(args.jsonl) if args.jsonl else MongoSink(args.mongo_uri, args.database)
+    exporter = TradeExporter(sink, args.state, args.base_dir, args.batch_size)
+    try:
+        if args.once:
+            exported = exporter.run_once()
+            print(json.dumps(exported))
+        else:
+            exporter.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Cross-instance queries over the per-instance ``tradesv3.sqlite`` databases.
+
+``FederatedTrades`` runs one SQL statement against every instance database in a thread
+pool (SQLite releases the GIL while it executes) and concatenates the results into one
+Arrow table with an ``instance_id`` column. Connections are opened read-only
+(``mode=ro``, ``query_only``), so a running bot's WAL writer is never blocked, and kept in
+a bounded LRU pool together with each database's ``trades`` / ``orders`` columns.
+
+Aggregations are pushed down: each database returns partial sums which are combined once
+(``win_rates``), so only a few rows per instance cross the thread boundary:
+
+    trades = FederatedTrades()
+    trades.open_trades("SOL/USDT").to_pandas()
+    trades.win_rates(since=datetime.now(timezone.utc) - timedelta(days=7))
+
+``write_snapshot`` stores the union of all ``trades`` tables as one Parquet file for tools
+that prefer a consolidated columnar copy.
+
+Usage:
+    python -m ftlib.trade_query --open-trades SOL/USDT
+    python -m ftlib.trade_query --win-rates --days 7
+    python -m ftlib.trade_query "SELECT pair, COUNT(*) AS n FROM trades GROUP BY pair"
+    python -m ftlib.trade_query --snapshot exports/trades.parquet
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ftlib.trade_exporter import USER_DATA_BASE_DIR, instance_databases
+
+
+MAX_OPEN_CONNECTIONS = 128
+
+DEFAULT_WORKERS = 16
+
+# Seconds between re-listing the instance directories.
+DISCOVERY_TTL = 30.0
+
+# Errors of one database, not of the statement: the database is skipped.
+SKIPPED_ERRORS = ("database is locked", "database table is locked", "unable to open database", "no such table")
+
+
+class QueryError(Exception):
+    """
+    The statement failed on every database that could be queried.
+    """
+
+    def __init__(self, errors: dict[str, str]):
+        self.errors = errors
+        message = next(iter(errors.values()))
+        super().__init__(f"query failed on {len(errors)} databases: {message}")
+
+
+def _skipped(error: Exception) -> bool:
+    return isinstance(error, OSError) or (
+        isinstance(error, sqlite3.OperationalError) and any(text in str(error) for text in SKIPPED_ERRORS))
+
+
+class _PooledConnection:
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.inode = path.stat().st_ino
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5, check_same_thread=False)
+        self.connection.execute("PRAGMA query_only = 1")
+        self.lock = threading.Lock()
+        self.users = 0
+        self.retired = False
+        self.schema_version: Optional[int] = None
+        self.columns: dict[str, list[str]] = {}
+
+    def table_columns(self, table: str) -> list[str]:
+        """
+        Columns of ``table``, cached until the database's schema version changes.
+        """
+        version = self.connection.execute("PRAGMA schema_version").fetchone()[0]
+        if version != self.schema_version:
+            self.schema_version, self.columns = version, {}
+        if table not in self.columns:
+            self.columns[table] = [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+        return self.columns[table]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ConnectionPool:
+    """
+    At most ``max_open`` read-only connections, least recently used closed first (an
+    evicted connection still in use is closed by its last user). A connection serves one
+    thread at a time; a replaced database file is reopened.
+    """
+
+    def __init__(self, max_open: int = MAX_OPEN_CONNECTIONS):
+        self.max_open = max_open
+        self._connections: "OrderedDict[Path, _PooledConnection]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, path: Path) -> _PooledConnection:
+        with self._lock:
+            pooled = self._connections.pop(path, None)
+            if pooled is not None and pooled.inode != path.stat().st_ino:
+                self._retire(pooled)
+                pooled = None
+            if pooled is None:
+                pooled = _PooledConnection(path)
+            pooled.users += 1
+            self._connections[path] = pooled
+            while len(self._connections) > self.max_open:
+                self._retire(self._connections.popitem(last=False)[1])
+        pooled.lock.acquire()
+        return pooled
+
+    def release(self, pooled: _PooledConnection) -> None:
+        pooled.lock.release()
+        with self._lock:
+            pooled.users -= 1
+            if pooled.retired and not pooled.users:
+                pooled.close()
+
+    def _retire(self, pooled: _PooledConnection) -> None:
+        pooled.retired = True
+        if not pooled.users:
+            pooled.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for pooled in self._connections.values():
+                self._retire(pooled)
+            self._connections.clear()
+
+
+def _to_table(columns: list[str], rows: list[tuple], instance_id: str) -> pa.Table:
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = {name: pa.array(column) for name, column in zip(columns, values)}
+    arrays["instance_id"] = pa.array([instance_id] * len(rows), pa.string())
+    return pa.table(arrays)
+
+
+class FederatedTrades:
+
+    def __init__(self, base_dir: Path = USER_DATA_BASE_DIR, workers: int = DEFAULT_WORKERS,
+                 pool: Optional[ConnectionPool] = None):
+        self.base_dir = Path(base_dir)
+        self.pool = pool or ConnectionPool()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trade-query")
+        self._databases: dict[str, Path] = {}
+        self._listed_at = 0.0
+        # Instance id -> error of the databases the last query failed on (besides skipped ones).
+        self.errors: dict[str, str] = {}
+
+    def databases(self) -> dict[str, Path]:
+        if time.monotonic() - self._listed_at > DISCOVERY_TTL:
+            self._databases = instance_databases(self.base_dir)
+            self._listed_at = time.monotonic()
+        return self._databases
+
+    def _run(self, instance_id: str, path: Path, sql: str, params: Sequence[Any],
+             require: Sequence[str]) -> tuple[Optional[pa.Table], Optional[Exception]]:
+        """
+        The instance's result, or the error it failed with (None for skipped databases).
+        """
+        try:
+            pooled = self.pool.acquire(path)
+        except (OSError, sqlite3.Error) as e:
+            return None, None if _skipped(e) else e
+        try:
+            if any(not pooled.table_columns(table) for table in require):
+                return None, None  # Not initialised yet by freqtrade
+            cursor = pooled.connection.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            return _to_table(columns, cursor.fetchall(), instance_id), None
+        except sqlite3.Error as e:
+            return None, None if _skipped(e) else e
+        finally:
+            self.pool.release(pooled)
+
+    def query(self, sql: str, params: Sequence[Any] = (), instances: Optional[Sequence[str]] = None,
+              require: Sequence[str] = ("trades",)) -> pa.Table:
+        """
+        ``sql`` run on every instance database (or ``instances``), results concatenated.
+        Databases that are locked, missing or missing a table (``require``-d or used by
+        ``sql``) are skipped. Other errors are kept in ``errors``; ``QueryError`` when no
+        database returned a result.
+        """
+        databases = self.databases()
+        if instances is not None:
+            databases = {instance: databases[instance] for instance in instances if instance in databases}
+        futures = {instance: self.executor.submit(self._run, instance, path, sql, params, require)
+                   for instance, path in databases.items()}
+        tables, self.errors = [], {}
+        for instance, future in futures.items():
+            table, error = future.result()
+            if table is not None:
+                tables.append(table)
+            elif error is not None:
+                self.errors[instance] = str(error)
+        if self.errors and not tables:
+            raise QueryError(self.errors)
+        if not tables:
+            return pa.table({"instance_id": pa.array([], pa.string())})
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def open_trades(self, pair: Optional[str] = None) -> pa.Table:
+        sql = ("SELECT id, pair, is_short, open_date, open_rate, amount, stake_amount, leverage, "
+               "strategy, enter_tag FROM trades WHERE is_open = 1")
+        if pair:
+            return self.query(sql + " AND pair = ?", (pair,))
+        return self.query(sql)
+
+    def win_rates(self, since: Optional[datetime] = None, by: str = "strategy") -> pa.Table:
+        """
+        Closed trades, wins and profit per ``by`` column ("strategy", "pair", ...) over all
+        instances, from per-database partial aggregates.
+        """
+        if by not in ("strategy", "pair", "exit_reason", "enter_tag", "timeframe"):
+            raise ValueError(f"cannot group trades by {by!r}")
+        since = (since or datetime.fromtimestamp(0, timezone.utc)).astimezone(timezone.utc)
+        partial = self.query(
+            f"SELECT {by}, COUNT(*) AS trades, SUM(close_profit_abs > 0) AS wins, "
+            f"SUM(close_profit_abs) AS profit_abs FROM trades "
+            f"WHERE is_open = 0 AND close_date >= ? GROUP BY {by}",
+            (since.strftime("%Y-%m-%d %H:%M:%S"),),
+        )
+        if partial.num_rows == 0:
+            return pa.table({by: [], "trades": [], "wins": [], "profit_abs": [], "win_rate": []})
+        totals = partial.group_by(by).aggregate([("trades", "sum"), ("wins", "sum"), ("profit_abs", "sum")])
+        totals = totals.rename_columns([by if name == by else name.removesuffix("_sum") for name in totals.column_names])
+        win_rate = pc.divide(pc.cast(totals["wins"], pa.float64()), pc.cast(totals["trades"], pa.float64()))
+        return totals.append_column("win_rate", win_rate).sort_by([("profit_abs", "descending")])
+
+    def write_snapshot(self, path: Path) -> int:
+        """
+        Union of all ``trades`` tables as one Parquet file (written atomically). Returns rows.
+        """
+        table = self.query("SELECT * FROM trades")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp)
+        tmp.replace(path)
+        return table.num_rows
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.pool.close()
+
+
+def _print_errors(errors: dict[str, str]) -> None:
+    for instance, error in errors.items():
+        print(f"{instance}: {error}", file=sys.stderr)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the trade databases of all bot instances.")
+    parser.add_argument("sql", nargs="?", help="SQL to run on every instance database.")
+    parser.add_argument("--open-trades", nargs="?", const="", metavar="PAIR", help="Open trades (optionally of PAIR).")
+    parser.add_argument("--win-rates", action="store_true", help="Win rate and profit per strategy.")
+    parser.add_argument("--by", default="strategy", help="Grouping column for --win-rates.")
+    parser.add_argument("--days", type=float, help="Only trades closed in the last N days (--win-rates).")
+    parser.add_argument("--snapshot", type=Path, help="Write all trades to this Parquet file.")
+    parser.add_argument("--base-dir", type=Path, default=USER_DATA_BASE_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--csv", action="store_true", help="CSV output instead of a table.")
+    args = parser.parse_args(argv)
+
+    trades = FederatedTrades(args.base_dir, args.workers)
+    start = time.perf_counter()
+    try:
+        if args.snapshot:
+            rows = trades.write_snapshot(args.snapshot)
+            _print_errors(trades.errors)
+            print(f"{rows} trades written to {args.snapshot}", file=sys.stderr)
+            return 1 if trades.errors else 0
+        if args.win_rates:
+            since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+            table = trades.win_rates(since, args.by)
+        elif args.open_trades is not None:
+            table = trades.open_trades(args.open_trades or None)
+        elif args.sql:
+            table = trades.query(args.sql)
+        else:
+            parser.error("give SQL, --open-trades, --win-rates or --snapshot")
+    except QueryError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        trades.close()
+
+    frame = table.to_pandas()
+    if args.csv:
+        frame.to_csv(sys.stdout, index=False)
+    else:
+        print(frame.to_string(index=False))
+    _print_errors(trades.errors)
+    print(f"{table.num_rows} rows from {len(trades.databases())} databases in "
+          f"{time.perf_counter() - start:.3f}s", file=sys.stderr)
+    return 1 if trades.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,11 +8,18 @@ const BotLogSchema = new mongoose.Schema({
   },
   type: {
     type: String,
-    enum: ["start", "stop", "error", "performance"],
+    enum: ["start", "stop", "error", "performance", "log"],
     required: true,
   },
   message: { type: String },
   timestamp: { type: Date, default: Date.now },
+  // Set by the log shipper (ftlib/log_shipper.py) for lines of the freqtrade log
+  level: { type: String },
+  source: { type: String }, // Python logger name, or "stdout"
+  count: { type: Number, default: 1 }, // Coalesced repeats (count > 1: timestamp..lastTimestamp)
+  lastTimestamp: { type: Date },
 });
 
+BotLogSchema.index({ botInstanceId: 1, timestamp: -1 });
+
 module.exports = mongoose.model("BotLog", BotLogSchema);
@@ -0,0 +1,29 @@
+const mongoose = require("mongoose");
+
+// Hourly / daily / monthly PnL buckets per instance and per user, maintained by
+// ftlib/pnl_rollups.py from closed trades (bucketed by Trade.createdAt).
+// _id is "<scope>:<ownerId>:<granularity>:<YYYY-MM-DDTHH>".
+const PnlRollupSchema = new mongoose.Schema(
+  {
+    _id: { type: String },
+    scope: { type: String, enum: ["instance", "user"], required: true },
+    ownerId: { type: String, required: true },
+    granularity: {
+      type: String,
+      enum: ["hourly", "daily", "monthly"],
+      required: true,
+    },
+    bucket: { type: Date, required: true },
+    profit: { type: Number, default: 0 },
+    grossProfit: { type: Number, default: 0 },
+    fees: { type: Number, default: 0 },
+    trades: { type: Number, default: 0 },
+    wins: { type: Number, default: 0 },
+    losses: { type: Number, default: 0 },
+  },
+  { collection: "pnlrollups", versionKey: false }
+);
+
+PnlRollupSchema.index({ scope: 1, ownerId: 1, granularity: 1, bucket: 1 });
+
+module.exports = mongoose.model("PnlRollup", PnlRollupSchema);
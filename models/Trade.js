@@ -17,11 +17,20 @@ const TradeSchema = new mongoose.Schema(
       enum: ["open", "closed", "cancelled"],
       default: "open",
     },
+    // When the platform fee was charged (createTrade, or ftlib/trade_exporter.py on close)
+    feeChargedAt: { type: Date },
   },
   { timestamps: true }
 );
 
 // 🔹 Index for performance
 TradeSchema.index({ botInstanceId: 1, createdAt: -1 });
+// One document per freqtrade trade: upsert key of ftlib/trade_exporter.py
+TradeSchema.index(
+  { botInstanceId: 1, "tradeDetails.ftTradeId": 1 },
+  { unique: true, partialFilterExpression: { "tradeDetails.ftTradeId": { $exists: true } } }
+);
+// Change feed of ftlib/pnl_rollups.py (watermark on updatedAt, _id)
+TradeSchema.index({ updatedAt: 1, _id: 1 });
 
 module.exports = mongoose.model("Trade", TradeSchema);
@@ -6,4 +6,8 @@ const authMiddleware = require('../middleware/authMiddleware');
 // Route to start a backtest
 router.post('/start', authMiddleware, backtestController.startBacktest);
 
+// Status / result, and a stream of progress events until the backtest finishes
+router.get('/:backtestId', authMiddleware, backtestController.getBacktestStatus);
+router.get('/:backtestId/events', authMiddleware, backtestController.streamBacktestEvents);
+
 module.exports = router;
\ No newline at end of file
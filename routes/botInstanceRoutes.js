@@ -7,6 +7,7 @@ const {
   startBotInstance,
   stopBotInstance,
   getBotInstanceConfigDetails, // <--- IMPORT NEW CONTROLLER
+  getBotInstanceMetrics,
 } = require("../controllers/botInstanceController");
 const authenticateUser = require("../middleware/authMiddleware");
 
@@ -35,4 +36,7 @@ router.get(
   getBotInstanceConfigDetails
 );
 
+// GET /api/bot-instances/:botInstanceId/metrics (callback latency histograms and loop overruns)
+router.get("/:botInstanceId/metrics", authenticateUser, getBotInstanceMetrics);
+
 module.exports = router;
@@ -0,0 +1,47 @@
+// /services/freqtrade/backtestPool.js
+// Client for the resident backtest pool (ftlib/backtest_pool.py). The pool keeps
+// freqtrade and hot candle data loaded, runs jobs with per-user concurrency limits
+// and streams progress as NDJSON.
+const axios = require("axios");
+
+const BACKTEST_POOL_URL = process.env.BACKTEST_POOL_URL || "http://127.0.0.1:8765";
+
+const client = axios.create({ baseURL: BACKTEST_POOL_URL, timeout: 10000 });
+
+/**
+ * Queues a backtest.
+ * @param {{user: string, config: string, strategy: string, timerange: string, timeframe?: string}} job
+ * @returns {Promise<{id: string, state: string, ahead: number}>}
+ */
+async function submitBacktest(job) {
+  const { data } = await client.post("/jobs", job);
+  return data;
+}
+
+/**
+ * State, last progress and result of a job, or null if the pool does not know it.
+ * @param {string} backtestId
+ */
+async function getBacktest(backtestId) {
+  try {
+    const { data } = await client.get(`/jobs/${encodeURIComponent(backtestId)}`);
+    return data;
+  } catch (error) {
+    if (error.response?.status === 404) return null;
+    throw error;
+  }
+}
+
+/**
+ * Readable NDJSON stream of the job's events; it ends when the job has finished.
+ * @param {string} backtestId
+ */
+async function streamBacktestEvents(backtestId) {
+  const { data } = await client.get(`/jobs/${encodeURIComponent(backtestId)}/events`, {
+    responseType: "stream",
+    timeout: 0,
+  });
+  return data;
+}
+
+module.exports = { BACKTEST_POOL_URL, submitBacktest, getBacktest, streamBacktestEvents };
@@ -0,0 +1,30 @@
+// /services/freqtrade/forkServer.js
+// With FREQTRADE_FORK_SERVER_SOCKET set, bots are started through the pre-warmed fork
+// server (ftlib/fork_server.py) instead of a cold `python -m freqtrade`. The client
+// falls back to a cold start by itself when the server is not running.
+const FORK_SERVER_SOCKET = process.env.FREQTRADE_FORK_SERVER_SOCKET;
+
+/**
+ * Replaces `-m freqtrade <args>` in a python argument list with the fork server client.
+ * @param {string[]} pythonArgs - e.g. ["-u", "-m", "freqtrade", "trade", "--config", path].
+ * @returns {string[]} The arguments to start the bot with.
+ */
+function withForkServer(pythonArgs) {
+  if (!FORK_SERVER_SOCKET) return pythonArgs;
+  const index = pythonArgs.findIndex(
+    (arg, i) => arg === "-m" && pythonArgs[i + 1] === "freqtrade"
+  );
+  if (index === -1) return pythonArgs;
+  return [
+    ...pythonArgs.slice(0, index),
+    "-m",
+    "ftlib.fork_server",
+    "spawn",
+    "--socket",
+    FORK_SERVER_SOCKET,
+    "--",
+    ...pythonArgs.slice(index + 2),
+  ];
+}
+
+module.exports = { withForkServer };
@@ -0,0 +1,86 @@
+// /services/freqtrade/metricsReader.js
+const fs = require("fs").promises;
+const path = require("path");
+const logger = require("../../utils/logger");
+
+// Same base directory as configBuilder.js - each instance writes to
+// <user data dir>/<instanceId>/metrics/callbacks.json (ftlib/callback_metrics.py).
+const envUserDataDir =
+  process.env.FREQTRADE_USER_DATA_DIR || "./data/ft_user_data";
+const absoluteUserDataBaseDir = path.resolve(
+  __dirname,
+  "../../",
+  envUserDataDir
+);
+
+// A snapshot older than this many write intervals means the bot loop is stuck or the bot is down.
+const STALE_INTERVALS = 4;
+const DEFAULT_INTERVAL_SECONDS = 15;
+
+/**
+ * Reads the latest callback latency snapshot written by a bot instance.
+ * @param {string} instanceIdStr - BotInstance id.
+ * @param {number} [intervalSeconds] - Write interval configured for the bot (callback_metrics.interval).
+ * @returns {Promise<object|null>} The snapshot plus `ageSeconds` and `stale`, or null if the bot has not written one.
+ */
+async function readCallbackMetrics(
+  instanceIdStr,
+  intervalSeconds = DEFAULT_INTERVAL_SECONDS
+) {
+  const metricsPath = path.join(
+    absoluteUserDataBaseDir,
+    instanceIdStr,
+    "metrics",
+    "callbacks.json"
+  );
+  let content;
+  try {
+    content = await fs.readFile(metricsPath, "utf8");
+  } catch (error) {
+    if (error.code === "ENOENT") {
+      return null;
+    }
+    throw error;
+  }
+
+  let snapshot;
+  try {
+    snapshot = JSON.parse(content);
+  } catch (error) {
+    // The writer replaces the file atomically, so this is a corrupt file, not a partial write.
+    logger.warn(
+      `[MetricsReader] Instance ${instanceIdStr}: unreadable metrics file ${metricsPath}: ${error.message}`
+    );
+    return null;
+  }
+
+  const ageSeconds = (Date.now() - Date.parse(snapshot.written_at)) / 1000;
+  return {
+    ...snapshot,
+    ageSeconds,
+    stale: !(ageSeconds <= STALE_INTERVALS * intervalSeconds),
+  };
+}
+
+/**
+ * Flattens a snapshot to one row per callback (all pairs), sorted by total time.
+ * @param {object} snapshot - Result of readCallbackMetrics.
+ * @returns {Array<object>} Rows of { callback, count, sumSeconds, p50Seconds, p99Seconds, maxSeconds }.
+ */
+function summarizeCallbacks(snapshot) {
+  return Object.entries(snapshot?.callbacks || {})
+    .map(([callback, entry]) => ({
+      callback,
+      count: entry.all.count,
+      sumSeconds: entry.all.sum_seconds,
+      p50Seconds: entry.all.p50_seconds,
+      p99Seconds: entry.all.p99_seconds,
+      maxSeconds: entry.all.max_seconds,
+    }))
+    .sort((a, b) => b.sumSeconds - a.sumSeconds);
+}
+
+module.exports = {
+  readCallbackMetrics,
+  summarizeCallbacks,
+};
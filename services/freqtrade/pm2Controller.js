@@ -2,6 +2,7 @@ const pm2 = require("pm2");
 const path = require("path");
 const logger = require("../../utils/logger");
 const fs = require("fs").promises;
+const { withForkServer } = require("./forkServer");
 
 const envUserDataDir =
   process.env.FREQTRADE_USER_DATA_DIR || "./data/ft_user_data";
@@ -90,7 +91,7 @@ async function startBotProcess(instanceIdStr, configPath, scriptPath) {
   const opts = {
     script: absolutePythonPath, // Python executable
     interpreter: "none",
-    args: [
+    args: withForkServer([
       "-u", // unbuffered output
       "-m",
       "freqtrade",
@@ -100,7 +101,7 @@ async function startBotProcess(instanceIdStr, configPath, scriptPath) {
       "--strategy-path",
       strategyPath,
       "-vv",
-    ],
+    ]),
     name: processName,
     exec_mode: "fork",
     env: {
@@ -1,5 +1,6 @@
 // /services/freqtrade/strategyHandler.js
 const path = require("path");
+const { execFile } = require("child_process");
 const { copyFileSafe, ensureDirExists } = require("./fileUtils");
 const logger = require("../../utils/logger");
 
@@ -22,6 +23,45 @@ logger.debug(
 );
 // --- End Robust Path Resolution ---
 
+// --- Optional Performance Lint Gate ---
+// When STRATEGY_LINT_MAX_COST is set (moderate | heavy | quadratic), strategies are run
+// through `check_strategy.py lint` before being copied, and rejected if a finding is worse.
+const STRATEGY_LINT_MAX_COST = process.env.STRATEGY_LINT_MAX_COST;
+const PYTHON_EXECUTABLE_PATH =
+  process.env.FREQTRADE_EXECUTABLE_PATH ||
+  path.resolve(__dirname, "../../../venv/Scripts/python.exe");
+const CHECK_STRATEGY_SCRIPT = path.resolve(__dirname, "../../check_strategy.py");
+
+/**
+ * Runs the static performance linter on a strategy file.
+ * @param {string} sourcePath - Absolute path of the strategy file.
+ * @returns {Promise<object>} The linter verdict ({ path, verdict, ok, error, findings }).
+ */
+function lintStrategyFile(sourcePath) {
+  return new Promise((resolve, reject) => {
+    execFile(
+      PYTHON_EXECUTABLE_PATH,
+      [
+        CHECK_STRATEGY_SCRIPT,
+        "lint",
+        "--json",
+        "--max-cost",
+        STRATEGY_LINT_MAX_COST,
+        sourcePath,
+      ],
+      { cwd: path.resolve(__dirname, "../../"), timeout: 30000 },
+      (error, stdout) => {
+        // Exit code 1 only means the verdict failed - the JSON is still on stdout.
+        try {
+          resolve(JSON.parse(stdout)[0]);
+        } catch (parseError) {
+          reject(error || parseError);
+        }
+      }
+    );
+  });
+}
+
 /**
  * Ensures the correct strategy file exists in the instance's strategies directory.
  * Copies the file from the central STRATEGY_SOURCE_DIR.
@@ -82,6 +122,25 @@ async function ensureStrategyFile(instance, strategiesDir) {
   logger.debug(`[StrategyHandler]   Source: ${sourcePath}`);
   logger.debug(`[StrategyHandler]   Destination: ${destinationPath}`);
 
+  if (STRATEGY_LINT_MAX_COST) {
+    const report = await lintStrategyFile(sourcePath);
+    if (!report.ok) {
+      const worst = report.findings
+        .slice(0, 5)
+        .map((f) => `line ${f.line} [${f.cost}] ${f.rule}`)
+        .join("; ");
+      logger.error(
+        `[StrategyHandler] Instance ${instanceIdStr}: Strategy '${strategyFile}' failed the performance lint (verdict: ${report.verdict}). ${report.error || worst}`
+      );
+      throw new Error(
+        `Strategy ${strategyFile} rejected by performance lint (verdict: ${report.verdict})`
+      );
+    }
+    logger.debug(
+      `[StrategyHandler] Instance ${instanceIdStr}: Performance lint verdict: ${report.verdict}`
+    );
+  }
+
   try {
     // Ensure destination directory exists
     await ensureDirExists(strategiesDir); // EnsureDir might log internally
@@ -127,4 +186,5 @@ async function ensureStrategyFile(instance, strategiesDir) {
 
 module.exports = {
   ensureStrategyFile,
+  lintStrategyFile,
 };
@@ -8,6 +8,8 @@ const Bot = require("../models/Bot"); // Adjust path as needed
 const User = require("../models/User"); // Adjust path (if needed, though not directly used here)
 const { decrypt } = require("../utils/crypto"); // Adjust path as needed
 const logger = require("../utils/logger"); // Adjust path as needed
+const { withForkServer } = require("./freqtrade/forkServer");
+const { submitBacktest } = require("./freqtrade/backtestPool");
 
 // --- Configuration ---
 // !! IMPORTANT: Adjust these values based on YOUR Freqtrade setup !!
@@ -581,14 +583,14 @@ async function startFreqtradeProcess(instanceId) {
   const pm2Options = {
     name: processName,
     script: FREQTRADE_EXECUTABLE_PATH,
-    args: [
+    args: withForkServer([
       "-m",
       "freqtrade",
       "trade",
       "--config",
       configPaths.configFilePath,
       "-vv",
-    ],
+    ]),
     cwd: process.cwd(), // Set the current working directory to the backend root
     exec_mode: "fork",
     autorestart: false,
@@ -778,10 +780,64 @@ async function stopFreqtradeProcess(instanceId, markInactive = true) {
   }
 }
 
+// --- Start Backtest ---
+// Backtests run in the resident backtest pool (ftlib/backtest_pool.py) instead of a
+// freqtrade process per request; progress and results are read back by backtestId.
+const toTimerangeDate = (value) => {
+  const date = new Date(value);
+  if (Number.isNaN(date.getTime())) return null;
+  return date.toISOString().slice(0, 10).replace(/-/g, "");
+};
+
+async function startFreqtradeBacktest(userId, botInstanceId, strategy, timeframe, startDate, endDate) {
+  const start = toTimerangeDate(startDate);
+  const end = toTimerangeDate(endDate);
+  if (!start || !end || start >= end) {
+    return { success: false, message: "Invalid backtest date range." };
+  }
+
+  const instance = await BotInstance.findOne({ _id: botInstanceId, userId }).populate(
+    "botId",
+    "defaultStrategy defaultConfig"
+  );
+  if (!instance) {
+    return { success: false, message: "Bot instance not found." };
+  }
+  const instanceIdStr = instance._id.toString();
+
+  // Backtests reuse the instance config (exchange, pairs, stake); generate it if the bot never ran.
+  let configFilePath = path.join(path.resolve(FREQTRADE_USER_DATA_DIR), instanceIdStr, "config.json");
+  const hasConfig = await fs.access(configFilePath).then(() => true).catch(() => false);
+  if (!hasConfig) {
+    ({ configFilePath } = await generateInstanceConfig(instance));
+  }
+
+  try {
+    const job = await submitBacktest({
+      user: userId.toString(),
+      config: configFilePath,
+      strategy,
+      timeframe,
+      timerange: `${start}-${end}`,
+    });
+    logger.info(`Backtest ${job.id} queued for instance ${instanceIdStr} (${job.ahead} ahead).`);
+    return {
+      success: true,
+      message: job.ahead ? `Backtest queued (${job.ahead} ahead).` : "Backtest started.",
+      backtestId: job.id,
+    };
+  } catch (error) {
+    const message = error.response?.data?.error || error.message;
+    logger.error(`Backtest submission for instance ${instanceIdStr} failed: ${message}`);
+    return { success: false, message: `Failed to queue backtest: ${message}` };
+  }
+}
+
 module.exports = {
   connectPm2,
   disconnectPm2,
   startFreqtradeProcess,
   stopFreqtradeProcess,
   generateInstanceConfig,
+  startFreqtradeBacktest,
 };
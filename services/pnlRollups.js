@@ -0,0 +1,91 @@
+// /services/pnlRollups.js
+const mongoose = require("mongoose");
+const PnlRollup = require("../models/PnlRollup");
+
+// The rollup job (ftlib/pnl_rollups.py) writes a heartbeat every pass (default 5s).
+// Older than this, endpoints aggregate the raw trades instead.
+const MAX_ROLLUP_AGE_MS = 5 * 60 * 1000;
+
+/**
+ * Whether the rollup job is running and has caught up recently.
+ * @returns {Promise<boolean>}
+ */
+async function rollupsAreFresh() {
+  const state = await mongoose.connection.db
+    .collection("pnl_rollup_state")
+    .findOne({ _id: "watermark" }, { projection: { heartbeat: 1 } });
+  return Boolean(
+    state?.heartbeat && Date.now() - state.heartbeat.getTime() < MAX_ROLLUP_AGE_MS
+  );
+}
+
+/**
+ * Start of the bucket containing `date` (UTC), matching the job's bucketing.
+ * @param {Date} date
+ * @param {"hourly"|"daily"|"monthly"} granularity
+ * @returns {Date}
+ */
+function bucketStart(date, granularity) {
+  const y = date.getUTCFullYear();
+  const m = date.getUTCMonth();
+  if (granularity === "monthly") return new Date(Date.UTC(y, m, 1));
+  if (granularity === "hourly")
+    return new Date(Date.UTC(y, m, date.getUTCDate(), date.getUTCHours()));
+  return new Date(Date.UTC(y, m, date.getUTCDate()));
+}
+
+/**
+ * Start of the bucket after the one containing `date` (UTC).
+ * @param {Date} date
+ * @param {"hourly"|"daily"|"monthly"} granularity
+ * @returns {Date}
+ */
+function nextBucketStart(date, granularity) {
+  const start = bucketStart(date, granularity);
+  if (granularity === "monthly")
+    return new Date(Date.UTC(start.getUTCFullYear(), start.getUTCMonth() + 1, 1));
+  if (granularity === "hourly") return new Date(start.getTime() + 60 * 60 * 1000);
+  return new Date(
+    Date.UTC(start.getUTCFullYear(), start.getUTCMonth(), start.getUTCDate() + 1)
+  );
+}
+
+/**
+ * Rollup buckets of one owner, oldest first. Buckets that only ever held trades which
+ * were later reopened have `trades: 0` and are skipped.
+ * @param {"instance"|"user"} scope
+ * @param {string} ownerId - BotInstance or User id.
+ * @param {"hourly"|"daily"|"monthly"} granularity
+ * @param {{from?: Date, to?: Date}} [range] - Bucket starts, `from` inclusive, `to` exclusive.
+ * @returns {Promise<object[]>}
+ */
+async function readRollups(scope, ownerId, granularity, { from, to } = {}) {
+  const filter = { scope, ownerId: String(ownerId), granularity, trades: { $gt: 0 } };
+  if (from || to) {
+    filter.bucket = {};
+    if (from) filter.bucket.$gte = bucketStart(from, granularity);
+    if (to) filter.bucket.$lt = to;
+  }
+  return PnlRollup.find(filter).sort({ bucket: 1 }).lean();
+}
+
+/**
+ * Sums the metrics of rollup buckets.
+ * @param {object[]} buckets
+ * @returns {{profit: number, grossProfit: number, fees: number, trades: number, wins: number, losses: number}}
+ */
+function sumRollups(buckets) {
+  const total = { profit: 0, grossProfit: 0, fees: 0, trades: 0, wins: 0, losses: 0 };
+  for (const bucket of buckets) {
+    for (const key of Object.keys(total)) total[key] += bucket[key] || 0;
+  }
+  return total;
+}
+
+module.exports = {
+  rollupsAreFresh,
+  bucketStart,
+  nextBucketStart,
+  readRollups,
+  sumRollups,
+};
@@ -0,0 +1,249 @@
+import json
+import sys
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from ftlib import backtest_cache
+from ftlib.backtest_cache import (BacktestCache, _local_modules, frames_digest, normalized_config, result_summary,
+                                  strategy_digest)
+
+
+def candles(start: str, periods: int, close: float = 1.0) -> pd.DataFrame:
+    dates = pd.date_range(start, periods=periods, freq="5min", tz="UTC")
+    return pd.DataFrame({"date": dates, "open": close, "high": close, "low": close, "close": close, "volume": 1.0})
+
+
+def stats(strategy: str = "Sample") -> dict:
+    return {
+        "strategy": {strategy: {"backtest_start_ts": 1748736000000, "backtest_end_ts": 1751241600000}},
+        "strategy_comparison": [{"key": strategy, "trades": 3, "profit_total": 0.012}],
+    }
+
+
+# --- key composition ---------------------------------------------------------------------
+
+def test_normalized_config_drops_irrelevant_keys():
+    config = {
+        "stake_amount": 100,
+        "timerange": "20250601-",
+        "datadir": "/data/a",
+        "telegram": {"token": "x"},
+        "exchange": {"name": "binance", "key": "k", "secret": "s", "pair_whitelist": ["BTC/USDT"]},
+    }
+    assert normalized_config(config) == {
+        "stake_amount": 100,
+        "exchange": {"name": "binance", "pair_whitelist": ["BTC/USDT"]},
+    }
+    assert config["exchange"]["key"] == "k"
+
+
+def test_normalized_config_keeps_result_relevant_keys():
+    base = {"stake_amount": 100, "exchange": {"name": "binance"}}
+    assert normalized_config(base) != normalized_config({**base, "stake_amount": 200})
+    assert normalized_config(base) != normalized_config({**base, "exchange": {"name": "kraken"}})
+
+
+def test_frames_digest_depends_on_content_not_order():
+    btc, eth = candles("2025-06-01", 10), candles("2025-06-01", 10, close=2.0)
+    assert frames_digest({"BTC/USDT": btc, "ETH/USDT": eth}) == frames_digest({"ETH/USDT": eth, "BTC/USDT": btc})
+    assert frames_digest({"BTC/USDT": btc}) != frames_digest({"ETH/USDT": btc})
+
+    changed = btc.copy()
+    changed.loc[4, "close"] = 1.5
+    assert frames_digest({"BTC/USDT": btc}) != frames_digest({"BTC/USDT": changed})
+
+
+def test_frames_digest_ignores_candles_appended_after_the_range():
+    full = candles("2025-06-01", 20)
+    trimmed = full.iloc[:10]
+    assert frames_digest({"BTC/USDT": trimmed}) == frames_digest({"BTC/USDT": candles("2025-06-01", 10)})
+    assert frames_digest({"BTC/USDT": trimmed}) != frames_digest({"BTC/USDT": full})
+
+
+# --- entries ---------------------------------------------------------------------------------
+
+def write_result(directory, name: str = "backtest-result-2025-06-30_12-00-00.zip"):
+    directory.mkdir(parents=True, exist_ok=True)
+    zip_file = directory / name
+    zip_file.write_bytes(b"zip")
+    zip_file.with_suffix(".meta.json").write_text("{}")
+    (directory / ".last_result.json").write_text(json.dumps({"latest_backtest": name}))
+    return zip_file
+
+
+HELPER_STRATEGY = """
+from freqtrade.strategy import IStrategy
+
+from sample_helper import signal
+
+
+class HelperStrategy(IStrategy):
+    timeframe = "5m"
+    minimal_roi = {"0": 0.1}
+    stoploss = -0.1
+
+    def populate_indicators(self, dataframe, metadata):
+        from ftlib.bollinger import BollingerFamily  # noqa: F401
+        return dataframe
+
+    def populate_entry_trend(self, dataframe, metadata):
+        dataframe["enter_long"] = signal(dataframe)
+        return dataframe
+
+    def populate_exit_trend(self, dataframe, metadata):
+        return dataframe
+"""
+
+
+def test_strategy_digest_follows_helpers_of_a_resolved_strategy(tmp_path, monkeypatch):
+    pytest.importorskip("freqtrade.resolvers")
+    from freqtrade.resolvers import StrategyResolver
+
+    (tmp_path / "HelperStrategy.py").write_text(HELPER_STRATEGY)
+    helper = tmp_path / "sample_helper.py"
+    helper.write_text("def signal(dataframe):\n    return 0\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    strategy = StrategyResolver.load_strategy({
+        "strategy": "HelperStrategy", "strategy_path": str(tmp_path), "user_data_dir": tmp_path,
+        "stake_currency": "USDT", "dry_run_wallet": 1000, "stake_amount": 10, "max_open_trades": 1,
+    })
+    # freqtrade does not register the strategy module.
+    assert sys.modules.get(type(strategy).__module__) is None
+
+    bollinger = Path(backtest_cache.__file__).resolve().parent / "bollinger.py"
+    assert _local_modules(strategy) == sorted([helper.resolve(), bollinger])
+    digest = strategy_digest(strategy)
+    helper.write_text("def signal(dataframe):\n    return 1\n")
+    assert strategy_digest(strategy) != digest
+
+
+def test_lookup_copies_the_result_into_the_results_dir(tmp_path):
+    cache = BacktestCache(tmp_path / "cache")
+    zip_file = write_result(tmp_path / "a")
+    cache.store("ab" * 32, zip_file, {}, result_summary(stats(), 2))
+
+    hit = cache.lookup_result("ab" * 32, tmp_path / "b")
+    assert hit["file"] == str(tmp_path / "b" / zip_file.name)
+    assert (tmp_path / "b" / zip_file.name).read_bytes() == b"zip"
+    assert (tmp_path / "b" / zip_file.with_suffix(".meta.json").name).is_file()
+    assert json.loads((tmp_path / "b" / ".last_result.json").read_text()) == {"latest_backtest": zip_file.name}
+
+
+def test_result_rewritten_in_place_leaves_the_entry_alone(tmp_path):
+    cache = BacktestCache(tmp_path / "cache")
+    zip_file = write_result(tmp_path / "a")
+    cache.store("ef" * 32, zip_file, {}, result_summary(stats(), 2))
+    # freqtrade opens an existing name with "w": same inode, new content.
+    with zip_file.open("r+b") as handle:
+        handle.write(b"new")
+    hit = cache.lookup_result("ef" * 32, tmp_path / "b")
+    assert Path(hit["file"]).read_bytes() == b"zip"
+
+
+def test_changed_informative_file_is_a_miss(tmp_path):
+    cache = BacktestCache(tmp_path / "cache")
+    informative = tmp_path / "BTC_USDT-1h.feather"
+    informative.write_bytes(b"1")
+    reads = {str(informative): backtest_cache._file_fingerprint(informative)}
+    cache.store("cd" * 32, write_result(tmp_path / "a"), reads, result_summary(stats(), 1))
+    assert cache.lookup("cd" * 32, tmp_path / "a") is not None
+
+    informative.write_bytes(b"12")
+    assert cache.lookup("cd" * 32, tmp_path / "a") is None
+
+
+def test_entry_without_result_is_a_miss_for_lookup_result(tmp_path):
+    cache = BacktestCache(tmp_path / "cache")
+    cache.store("ef" * 32, write_result(tmp_path / "a"), {})
+    assert cache.lookup("ef" * 32, tmp_path / "a") is not None
+    assert cache.lookup_result("ef" * 32, tmp_path / "a") is None
+
+
+def test_result_summary():
+    assert result_summary(stats(), 4) == {
+        "summary": {"key": "Sample", "trades": 3, "profit_total": 0.012},
+        "min_date": "2025-06-01T00:00:00+00:00",
+        "max_date": "2025-06-30T00:00:00+00:00",
+        "pairs": 4,
+    }
+
+
+# --- command line and pool share entries ----------------------------------------------------
+
+class FakeBacktesting:
+    """
+    What ``_cached_start`` uses of freqtrade's Backtesting; ``start`` exports a result.
+    """
+
+    def __init__(self, directory):
+        self.config = {"export": "trades", "exportfilename": str(directory)}
+        self.strategylist = ["Sample"]
+        self.directory = directory
+        self.started = 0
+
+    def load_bt_data(self):
+        return {"BTC/USDT": candles("2025-06-01", 10), "ETH/USDT": candles("2025-06-01", 10)}, "timerange"
+
+    def load_bt_data_detail(self):
+        return None
+
+    def start(self):
+        self.started += 1
+        write_result(self.directory, f"backtest-result-{self.started}.zip")
+
+
+@pytest.fixture
+def command_line(tmp_path, monkeypatch):
+    """
+    ``_cached_start`` against a cache in ``tmp_path``, with freqtrade's report helpers faked.
+    """
+    cache_dir, shown = tmp_path / "cache", []
+    btanalysis = types.ModuleType("freqtrade.data.btanalysis")
+    btanalysis.load_backtest_stats = lambda filename: stats()
+
+    def get_latest_backtest_filename(directory):
+        if not (directory / ".last_result.json").is_file():
+            raise ValueError("No backtest result")
+        return json.loads((directory / ".last_result.json").read_text())["latest_backtest"]
+
+    btanalysis.get_latest_backtest_filename = get_latest_backtest_filename
+    reports = types.ModuleType("freqtrade.optimize.optimize_reports")
+    reports.show_backtest_results = lambda config, results: shown.append(results)
+    monkeypatch.setitem(sys.modules, "freqtrade.data.btanalysis", btanalysis)
+    monkeypatch.setitem(sys.modules, "freqtrade.optimize.optimize_reports", reports)
+
+    @contextmanager
+    def record_reads(backtesting):
+        yield {}
+
+    monkeypatch.setattr(backtest_cache, "BacktestCache", lambda: BacktestCache(cache_dir))
+    monkeypatch.setattr(backtest_cache, "backtest_key", lambda backtesting, data, timerange: "12" * 32)
+    monkeypatch.setattr(backtest_cache, "record_reads", record_reads)
+    monkeypatch.setattr(backtest_cache, "_ORIGINAL_START", FakeBacktesting.start)
+    return BacktestCache(cache_dir), shown
+
+
+def test_command_line_entry_is_a_pool_hit(tmp_path, command_line):
+    cache, shown = command_line
+    backtesting = FakeBacktesting(tmp_path / "cli")
+    backtest_cache._cached_start(backtesting)
+    assert backtesting.started == 1 and shown == []
+
+    hit = cache.lookup_result("12" * 32, tmp_path / "pool")
+    assert hit == {**result_summary(stats(), 2), "file": str(tmp_path / "pool" / "backtest-result-1.zip")}
+
+
+def test_pool_entry_is_a_command_line_hit(tmp_path, command_line):
+    cache, shown = command_line
+    zip_file = write_result(tmp_path / "pool", "backtest-result-pool.zip")
+    cache.store("12" * 32, zip_file, {}, result_summary(stats(), 2))
+
+    backtesting = FakeBacktesting(tmp_path / "cli")
+    backtest_cache._cached_start(backtesting)
+    assert backtesting.started == 0
+    assert shown == [stats()]
+    assert (tmp_path / "cli" / "backtest-result-pool.zip").is_file()
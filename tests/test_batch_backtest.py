@@ -0,0 +1,20 @@
+from ftlib.batch_backtest import report_timings
+
+
+OUTCOMES = [{"strategy": "A", "wall_time": 2.0}, {"strategy": "B", "wall_time": 3.0}]
+
+
+def test_unmeasured_baseline_is_labelled_an_estimate(capsys):
+    report_timings(OUTCOMES, [], load_time=1.0, total_time=3.5)
+    output = capsys.readouterr().out
+    assert "Sequential (estimate):         7.00s" in output
+    assert "Speedup (estimate):            2.00x" in output
+    assert "measured" not in output.replace("--measure-sequential", "")
+
+
+def test_measured_baseline(capsys):
+    report_timings(OUTCOMES, ["C"], load_time=1.0, total_time=3.5, sequential=10.5)
+    output = capsys.readouterr().out
+    assert "Sequential (measured):        10.50s" in output
+    assert "Speedup (measured):            3.00x" in output
+    assert "estimate" not in output
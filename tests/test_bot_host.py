@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("freqtrade.exchange")
+
+from ftlib.bot_host import SharedExchangeData  # noqa: E402
+
+
+class TenantExchange:
+    """
+    The parts of freqtrade's Exchange the shared candle cache uses.
+    """
+
+    def __init__(self, calls: int):
+        self.id = "binance"
+        self.required_candle_call_count = calls
+        self._klines = {}
+        self._pairs_last_refresh_time = {}
+        self.requested = []
+
+    def refresh_latest_ohlcv(self, pair_list, **kwargs):
+        self.requested.append(list(pair_list))
+        return {key: f"{self.required_candle_call_count} calls of {key[0]}" for key in pair_list}
+
+
+def test_candles_are_only_shared_with_tenants_needing_no_more_history():
+    shared = SharedExchangeData()
+    short, other_short, long = TenantExchange(1), TenantExchange(1), TenantExchange(2)
+    for exchange in (short, other_short, long):
+        shared.attach(exchange)
+    pairs = [("BTC/USDT", "5m", "spot")]
+
+    assert short.refresh_latest_ohlcv(pairs) == {pairs[0]: "1 calls of BTC/USDT"}
+    assert other_short.refresh_latest_ohlcv(pairs) == {pairs[0]: "1 calls of BTC/USDT"}
+    assert other_short.requested == []
+
+    assert long.refresh_latest_ohlcv(pairs) == {pairs[0]: "2 calls of BTC/USDT"}
+    assert long.requested == [pairs]
+    assert short.refresh_latest_ohlcv(pairs) == {pairs[0]: "2 calls of BTC/USDT"}
+    assert short.requested == [pairs]
+    assert (shared.fetched, shared.reused) == (2, 2)
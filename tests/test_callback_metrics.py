@@ -0,0 +1,62 @@
+from inspect import getfullargspec
+
+import pytest
+
+from ftlib.callback_metrics import CallbackRecorder
+
+
+CALLBACK_STRATEGY = '''
+from freqtrade.strategy import IStrategy
+
+from ftlib.callback_metrics import CallbackMetricsMixin
+
+
+class CallbackStrategy(CallbackMetricsMixin, IStrategy):
+    INTERFACE_VERSION = 3
+    timeframe = "5m"
+    stoploss = -0.1
+    use_custom_stoploss = True
+
+    def populate_indicators(self, dataframe, metadata):
+        return dataframe
+
+    def populate_entry_trend(self, dataframe, metadata):
+        return dataframe
+
+    def populate_exit_trend(self, dataframe, metadata):
+        return dataframe
+
+    def custom_stoploss(self, pair, trade, current_time, current_rate, current_profit, after_fill, **kwargs):
+        return None
+'''
+
+
+class Strategy:
+    def custom_stoploss(self, pair, trade, current_time, current_rate, current_profit, after_fill, **kwargs):
+        return after_fill
+
+
+def test_wrapped_callback_keeps_its_argspec(tmp_path):
+    recorder = CallbackRecorder(tmp_path / "callbacks.json", candle_seconds=300)
+    original = Strategy().custom_stoploss
+    timed = recorder.wrap("custom_stoploss", original)
+
+    assert getfullargspec(timed) == getfullargspec(original)
+    assert timed(pair="BTC/USDT", trade=None, current_time=None, current_rate=1.0, current_profit=0.0,
+                 after_fill=True)
+    assert ("custom_stoploss", "BTC/USDT") in recorder.histograms
+
+
+def test_resolver_sees_after_fill_of_a_timed_custom_stoploss(tmp_path, monkeypatch):
+    pytest.importorskip("freqtrade.resolvers")
+    from freqtrade.resolvers import StrategyResolver
+
+    (tmp_path / "CallbackStrategy.py").write_text(CALLBACK_STRATEGY)
+    strategy = StrategyResolver.load_strategy({
+        "strategy": "CallbackStrategy", "strategy_path": str(tmp_path), "user_data_dir": tmp_path,
+        "stake_currency": "USDT", "dry_run_wallet": 1000, "stake_amount": 10, "max_open_trades": 1,
+        "callback_metrics": {"enabled": True, "path": str(tmp_path / "callbacks.json")},
+    })
+    assert strategy.callback_metrics is not None
+    assert "custom_stoploss" in strategy.__dict__
+    assert strategy._ft_stop_uses_after_fill
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ftlib.compact_frame import compact_frame, signals_equal
+
+
+def test_importing_the_mixin_loads_no_report_helpers():
+    code = ("import sys, ftlib.compact_frame; "
+            "print(sorted(name for name in sys.modules if name.startswith('ftlib')))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).parents[1]).stdout
+    assert output.strip() == "['ftlib', 'ftlib.compact_frame']"
+
+
+def test_compact_frame_dtypes_and_signals():
+    frame = pd.DataFrame({
+        "close": [1.0, 2.0, 3.0],
+        "rsi": [30.5, 50.25, 70.125],
+        "enter_long": [1.0, np.nan, np.nan],
+        "counter": np.array([1, 2, 3], dtype=np.int64),
+        "enter_tag": ["up", None, "up"],
+    })
+    compacted = compact_frame(frame)
+    assert compacted["close"].dtype == np.float64
+    assert compacted["rsi"].dtype == np.float32
+    assert compacted["enter_long"].tolist() == [1, 0, 0] and compacted["enter_long"].dtype == np.int8
+    assert compacted["counter"].dtype == np.int8
+    assert isinstance(compacted["enter_tag"].dtype, pd.CategoricalDtype)
+    assert signals_equal(frame, compacted) == []
@@ -0,0 +1,84 @@
+import pickle
+from types import SimpleNamespace
+
+import pandas as pd
+
+from ftlib import hyperopt_memo
+from ftlib.hyperopt_memo import run_fingerprint
+
+
+CONFIG = {"strategy": "Sample", "timeframe": "5m", "timerange": "20250601-",
+          "exchange": {"pair_whitelist": ["BTC/USDT"]}}
+
+
+def candles(periods: int) -> dict[str, pd.DataFrame]:
+    dates = pd.date_range("2025-06-01", periods=periods, freq="5min", tz="UTC")
+    return {"BTC/USDT": pd.DataFrame({"date": dates, "close": range(periods)})}
+
+
+def timerange(start: int, stop: int):
+    return SimpleNamespace(startts=start, stopts=stop)
+
+
+def test_fingerprint_covers_effective_config_and_parameter_file(tmp_path):
+    strategy_file = tmp_path / "Sample.py"
+    strategy_file.write_text("class Sample: pass\n")
+    base = run_fingerprint(CONFIG, str(strategy_file), timerange(1, 2), {"data": candles(10)})
+    for changed in ({"trailing_stop": True}, {"use_exit_signal": False}, {"protections": [{"method": "x"}]},
+                    {"order_types": {"entry": "market"}}, {"position_adjustment_enable": True}):
+        assert run_fingerprint({**CONFIG, **changed}, str(strategy_file), timerange(1, 2),
+                               {"data": candles(10)}) != base
+    # Options of the search itself do not change what an epoch evaluates to.
+    assert run_fingerprint({**CONFIG, "epochs": 500, "hyperopt_random_state": 3, "hyperopt_jobs": 4},
+                           str(strategy_file), timerange(1, 2), {"data": candles(10)}) == base
+    strategy_file.with_suffix(".json").write_text('{"params": {"buy": {"rsi": 30}}}')
+    assert run_fingerprint(CONFIG, str(strategy_file), timerange(1, 2), {"data": candles(10)}) != base
+
+
+def test_fingerprint_covers_resolved_timerange_and_candles():
+    base = run_fingerprint(CONFIG, None, timerange(1, 2), {"data": candles(10)})
+    assert base == run_fingerprint(CONFIG, None, timerange(1, 2), {"data": candles(10)})
+    # Same --timerange string, refreshed data: another run.
+    assert base != run_fingerprint(CONFIG, None, timerange(1, 2), {"data": candles(11)})
+    assert base != run_fingerprint(CONFIG, None, timerange(1, 3), {"data": candles(10)})
+    assert base != run_fingerprint(CONFIG, None, timerange(1, 2), {"data": candles(10), "detail": candles(3)})
+
+
+class FakeBacktesting:
+
+    def __init__(self):
+        self.strategy = SimpleNamespace()
+        self.detail_data = None
+
+    def load_bt_data(self):
+        return candles(10), timerange(1, 2)
+
+    def load_bt_data_detail(self):
+        self.detail_data = candles(3)
+
+
+class FakeHyperopt:
+    """
+    What freqtrade's Hyperopt.start does before dispatching epochs: load the candles.
+    """
+
+    def __init__(self):
+        self.config = CONFIG
+        self.backtesting = FakeBacktesting()
+
+    def start(self):
+        self.backtesting.load_bt_data()
+        self.backtesting.load_bt_data_detail()
+        self.dispatched = pickle.loads(pickle.dumps(self.backtesting))
+
+
+def test_start_fingerprints_the_loaded_candles(tmp_path, monkeypatch):
+    monkeypatch.setenv("FT_HYPEROPT_MEMO_DB", str(tmp_path / "memo.sqlite"))
+    monkeypatch.setattr(hyperopt_memo, "_ORIGINAL_START", FakeHyperopt.start)
+    hyperopt = FakeHyperopt()
+    hyperopt_memo._memoized_start(hyperopt)
+
+    _, fingerprint, _ = hyperopt._memo_context
+    assert fingerprint == run_fingerprint(CONFIG, None, timerange(1, 2),
+                                          {"data": candles(10), "detail": candles(3), "futures": None})
+    assert vars(hyperopt.backtesting).keys() == {"strategy", "detail_data"}
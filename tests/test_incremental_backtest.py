@@ -0,0 +1,167 @@
+"""
+Differential test of ``ftlib.incremental_backtest``: a run over A..C must equal a run over
+A..B resumed to C - trades, wallet and pair locks - also when a trade is open at B.
+"""
+import json
+import pickle
+import textwrap
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("freqtrade.optimize.backtesting")
+
+from ftlib.incremental_backtest import CheckpointStore, run_backtest  # noqa: E402
+
+
+PAIRS = ["BTC/USDT", "ETH/USDT"]
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+STRATEGY = textwrap.dedent('''
+    from freqtrade.strategy import IStrategy
+
+
+    class CrossStrategy(IStrategy):
+        timeframe = "5m"
+        startup_candle_count = 30
+        minimal_roi = {"0": 0.03}
+        stoploss = -0.02
+        can_short = False
+
+        @property
+        def protections(self):
+            return [{"method": "CooldownPeriod", "stop_duration_candles": 6}]
+
+        def populate_indicators(self, dataframe, metadata):
+            dataframe["fast"] = dataframe["close"].rolling(8).mean()
+            dataframe["slow"] = dataframe["close"].rolling(30).mean()
+            return dataframe
+
+        def populate_entry_trend(self, dataframe, metadata):
+            crossed = (dataframe["fast"] > dataframe["slow"]) & (dataframe["fast"].shift() <= dataframe["slow"].shift())
+            dataframe.loc[crossed, "enter_long"] = 1
+            return dataframe
+
+        def populate_exit_trend(self, dataframe, metadata):
+            crossed = (dataframe["fast"] < dataframe["slow"]) & (dataframe["fast"].shift() >= dataframe["slow"].shift())
+            dataframe.loc[crossed, "exit_long"] = 1
+            return dataframe
+''')
+
+
+def random_walk(seed: int, periods: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, periods)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, periods)) * close
+    return pd.DataFrame({
+        "date": pd.date_range(START, periods=periods, freq="5min", tz="UTC"),
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.uniform(10, 100, periods),
+    })
+
+
+def market(pair: str) -> dict:
+    base, quote = pair.split("/")
+    return {
+        "id": base + quote, "symbol": pair, "base": base, "quote": quote, "active": True, "spot": True,
+        "type": "spot", "swap": False, "future": False, "option": False, "margin": False, "contract": False,
+        "linear": None, "inverse": None, "contractSize": None, "settle": None,
+        "precision": {"amount": 0.00001, "price": 0.00001, "base": 0.00000001, "quote": 0.00000001},
+        "limits": {"amount": {"min": 0.00001, "max": 100000}, "cost": {"min": 5, "max": None},
+                   "price": {"min": None, "max": None}, "leverage": {"min": None, "max": None}},
+        "info": {},
+    }
+
+
+@pytest.fixture
+def environment(tmp_path):
+    from freqtrade.data.history import get_datahandler
+    from freqtrade.enums import CandleType
+
+    datadir = tmp_path / "data"
+    handler = get_datahandler(datadir, "feather")
+    for seed, pair in enumerate(PAIRS):
+        datadir.mkdir(exist_ok=True)
+        handler.ohlcv_store(pair, "5m", random_walk(seed), CandleType.SPOT)
+    strategies = tmp_path / "strategies"
+    strategies.mkdir()
+    (strategies / "CrossStrategy.py").write_text(STRATEGY)
+    config = {
+        "stake_currency": "USDT", "stake_amount": 100, "dry_run_wallet": 1000, "max_open_trades": 2,
+        "fee": 0.001, "timeframe": "5m", "dry_run": True, "trading_mode": "spot", "margin_mode": "",
+        "enable_protections": True, "dataformat_ohlcv": "feather",
+        "exchange": {"name": "binance", "key": "", "secret": "", "pair_whitelist": PAIRS},
+        "pairlists": [{"method": "StaticPairList"}],
+        "entry_pricing": {"price_side": "same", "use_order_book": False, "price_last_balance": 0.0},
+        "exit_pricing": {"price_side": "same", "use_order_book": False},
+        "strategy_path": str(strategies),
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+def backtesting_for(environment, timerange: str):
+    from freqtrade.configuration import Configuration
+    from freqtrade.enums import RunMode
+    from freqtrade.optimize.backtesting import Backtesting
+    from freqtrade.resolvers import ExchangeResolver
+
+    config = Configuration({
+        "config": [str(environment / "config.json")],
+        "strategy": "CrossStrategy",
+        "timerange": timerange,
+        "export": "none",
+        "user_data_dir": str(environment),
+        "datadir": str(environment / "data"),
+    }, RunMode.BACKTEST).get_config()
+    exchange = ExchangeResolver.load_exchange(config, validate=False, load_leverage_tiers=False)
+    exchange._markets = {pair: market(pair) for pair in PAIRS}
+    return Backtesting(config, exchange=exchange)
+
+
+def run(environment, timerange: str, store: CheckpointStore):
+    """
+    Trades (closed and force-exited at the end), final wallet and locks of one run.
+    """
+    from freqtrade.persistence import PairLocks
+
+    backtesting = backtesting_for(environment, timerange)
+    data, parsed = backtesting.load_bt_data()
+    _, _, resumed_from = run_backtest(backtesting, data, parsed, store)
+    results = backtesting.all_results["CrossStrategy"]
+    trades = results["results"].drop(columns=["orders"]).reset_index(drop=True)
+    locks = sorted((lock.pair, lock.lock_time, lock.lock_end_time, lock.reason) for lock in PairLocks.locks)
+    return trades, results["final_balance"], locks, resumed_from
+
+
+def test_resumed_run_equals_the_full_run(environment):
+    full_store = CheckpointStore(environment / "full_checkpoints")
+    full_trades, full_balance, full_locks, resumed_from = run(environment, "20250101-20250110", full_store)
+    assert resumed_from is None
+    assert len(full_trades) > 10 and full_locks
+
+    # B: a candle at which the full run holds an open trade.
+    spanning = full_trades[full_trades["close_date"] - full_trades["open_date"] > pd.Timedelta("30min")].iloc[
+        len(full_trades) // 2]
+    split = spanning["open_date"] + pd.Timedelta("10min")
+
+    store = CheckpointStore(environment / "checkpoints")
+    run(environment, f"{int(START.timestamp())}-{int(split.timestamp())}", store)
+    (checkpoint_file,) = store._directory(next(p.name for p in (environment / "checkpoints").glob("*/*"))).glob("*.pkl")
+    checkpoint = store.load(checkpoint_file)
+    open_at_split = pickle.loads(checkpoint.state)["trades"][1]
+    assert [trade.pair for trade in open_at_split] and spanning["pair"] in [trade.pair for trade in open_at_split]
+
+    trades, balance, locks, resumed_from = run(environment, "20250101-20250110", store)
+    assert resumed_from == checkpoint.end
+
+    pd.testing.assert_frame_equal(trades, full_trades)
+    assert balance == full_balance
+    assert locks == full_locks
@@ -0,0 +1,151 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from ftlib.log_shipper import Coalescer, JsonlLogSink, LogParser, LogRecord, LogShipper, TailedFile, discover_logs
+
+
+INSTANCE = "665f1c2e9b1e8a0012345678"
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def record(message: str, level: str = "WARNING", source: str = "freqtrade.strategy") -> LogRecord:
+    return LogRecord(INSTANCE, NOW, level, source, message)
+
+
+@pytest.fixture
+def berlin(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_parser_reads_asctime_as_local_time(berlin):
+    parser = LogParser(INSTANCE)
+    parser.feed(["2025-06-01 12:00:00,250 - freqtrade.worker - INFO - Bot heartbeat."], NOW)
+    (parsed,) = parser.flush()
+    assert parsed.timestamp == datetime(2025, 6, 1, 10, 0, 0, 250000, tzinfo=timezone.utc)
+    assert (parsed.source, parsed.level, parsed.message) == ("freqtrade.worker", "INFO", "Bot heartbeat.")
+
+
+def test_parser_keeps_tracebacks_with_their_record():
+    parser = LogParser(INSTANCE)
+    records = parser.feed([
+        "2025-06-01 12:00:00,000 - freqtrade.strategy - ERROR - Strategy failed",
+        "Traceback (most recent call last):",
+        '  File "strategy.py", line 1',
+        "2025-06-01 12:00:01,000 - freqtrade.worker - INFO - Next",
+    ], NOW)
+    assert [r.message for r in records] == ['Strategy failed\nTraceback (most recent call last):\n'
+                                            '  File "strategy.py", line 1']
+
+
+def test_discover_logs_finds_stdout_in_both_locations(tmp_path):
+    log_dir, base_dir = tmp_path / "backend", tmp_path / "ft_user_data"
+    other = "665f1c2e9b1e8a0087654321"
+    (log_dir).mkdir()
+    (log_dir / f"freqtrade_{INSTANCE}.log").write_text("")
+    (base_dir / INSTANCE).mkdir(parents=True)
+    (base_dir / INSTANCE / "pm2_out.log").write_text("")
+    (base_dir / INSTANCE / "pm2_err.log").write_text("")
+    (base_dir / other / "logs").mkdir(parents=True)
+    (base_dir / other / "logs" / "pm2_out.log").write_text("")
+
+    assert discover_logs(log_dir, base_dir) == {
+        log_dir / f"freqtrade_{INSTANCE}.log": (INSTANCE, False),
+        base_dir / INSTANCE / "pm2_out.log": (INSTANCE, True),
+        base_dir / other / "logs" / "pm2_out.log": (other, True),
+    }
+
+
+# --- coalescing ------------------------------------------------------------------------------
+
+def test_coalescer_passes_the_first_and_counts_repeats():
+    coalescer = Coalescer(window=60)
+    assert coalescer.add(record("Stoploss for BTC/USDT at 0.95"), now=0) is not None
+    assert coalescer.add(record("Stoploss for BTC/USDT at 0.93"), now=10) is None
+    assert coalescer.add(record("Stoploss for BTC/USDT at 0.91"), now=20) is None
+    # Other level, other text: their own windows.
+    assert coalescer.add(record("Stoploss for BTC/USDT at 0.91", level="INFO"), now=20) is not None
+    assert coalescer.add(record("Exit signal for BTC/USDT"), now=20) is not None
+
+    assert coalescer.expire(now=59) == []
+    (summary,) = coalescer.expire(now=60)
+    assert summary.count == 2
+    assert summary.message == "Stoploss for BTC/USDT at 0.93"
+    assert coalescer.suppressed == 2
+    assert len(coalescer) == 2  # The windows opened at 20
+
+    # A new window after expiry passes the first record again.
+    assert coalescer.add(record("Stoploss for BTC/USDT at 0.90"), now=61) is not None
+
+
+def test_coalescer_drops_windows_without_repeats():
+    coalescer = Coalescer(window=60)
+    coalescer.add(record("Once"), now=0)
+    assert coalescer.expire(now=0, everything=True) == []
+
+
+# --- tailing ---------------------------------------------------------------------------------
+
+def test_tailed_file_keeps_partial_lines(tmp_path):
+    path = tmp_path / "pm2_out.log"
+    path.write_text("first\nsec")
+    tailed = TailedFile(path, INSTANCE, stdout=True)
+    assert tailed.read_lines(1024) == ["first"]
+    with path.open("a") as handle:
+        handle.write("ond\n")
+    assert tailed.read_lines(1024) == ["second"]
+
+
+def test_tailed_file_reads_the_rotated_tail_first(tmp_path):
+    path = tmp_path / f"freqtrade_{INSTANCE}.log"
+    path.write_text("one\n")
+    tailed = TailedFile(path, INSTANCE, stdout=False)
+    assert tailed.read_lines(1024) == ["one"]
+
+    # Written after the last read, then rolled over by RotatingFileHandler.
+    with path.open("a") as handle:
+        handle.write("two\n")
+    path.rename(path.with_name(path.name + ".1"))
+    path.write_text("three\n")
+    assert tailed.read_lines(1024) == ["two", "three"]
+
+
+def test_tailed_file_rereads_a_truncated_file(tmp_path):
+    path = tmp_path / "pm2_out.log"
+    path.write_text("one\ntwo\n")
+    tailed = TailedFile(path, INSTANCE, stdout=True)
+    assert tailed.read_lines(1024) == ["one", "two"]
+    path.write_text("new\n")
+    assert tailed.read_lines(1024) == ["new"]
+
+
+def test_shipper_resumes_from_its_offsets(tmp_path):
+    log_dir, base_dir = tmp_path / "backend", tmp_path / "ft_user_data"
+    log_dir.mkdir()
+    base_dir.mkdir()
+    log = log_dir / f"freqtrade_{INSTANCE}.log"
+    sink_path, state_path = tmp_path / "botlogs.jsonl", tmp_path / "state.json"
+
+    def ship() -> list[tuple]:
+        shipper = LogShipper(JsonlLogSink(sink_path), state_path, log_dir, base_dir)
+        try:
+            shipper.run_once()
+        finally:
+            shipper.close()
+        return [(doc["message"], doc["count"]) for doc in map(json.loads, sink_path.read_text().splitlines())]
+
+    log.write_text("".join(f"2025-06-01 12:00:0{i},000 - freqtrade.strategy - WARNING - Low volume {i}\n"
+                           for i in range(3)))
+    assert ship() == [("Low volume 0", 1), ("Low volume 1", 2)]
+
+    with log.open("a") as handle:
+        handle.write("2025-06-01 12:00:05,000 - freqtrade.worker - INFO - Done\n")
+        handle.write("2025-06-01 12:00:06,000 - freqtrade.worker - DEBUG - Below the level\n")
+    assert ship()[2:] == [("Done", 1)]
@@ -0,0 +1,18 @@
+from ftlib import lookahead_check
+from ftlib.lookahead_check import main, sample_prefixes
+
+
+def test_prefixes_start_after_the_startup_period():
+    assert sample_prefixes(181, 200, 32).size == 0
+    ends = sample_prefixes(1000, 200, 32)
+    assert len(ends) == 32 and ends.min() == 201 and ends.max() == 999
+
+
+def test_startup_covering_the_history_is_an_error(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "Warmup.py"
+    path.write_text("class Warmup:\n    startup_candle_count = 200\n    timeframe = '4h'\n")
+    monkeypatch.setattr(lookahead_check, "strategy_classes", lambda module: [module.Warmup])
+    monkeypatch.setattr(lookahead_check, "load_strategy",
+                        lambda path, name, pair: lookahead_check.load_module(path).Warmup())
+    assert main([str(path), "--synthetic", "--candles", "181"]) == 1
+    assert "Warmup: error - insufficient data - 181 candles with a startup of 200" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import json
+from datetime import datetime, timezone
+
+from ftlib.pnl_rollups import Contribution, JsonlRollups, bucket_deltas
+
+
+CREATED = datetime(2025, 6, 1, 13, 45, tzinfo=timezone.utc)
+
+
+def contribution(profit: float, fees: float = 0.0, created_at: datetime = CREATED) -> Contribution:
+    return Contribution("instance", "user", created_at, profit, profit + fees, fees)
+
+
+def daily(deltas, scope: str = "instance"):
+    return deltas[(scope, scope, "daily", datetime(2025, 6, 1, tzinfo=timezone.utc))]
+
+
+def test_new_trade_adds_to_every_bucket():
+    deltas = bucket_deltas([(None, contribution(10.0))])
+    assert len(deltas) == 6
+    assert daily(deltas) == {"profit": 10.0, "grossProfit": 10.0, "fees": 0.0, "trades": 1, "wins": 1, "losses": 0}
+    assert deltas[("user", "user", "hourly", datetime(2025, 6, 1, 13, tzinfo=timezone.utc))]["trades"] == 1
+
+
+def test_fee_applied_later_moves_only_the_difference():
+    deltas = bucket_deltas([(contribution(10.0), contribution(8.0, fees=2.0))])
+    assert daily(deltas) == {"profit": -2.0, "grossProfit": 0.0, "fees": 2.0, "trades": 0, "wins": 0, "losses": 0}
+
+
+def test_unchanged_trade_and_reopen():
+    assert bucket_deltas([(contribution(10.0), contribution(10.0))]) == {}
+    reopened = bucket_deltas([(contribution(-3.0), None)])
+    assert daily(reopened) == {"profit": 3.0, "grossProfit": 3.0, "fees": 0.0, "trades": -1, "wins": 0, "losses": -1}
+
+
+def test_ledger_round_trip():
+    old = contribution(5.0, fees=1.0)
+    ledger = {**old.to_ledger(), "createdAt": old.created_at.isoformat()}
+    assert Contribution.from_ledger(ledger) == old
+
+
+def test_jsonl_rollups_subtract_reopened_trades(tmp_path):
+    source = tmp_path / "trades.jsonl"
+
+    def export(status: str, profit: float) -> str:
+        document = {"botInstanceId": "a" * 24, "status": status, "grossProfit": profit,
+                    "openDate": CREATED.isoformat(), "tradeDetails": {"ftTradeId": 1}}
+        return json.dumps({"document": document}) + "\n"
+
+    source.write_text(export("closed", 4.0))
+    rollups = JsonlRollups(source, tmp_path / "out")
+    rollups.run_once()
+    with source.open("a") as handle:
+        handle.write(export("open", 0.0) + export("closed", 6.0))
+    # A restarted job resumes from the saved offset and ledger.
+    JsonlRollups(source, tmp_path / "out").run_once()
+
+    rollup = json.loads((tmp_path / "out" / "instance" / f"{'a' * 24}.json").read_text())
+    assert rollup["daily"][datetime(2025, 6, 1, tzinfo=timezone.utc).isoformat()]["profit"] == 6.0
+    assert rollup["monthly"][datetime(2025, 6, 1, tzinfo=timezone.utc).isoformat()]["trades"] == 1
@@ -0,0 +1,35 @@
+import textwrap
+
+from ftlib.startup_profile import module_imports
+
+
+STRATEGY = textwrap.dedent('''
+    import numpy as np
+    from ftlib.lazy_import import lazy_import
+
+    pta = lazy_import("pandas_ta")
+    preprocessing = lazy_import("sklearn.preprocessing")
+
+
+    class Sample:
+
+        def populate_indicators(self, dataframe, metadata):
+            return self.base_indicators(dataframe)
+
+        def base_indicators(self, dataframe):
+            dataframe["cti"] = pta.cti(dataframe["close"])
+            return dataframe
+
+        def custom_exit(self, pair, trade, current_time, **kwargs):
+            return preprocessing.scale([1.0])
+''')
+
+
+def test_lazy_imports_used_on_startup_are_not_deferred(tmp_path):
+    path = tmp_path / "Sample.py"
+    path.write_text(STRATEGY)
+    imports = {entry["module"]: entry for entry in module_imports(path)}
+
+    assert imports["numpy"]["used"] == []
+    assert imports["pandas_ta"]["lazy"] and imports["pandas_ta"]["startup"]
+    assert imports["sklearn.preprocessing"]["lazy"] and not imports["sklearn.preprocessing"]["startup"]
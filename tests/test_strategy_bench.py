@@ -0,0 +1,16 @@
+import pandas as pd
+
+from ftlib.strategy_bench import load_candles, synthetic_candles
+
+
+def test_load_candles_resamples_the_longest_history(tmp_path):
+    synthetic_candles(60 * 24 * 10, "1m").to_feather(tmp_path / "BTC_USDT-1m.feather")
+    synthetic_candles(4 * 24 * 100, "15m").to_feather(tmp_path / "BTC_USDT-15m.feather")
+    synthetic_candles(6 * 20, "4h").to_feather(tmp_path / "BTC_USDT-4h.feather")
+
+    frame = load_candles("BTC/USDT", "4h", tmp_path)
+    assert len(frame) == 6 * 100
+    assert frame["date"].diff().dropna().eq(pd.Timedelta("4h")).all()
+    # An exact file with the longest history is used as is.
+    assert len(load_candles("BTC/USDT", "15m", tmp_path)) == 4 * 24 * 100
+    assert load_candles("ETH/USDT", "4h", tmp_path) is None
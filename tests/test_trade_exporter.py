@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from ftlib.trade_exporter import JsonlSink, TradeExporter, load_state
+
+
+INSTANCE = "665f1c2e9b1e8a0012345678"
+
+
+@pytest.fixture
+def database(tmp_path):
+    """
+    A trade database with freqtrade's trades / orders tables (the columns the exporter reads).
+    """
+    path = tmp_path / "instances" / INSTANCE / "tradesv3.sqlite"
+    path.parent.mkdir(parents=True)
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE trades (
+            id INTEGER PRIMARY KEY, pair TEXT, is_open BOOLEAN, is_short BOOLEAN, open_rate FLOAT,
+            close_rate FLOAT, amount FLOAT, stake_amount FLOAT, leverage FLOAT, open_date DATETIME,
+            close_date DATETIME, close_profit FLOAT, close_profit_abs FLOAT, realized_profit FLOAT,
+            exit_reason TEXT, enter_tag TEXT, strategy TEXT, exchange TEXT
+        );
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY, ft_trade_id INTEGER, order_id TEXT, ft_order_side TEXT, order_type TEXT,
+            status TEXT, price FLOAT, average FLOAT, amount FLOAT, filled FLOAT, cost FLOAT,
+            order_date DATETIME, order_filled_date DATETIME
+        );
+    """)
+    connection.close()
+    return path
+
+
+def execute(path, sql: str, *params) -> None:
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(sql, params)
+    connection.close()
+    # The exporter skips databases whose stamp did not change; make every write visible.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def open_trade(path, trade_id: int, order_id: int) -> None:
+    execute(path, "INSERT INTO trades (id, pair, is_open, open_rate, amount, open_date, realized_profit)"
+                  " VALUES (?, 'BTC/USDT', 1, 100, 1, '2025-06-01 10:00:00', 0)", trade_id)
+    add_order(path, order_id, trade_id, "buy")
+
+
+def add_order(path, order_id: int, trade_id: int, side: str) -> None:
+    execute(path, "INSERT INTO orders (id, ft_trade_id, order_id, ft_order_side, status, amount, filled)"
+                  " VALUES (?, ?, ?, ?, 'closed', 1, 1)", order_id, trade_id, f"o{order_id}", side)
+
+
+def close_trade(path, trade_id: int, profit: float) -> None:
+    execute(path, "UPDATE trades SET is_open = 0, close_rate = 110, close_profit_abs = ?,"
+                  " close_date = '2025-06-02 10:00:00' WHERE id = ?", profit, trade_id)
+
+
+def exported(path) -> list[tuple]:
+    if not path.exists():
+        return []
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    return [(line["document"]["tradeDetails"]["ftTradeId"], line["document"]["status"]) for line in lines]
+
+
+def test_watermarks(tmp_path, database):
+    sink_path, state_path = tmp_path / "trades.jsonl", tmp_path / "state.json"
+
+    def run_pass() -> list[tuple]:
+        # A fresh exporter each pass: the state must survive a restart.
+        before = len(exported(sink_path))
+        TradeExporter(JsonlSink(sink_path), state_path, database.parent.parent).run_once()
+        return exported(sink_path)[before:]
+
+    open_trade(database, 1, 1)
+    open_trade(database, 2, 2)
+    assert run_pass() == [(1, "open"), (2, "open")]
+    assert load_state(state_path)[INSTANCE].trade_id == 2
+    assert load_state(state_path)[INSTANCE].order_id == 2
+
+    # Unchanged database: not read at all.
+    assert run_pass() == []
+
+    # Touched, but no trade changed: open trades are not re-emitted.
+    execute(database, "CREATE TABLE unrelated (id INTEGER)")
+    assert run_pass() == []
+
+    # New order on an open trade (DCA), and a close without a new order (stoploss on exchange).
+    add_order(database, 3, 1, "buy")
+    close_trade(database, 2, 5.0)
+    assert run_pass() == [(1, "open"), (2, "closed")]
+    assert set(load_state(state_path)[INSTANCE].open_trades) == {"1"}
+
+    # A closed trade is not re-emitted; a new trade is.
+    open_trade(database, 3, 4)
+    assert run_pass() == [(3, "open")]
+
+    # Exit order and close of trade 1.
+    add_order(database, 5, 1, "sell")
+    close_trade(database, 1, -2.0)
+    assert run_pass() == [(1, "closed")]
+    assert load_state(state_path)[INSTANCE].open_trades.keys() == {"3"}
+
+
+def test_unreadable_database_keeps_its_watermark(tmp_path, database):
+    sink_path, state_path = tmp_path / "trades.jsonl", tmp_path / "state.json"
+    exporter = TradeExporter(JsonlSink(sink_path), state_path, database.parent.parent)
+    open_trade(database, 1, 1)
+    exporter.run_once()
+
+    execute(database, "DROP TABLE orders")
+    assert exporter.run_once() == {}
+    assert load_state(state_path)[INSTANCE].trade_id == 1
@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from ftlib.trade_query import FederatedTrades, QueryError
+
+
+def make_database(base_dir, instance_id: str, trades: list[tuple], columns: str = "id, pair, is_open") -> None:
+    path = base_dir / instance_id / "tradesv3.sqlite"
+    path.parent.mkdir(parents=True)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(f"CREATE TABLE trades ({columns})")
+        connection.executemany(f"INSERT INTO trades VALUES ({','.join('?' * len(trades[0]))})", trades)
+    connection.close()
+
+
+@pytest.fixture
+def federated(tmp_path):
+    make_database(tmp_path, "a" * 24, [(1, "BTC/USDT", 1), (2, "ETH/USDT", 0)])
+    make_database(tmp_path, "b" * 24, [(1, "BTC/USDT", 1)])
+    trades = FederatedTrades(tmp_path, workers=2)
+    yield trades
+    trades.close()
+
+
+def test_query_concatenates_instances(federated):
+    table = federated.query("SELECT pair FROM trades WHERE is_open = 1 ORDER BY id")
+    assert sorted(zip(table["instance_id"].to_pylist(), table["pair"].to_pylist())) == [
+        ("a" * 24, "BTC/USDT"), ("b" * 24, "BTC/USDT")]
+    assert federated.errors == {}
+
+
+def test_bad_sql_raises_instead_of_returning_nothing(federated):
+    with pytest.raises(QueryError) as raised:
+        federated.query("SELECT pair FROM trades WHERE pair =")
+    assert set(raised.value.errors) == {"a" * 24, "b" * 24}
+    assert "query failed on 2 databases" in str(raised.value)
+
+
+def test_databases_without_the_table_are_skipped(tmp_path, federated):
+    (tmp_path / ("c" * 24)).mkdir()
+    sqlite3.connect(tmp_path / ("c" * 24) / "tradesv3.sqlite").close()
+    federated._listed_at = 0.0
+    assert federated.query("SELECT * FROM trades").num_rows == 3
+    assert federated.errors == {}
+
+
+def test_errors_of_some_databases_are_reported(tmp_path):
+    make_database(tmp_path, "a" * 24, [(1, "BTC/USDT", 1, "x")], "id, pair, is_open, enter_tag")
+    make_database(tmp_path, "b" * 24, [(1, "BTC/USDT", 1)])
+    trades = FederatedTrades(tmp_path, workers=2)
+    try:
+        assert trades.query("SELECT enter_tag FROM trades").num_rows == 1
+        assert list(trades.errors) == ["b" * 24]
+        assert "no such column" in trades.errors["b" * 24]
+    finally:
+        trades.close()
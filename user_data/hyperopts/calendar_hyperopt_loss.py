@@ -0,0 +1,125 @@
+"""
+Daily-equity hyperopt losses: Sharpe, Sortino, Calmar and drawdown-aware profit.
+
+These compute the same daily series as freqtrade's ``*HyperOptLossDaily`` losses,
+but the day buckets for ``min_date..max_date`` are built once per hyperopt run
+(``ftlib.calendar_bins.day_bins``) instead of calling ``DataFrame.resample`` every epoch.
+
+Usage:
+    freqtrade hyperopt --hyperopt-loss CalendarSharpeHyperOptLoss ...
+"""
+from datetime import datetime
+
+from pandas import DataFrame
+
+from freqtrade.constants import Config
+from freqtrade.optimize.hyperopt import IHyperOptLoss
+
+from ftlib.calendar_bins import calmar, daily_sum, day_bins, max_drawdown, sharpe, sortino
+
+
+# Assumed slippage per trade (entry + exit), same as freqtrade's daily losses.
+SLIPPAGE_PER_TRADE_RATIO = 0.0005
+
+# Weight of the drawdown penalty in CalendarDrawdownHyperOptLoss.
+# 1.0 means a 10% drawdown costs as much as 10% of profit.
+DRAWDOWN_WEIGHT = 1.0
+
+# Loss returned when an epoch has no trades at all.
+NO_TRADES_LOSS = 100.0
+
+
+def _daily_returns(results: DataFrame, min_date: datetime, max_date: datetime):
+    profit = results["profit_ratio"].to_numpy() - SLIPPAGE_PER_TRADE_RATIO
+    return day_bins(min_date, max_date).sum(results["close_date"], profit)
+
+
+def _starting_balance(config: Config) -> float:
+    wallet = config.get("dry_run_wallet", 1000)
+    if isinstance(wallet, dict):
+        # Multi-currency dry-run wallet - only the stake currency matters here.
+        wallet = wallet.get(config.get("stake_currency"), 0)
+    return float(wallet)
+
+
+class CalendarSharpeHyperOptLoss(IHyperOptLoss):
+    """
+    Optimizes the annualized Sharpe ratio of daily returns.
+    """
+
+    @staticmethod
+    def hyperopt_loss_function(
+        results: DataFrame,
+        trade_count: int,
+        min_date: datetime,
+        max_date: datetime,
+        *args,
+        **kwargs,
+    ) -> float:
+        if trade_count == 0:
+            return NO_TRADES_LOSS
+        return -sharpe(_daily_returns(results, min_date, max_date))
+
+
+class CalendarSortinoHyperOptLoss(IHyperOptLoss):
+    """
+    Optimizes the annualized Sortino ratio of daily returns.
+    """
+
+    @staticmethod
+    def hyperopt_loss_function(
+        results: DataFrame,
+        trade_count: int,
+        min_date: datetime,
+        max_date: datetime,
+        *args,
+        **kwargs,
+    ) -> float:
+        if trade_count == 0:
+            return NO_TRADES_LOSS
+        return -sortino(_daily_returns(results, min_date, max_date))
+
+
+class CalendarCalmarHyperOptLoss(IHyperOptLoss):
+    """
+    Optimizes annualized return over the max drawdown of the daily equity curve.
+    """
+
+    @staticmethod
+    def hyperopt_loss_function(
+        results: DataFrame,
+        trade_count: int,
+        min_date: datetime,
+        max_date: datetime,
+        config: Config,
+        *args,
+        **kwargs,
+    ) -> float:
+        if trade_count == 0:
+            return NO_TRADES_LOSS
+        profits = daily_sum(results, "profit_abs", min_date, max_date)
+        return -calmar(profits, _starting_balance(config))
+
+
+class CalendarDrawdownHyperOptLoss(IHyperOptLoss):
+    """
+    Optimizes relative profit, penalized by the max drawdown of the daily equity curve.
+    """
+
+    @staticmethod
+    def hyperopt_loss_function(
+        results: DataFrame,
+        trade_count: int,
+        min_date: datetime,
+        max_date: datetime,
+        config: Config,
+        *args,
+        **kwargs,
+    ) -> float:
+        if trade_count == 0:
+            return NO_TRADES_LOSS
+        starting_balance = _starting_balance(config)
+        profits = daily_sum(results, "profit_abs", min_date, max_date)
+        total_profit = profits.sum() / starting_balance
+        drawdown = max_drawdown(profits, starting_balance)
+        return -(total_profit - DRAWDOWN_WEIGHT * drawdown)
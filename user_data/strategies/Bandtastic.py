@@ -4,9 +4,13 @@ import pandas as pd
 from functools import reduce
 from pandas import DataFrame
 from datetime import datetime
+from typing import Optional
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy import IStrategy, CategoricalParameter, DecimalParameter, IntParameter, RealParameter
 
+from ftlib.bollinger import BollingerFamily
+from ftlib.stake_sizing import StakeSizingMixin
+
 __author__ = "Robert Roman"
 __copyright__ = "Free For Use"
 __license__ = "MIT"
@@ -19,7 +23,7 @@ __BTC_donation__ = "3FgFaG15yntZYSUzfEpxr5mDt1RArvcQrK"
 # Optimized With Sharpe Ratio and 1 year data
 # 199/40000:  30918 trades. 18982/3408/8528 Wins/Draws/Losses. Avg profit   0.39%. Median profit   0.65%. Total profit  119934.26007495 USDT ( 119.93%). Avg duration 8:12:00 min. Objective: -127.60220
 
-class Bandtastic(IStrategy):
+class Bandtastic(StakeSizingMixin, IStrategy):
     INTERFACE_VERSION = 3
 
     timeframe = '15m'
@@ -52,22 +56,24 @@ class Bandtastic(IStrategy):
     stake_amount = 10 # Default to 10 USDT if custom_stake_amount fails
     stake_currency = 'USDT'
 
-    def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float, 
-                            fiat_currency: str, wallet_balance: float, 
-                            current_temp_trade_balance: float) -> float:
-        
-        # Ensure wallet_balance is within the specified range
-        if wallet_balance < self.min_account_balance.value:
-            return 0  # Do not trade if balance is too low
-        if wallet_balance > self.max_account_balance.value:
-            wallet_balance = self.max_account_balance.value # Cap balance for calculation
-
-        # Calculate stake amount based on percentage
-        calculated_stake = wallet_balance * self.stake_percentage.value
-
-        # Ensure the calculated stake is not less than the minimum allowed by Freqtrade (usually 10 USDT)
-        # and not more than the wallet balance
-        return max(10.0, min(calculated_stake, wallet_balance))
+    def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
+                            proposed_stake: float, min_stake: Optional[float], max_stake: float,
+                            leverage: float, entry_tag: Optional[str], side: str,
+                            **kwargs) -> float:
+        snapshot = self.stake_sizer.snapshot
+        if snapshot is None:
+            return proposed_stake
+
+        # Do not trade if balance is too low
+        if snapshot.total < self.min_account_balance.value:
+            return 0
+
+        # stake_percentage of the balance (capped at max_account_balance), not less than
+        # the minimum allowed by Freqtrade (usually 10 USDT) and not more than what is left
+        stake = self.stake_sizer.risk_stake(pair, self.stake_percentage.value,
+                                            min_stake=max(10.0, min_stake or 0), max_stake=max_stake,
+                                            basis="total", balance_cap=self.max_account_balance.value)
+        return stake or 0
 
     # Hyperopt Buy Parameters
     buy_fastema = IntParameter(low=1, high=236, default=211, space='buy', optimize=True, load=True)
@@ -96,26 +102,17 @@ class Bandtastic(IStrategy):
         dataframe['rsi'] = ta.RSI(dataframe)
         dataframe['mfi'] = ta.MFI(dataframe)
 
-        # Bollinger Bands 1,2,3 and 4
-        bollinger1 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=1)
-        dataframe['bb_lowerband1'] = bollinger1['lower']
-        dataframe['bb_middleband1'] = bollinger1['mid']
-        dataframe['bb_upperband1'] = bollinger1['upper']
-
-        bollinger2 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=2)
-        dataframe['bb_lowerband2'] = bollinger2['lower']
-        dataframe['bb_middleband2'] = bollinger2['mid']
-        dataframe['bb_upperband2'] = bollinger2['upper']
-
-        bollinger3 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=3)
-        dataframe['bb_lowerband3'] = bollinger3['lower']
-        dataframe['bb_middleband3'] = bollinger3['mid']
-        dataframe['bb_upperband3'] = bollinger3['upper']
-
-        bollinger4 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=4)
-        dataframe['bb_lowerband4'] = bollinger4['lower']
-        dataframe['bb_middleband4'] = bollinger4['mid']
-        dataframe['bb_upperband4'] = bollinger4['upper']
+        # Bollinger Bands 1,2,3 and 4 - one rolling mean / std for all of them
+        bollinger = BollingerFamily(qtpylib.typical_price(dataframe), window=20)
+        bands = {}
+        for stds in (1, 2, 3, 4):
+            bands.update(bollinger.columns(
+                stds,
+                lower=f'bb_lowerband{stds}',
+                mid=f'bb_middleband{stds}',
+                upper=f'bb_upperband{stds}',
+            ))
+        dataframe = dataframe.assign(**bands)
         # Build EMA rows - combine all ranges to a single set to avoid duplicate calculations.
         for period in set(
                 list(self.buy_fastema.range)
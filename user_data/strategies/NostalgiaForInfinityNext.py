@@ -1,7 +1,6 @@
 import copy
 import logging
 import pathlib
-import rapidjson
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy as np
 import talib.abstract as ta
@@ -10,14 +9,14 @@ from freqtrade.strategy import merge_informative_pair, timeframe_to_minutes
 from freqtrade.exchange import timeframe_to_prev_date
 from freqtrade.data.dataprovider import DataProvider
 from pandas import DataFrame, Series, concat
-from functools import reduce
 import math
 from typing import Dict
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
-from technical.util import resample_to_interval, resampled_merge
-from technical.indicators import zema, VIDYA, ichimoku
 import pandas_ta as pta
+from ftlib.callback_metrics import CallbackMetricsMixin
+from ftlib.compact_frame import CompactFrameMixin
+from ftlib.signal_expr import all_of, col, compile_signals
 import time
 from freqtrade.strategy import DecimalParameter, CategoricalParameter
 
@@ -36,7 +35,7 @@ log = logging.getLogger(__name__)
 ##  Binance: https://accounts.binance.com/en/register?ref=EAZC47FM (5% discount on trading fees)         ##
 ##  Kucoin: https://www.kucoin.com/r/QBSSSPYV (5% discount on trading fees)
 
-class NostalgiaForInfinityNext(IStrategy):
+class NostalgiaForInfinityNext(CallbackMetricsMixin, CompactFrameMixin, IStrategy):
     """
     NostalgiaForInfinityNext strategy
     """
@@ -92,21 +91,18 @@ class NostalgiaForInfinityNext(IStrategy):
         dataframe.loc[:, 'buy'] = 0
         dataframe.loc[:, 'buy_tag'] = ''
 
-        conditions = []
-        for index in range(1, 6):
-            item_buy_logic = []
-            if self.buy_rsi_enable:
-                item_buy_logic.append(dataframe['rsi'] < self.buy_rsi_value)
-            item_buy_logic.append(dataframe['close'] < dataframe['ema50'])
-            if self.buy_cti_enable:
-                item_buy_logic.append(dataframe['cti'] > self.buy_cti_value)
-            item_buy_logic.append(dataframe['volume'] > 0)
-            item_buy = reduce(lambda x, y: x & y, item_buy_logic)
-            dataframe.loc[item_buy, 'buy_tag'] += f"{index} "
-            conditions.append(item_buy)
-
-        if conditions:
-            dataframe.loc[:, 'buy'] = reduce(lambda x, y: x | y, conditions)
+        # The five tagged conditions are identical: evaluate once, tag every index.
+        item_buy_logic = []
+        if self.buy_rsi_enable:
+            item_buy_logic.append(col('rsi') < self.buy_rsi_value)
+        item_buy_logic.append(col('close') < col('ema50'))
+        if self.buy_cti_enable:
+            item_buy_logic.append(col('cti') > self.buy_cti_value)
+        item_buy_logic.append(col('volume') > 0)
+        item_buy = compile_signals(buy=all_of(*item_buy_logic)).evaluate(dataframe)['buy']
+
+        dataframe.loc[item_buy, 'buy_tag'] = "".join(f"{index} " for index in range(1, 6))
+        dataframe.loc[:, 'buy'] = item_buy
 
         return dataframe
 
@@ -121,20 +117,14 @@ class NostalgiaForInfinityNext(IStrategy):
         """
         dataframe.loc[:, 'sell'] = 0
 
-        conditions = []
-        for index in range(1, 6):
-            item_sell_logic = []
-            if self.sell_rsi_enable:
-                item_sell_logic.append(dataframe['rsi'] > self.sell_rsi_value)
-            item_sell_logic.append(dataframe['close'] > dataframe['ema50'])
-            if self.sell_cti_enable:
-                item_sell_logic.append(dataframe['cti'] < self.sell_cti_value)
-            item_sell_logic.append(dataframe['volume'] > 0)
-            item_sell = reduce(lambda x, y: x & y, item_sell_logic)
-            conditions.append(item_sell)
-
-        if conditions:
-            dataframe.loc[:, 'sell'] = reduce(lambda x, y: x | y, conditions)
+        item_sell_logic = []
+        if self.sell_rsi_enable:
+            item_sell_logic.append(col('rsi') > self.sell_rsi_value)
+        item_sell_logic.append(col('close') > col('ema50'))
+        if self.sell_cti_enable:
+            item_sell_logic.append(col('cti') < self.sell_cti_value)
+        item_sell_logic.append(col('volume') > 0)
+        dataframe.loc[:, 'sell'] = compile_signals(sell=all_of(*item_sell_logic)).evaluate(dataframe)['sell']
 
         return dataframe
 
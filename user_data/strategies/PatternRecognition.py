@@ -13,9 +13,7 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # Add your lib to import here
 import talib
 import talib.abstract as ta
-import pandas_ta as pta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-from technical.util import resample_to_interval, resampled_merge
 
 
 class PatternRecognition(IStrategy):
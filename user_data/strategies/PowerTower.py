@@ -14,8 +14,24 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # --------------------------------
 # Add your lib to import here
 import talib.abstract as ta
-import pandas_ta as pta
-from technical import qtpylib
+
+from ftlib.signal_expr import col, compile_signals, var
+
+
+close = col('close')
+
+# close[t - k] > close[t - k - 2] ** pow for three consecutive candles.
+ENTRY_PLAN = compile_signals(enter_long=(
+        (close.shift(0) > close.shift(2) ** var('pow')) &
+        (close.shift(1) > close.shift(3) ** var('pow')) &
+        (close.shift(2) > close.shift(4) ** var('pow'))
+))
+
+EXIT_PLAN = compile_signals(exit_long=(
+        (close.shift(0) < close.shift(2) ** var('pow')) |
+        (close.shift(1) < close.shift(3) ** var('pow')) |
+        (close.shift(2) < close.shift(4) ** var('pow'))
+))
 
 
 class PowerTower(IStrategy):
@@ -82,23 +98,11 @@ class PowerTower(IStrategy):
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        dataframe.loc[
-            (
-                    (dataframe['close'].shift(0) > dataframe['close'].shift(2) ** self.buy_pow.value) &
-                    (dataframe['close'].shift(1) > dataframe['close'].shift(3) ** self.buy_pow.value) &
-                    (dataframe['close'].shift(2) > dataframe['close'].shift(4) ** self.buy_pow.value)
-
-            ),
-            'enter_long'] = 1
+        ENTRY_PLAN.apply(dataframe, pow=self.buy_pow.value)
 
         return dataframe
 
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        dataframe.loc[(
-                (dataframe['close'].shift(0) < dataframe['close'].shift(2) ** self.sell_pow.value) |
-                (dataframe['close'].shift(1) < dataframe['close'].shift(3) ** self.sell_pow.value) |
-                (dataframe['close'].shift(2) < dataframe['close'].shift(4) ** self.sell_pow.value)
-        ),
-        'exit_long'] = 1
+        EXIT_PLAN.apply(dataframe, pow=self.sell_pow.value)
 
         return dataframe
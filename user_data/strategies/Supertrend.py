@@ -19,7 +19,9 @@ from pandas import DataFrame
 import talib.abstract as ta
 import numpy as np
 
-class Supertrend(IStrategy):
+from ftlib.compact_frame import CompactFrameMixin
+
+class Supertrend(CompactFrameMixin, IStrategy):
     # Buy params, Sell params, ROI, Stoploss and Trailing Stop are values generated by 'freqtrade hyperopt --strategy Supertrend --hyperopt-loss ShortTradeDurHyperOptLoss --timerange=20210101- --timeframe=1h --spaces all'
     # It's encourage you find the values that better suites your needs and risk management strategies
 
@@ -18,6 +18,8 @@ import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy
 
+from ftlib.oscillators import unique_periods
+
 
 
 # CCI timerperiods and values
@@ -73,17 +75,13 @@ class SwingHighToSky(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        for val in self.buy_cciTime.range:
-            dataframe[f'cci-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.sell_cciTime.range:
-            dataframe[f'cci-sell-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.buy_rsiTime.range:
-            dataframe[f'rsi-{val}'] = ta.RSI(dataframe, timeperiod=val)
-
-        for val in self.sell_rsiTime.range:
-            dataframe[f'rsi-sell-{val}'] = ta.RSI(dataframe, timeperiod=val)
+        # Buy and sell ranges overlap - every period is computed once and shared.
+        cci_periods = unique_periods(self.buy_cciTime.range, self.sell_cciTime.range)
+        rsi_periods = unique_periods(self.buy_rsiTime.range, self.sell_rsiTime.range)
+        dataframe = dataframe.assign(
+            **{f'cci-{val}': ta.CCI(dataframe, timeperiod=val) for val in cci_periods},
+            **{f'rsi-{val}': ta.RSI(dataframe, timeperiod=val) for val in rsi_periods},
+        )
 
         return dataframe
 
@@ -102,8 +100,8 @@ class SwingHighToSky(IStrategy):
 
         dataframe.loc[
             (
-                (dataframe[f'cci-sell-{self.sell_cciTime.value}'] > self.sell_cci.value) &
-                (dataframe[f'rsi-sell-{self.sell_rsiTime.value}'] > self.sell_rsi.value)
+                (dataframe[f'cci-{self.sell_cciTime.value}'] > self.sell_cci.value) &
+                (dataframe[f'rsi-{self.sell_rsiTime.value}'] > self.sell_rsi.value)
             ),
             'exit_long'] = 1
 
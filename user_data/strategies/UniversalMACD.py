@@ -14,8 +14,6 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # --------------------------------
 # Add your lib to import here
 import talib.abstract as ta
-import pandas_ta as pta
-from technical import qtpylib
 
 
 class UniversalMACD(IStrategy):
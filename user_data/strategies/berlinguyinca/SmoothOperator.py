@@ -9,9 +9,61 @@ import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy  # noqa
 
+from ftlib.bollinger import BollingerFamily
+from ftlib.signal_expr import all_of, any_of, col, compile_signals
+
 # DO NOT USE, just playing with smooting and graphs!
 
 
+average, smooth = col('average'), col('mfi_rsi_cci_smooth')
+cci, rsi, mfi = col('cci'), col('rsi'), col('mfi')
+low, close, bb_middleband = col('low'), col('close'), col('bb_middleband')
+
+ENTRY_PLAN = compile_signals(enter_long=(
+    any_of(
+        # simple v bottom shape (lopsided to the left to increase reactivity)
+        # which has to be below a very slow average
+        # this pattern only catches a few, but normally very good buy points
+        all_of(
+            average.shift(5) > average.shift(4),
+            average.shift(4) > average.shift(3),
+            average.shift(3) > average.shift(2),
+            average.shift(2) > average.shift(1),
+            average.shift(1) < average.shift(0),
+            low.shift(1) < bb_middleband,
+            cci.shift(1) < -100,
+            rsi.shift(1) < 30,
+        ),
+        # buy in very oversold conditions
+        all_of(low < bb_middleband, cci < -200, rsi < 30, mfi < 30),
+        # etc tends to trade like this
+        # over very long periods of slowly building up coins
+        # does not happen often, but once in a while
+        all_of(mfi < 10, cci < -150, rsi < mfi),
+    )
+    # ensure we have an overall uptrend
+    & (close > close.shift())
+))
+
+# different strategy used for sell points, due to be able to duplicate it to 100%
+EXIT_PLAN = compile_signals(exit_long=any_of(
+    #   This generates very nice sale points, and mostly sit's one stop behind
+    #   the top of the peak
+    all_of(
+        smooth > 100,
+        smooth.shift(1) > smooth,
+        smooth.shift(2) < smooth.shift(1),
+        smooth.shift(3) < smooth.shift(2),
+    ),
+    #   This helps with very long, sideways trends, to get out of a market before
+    #   it dumps
+    all_of(*(col('open').shift(i) < close.shift(i) for i in range(9))),
+    # in case of very overbought market, like some one pumping
+    # sell
+    (cci > 200) & (rsi > 70),
+))
+
+
 class SmoothOperator(IStrategy):
     """
 
@@ -52,7 +104,9 @@ class SmoothOperator(IStrategy):
 
         ##################################################################################
         # required for graphing
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=20, stds=2)
+        # one rolling mean / std for the 2 and 1.6 std bands
+        bollinger_family = BollingerFamily(dataframe['close'], window=20)
+        bollinger = bollinger_family.bands(2)
         dataframe['bb_lowerband'] = bollinger['lower']
         dataframe['bb_upperband'] = bollinger['upper']
         dataframe['bb_middleband'] = bollinger['mid']
@@ -65,7 +119,7 @@ class SmoothOperator(IStrategy):
 
         ##################################################################################
         # required for entry
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=20, stds=1.6)
+        bollinger = bollinger_family.bands(1.6)
         dataframe['entry_bb_lowerband'] = bollinger['lower']
         dataframe['entry_bb_upperband'] = bollinger['upper']
         dataframe['entry_bb_middleband'] = bollinger['mid']
@@ -103,105 +157,11 @@ class SmoothOperator(IStrategy):
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        dataframe.loc[
-            (
-
-                # protection against pump and dump
-                #     (dataframe['volume'] < (dataframe['volume'].rolling(window=30).mean().shift(1) * 20))
-                #
-                #     & (dataframe['macd'] < dataframe['macdsignal'])
-                #     & (dataframe['macd'] > 0)
-
-                # # spike below entry band for 3 consecutive ticks
-                # & (dataframe['low'] < dataframe['entry_bb_lowerband'])
-                # & (dataframe['low'].shift(1) < dataframe['bb_lowerband'].shift(1))
-                # & (dataframe['low'].shift(2) < dataframe['bb_lowerband'].shift(2))
-                # # pattern recognition
-                # & (
-                #         (dataframe['close'] > dataframe['open'])
-                #         | (dataframe['CDLHAMMER'] == 100)
-                #         | (dataframe['CDLINVERTEDHAMMER'] == 100)
-                #         | (dataframe['CDLDRAGONFLYDOJI'] == 100)
-                # )
-                # bottom curve detection
-                # & (dataframe['mfi_rsi_cci_smooth'] < 0)
-                #
-                # |
-
-                (
-                    # simple v bottom shape (lopsided to the left to increase reactivity)
-                    # which has to be below a very slow average
-                    # this pattern only catches a few, but normally very good buy points
-                    (
-                            (dataframe['average'].shift(5) > dataframe['average'].shift(4))
-                            & (dataframe['average'].shift(4) > dataframe['average'].shift(3))
-                            & (dataframe['average'].shift(3) > dataframe['average'].shift(2))
-                            & (dataframe['average'].shift(2) > dataframe['average'].shift(1))
-                            & (dataframe['average'].shift(1) < dataframe['average'].shift(0))
-                            & (dataframe['low'].shift(1) < dataframe['bb_middleband'])
-                            & (dataframe['cci'].shift(1) < -100)
-                            & (dataframe['rsi'].shift(1) < 30)
-
-                    )
-                    |
-                    # buy in very oversold conditions
-                    (
-                            (dataframe['low'] < dataframe['bb_middleband'])
-                            & (dataframe['cci'] < -200)
-                            & (dataframe['rsi'] < 30)
-                            & (dataframe['mfi'] < 30)
-                    )
-
-                    |
-                    # etc tends to trade like this
-                    # over very long periods of slowly building up coins
-                    # does not happen often, but once in a while
-                    (
-                            (dataframe['mfi'] < 10)
-                            & (dataframe['cci'] < -150)
-                            & (dataframe['rsi'] < dataframe['mfi'])
-                    )
-
-                )
-
-                &
-                # ensure we have an overall uptrend
-                (dataframe['close'] > dataframe['close'].shift())
-            ),
-            'enter_long'] = 1
-
+        ENTRY_PLAN.apply(dataframe)
         return dataframe
 
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        # different strategy used for sell points, due to be able to duplicate it to 100%
-        dataframe.loc[
-            (
-                (
-                    #   This generates very nice sale points, and mostly sit's one stop behind
-                    #   the top of the peak
-                    (
-                        (dataframe['mfi_rsi_cci_smooth'] > 100)
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(1) > dataframe['mfi_rsi_cci_smooth'])
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(2) < dataframe['mfi_rsi_cci_smooth'].shift(1))
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(3) < dataframe['mfi_rsi_cci_smooth'].shift(2))
-                    )
-                    |
-                    #   This helps with very long, sideways trends, to get out of a market before
-                    #   it dumps
-                    (
-                        StrategyHelper.eight_green_candles(dataframe)
-                    )
-                    |
-                    # in case of very overbought market, like some one pumping
-                    # sell
-                    (
-                        (dataframe['cci'] > 200)
-                        & (dataframe['rsi'] > 70)
-                    )
-                )
-
-            ),
-            'exit_long'] = 1
+        EXIT_PLAN.apply(dataframe)
         return dataframe
 
 
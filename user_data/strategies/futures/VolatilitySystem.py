@@ -17,8 +17,11 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 
 from technical.util import resample_to_interval, resampled_merge
 
+from ftlib.callback_metrics import CallbackMetricsMixin
+from ftlib.stake_sizing import StakeSizingMixin
 
-class VolatilitySystem(IStrategy):
+
+class VolatilitySystem(CallbackMetricsMixin, StakeSizingMixin, IStrategy):
     """
     Volatility System strategy.
     Based on https://www.tradingview.com/script/3hhs0XbR/
@@ -113,7 +116,9 @@ class VolatilitySystem(IStrategy):
                             leverage: float, entry_tag: Optional[str], side: str,
                             **kwargs) -> float:
         # 50% stake amount on initial entry
-        return proposed_stake / 2
+        stake = self.stake_sizer.reserve(pair, proposed_stake / 2, min_stake, max_stake,
+                                         fallback=proposed_stake / 2)
+        return stake or 0
 
     position_adjustment_enable = True
 
@@ -136,7 +141,8 @@ class VolatilitySystem(IStrategy):
                 and trade.nr_of_successful_entries < 2
                 and trade.orders[-1].order_date_utc < prior_date
             ):
-                return trade.stake_amount
+                return self.stake_sizer.reserve(trade.pair, trade.stake_amount, min_stake, max_stake,
+                                                fallback=trade.stake_amount)
         return None
 
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
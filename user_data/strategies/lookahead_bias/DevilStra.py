@@ -25,11 +25,15 @@ from freqtrade.strategy import CategoricalParameter, IStrategy
 from numpy.lib import math
 from pandas import DataFrame
 
+from ftlib.rolling_minmax import rolling_normalize
+
 # ########################## SETTINGS ##############################
 # pairlist lenght(use exact count of pairs you used in whitelist size+1):
 PAIR_LIST_LENGHT = 269
 # you can find exact value of this inside GodStraNew
 TREND_CHECK_CANDLES = 4
+# number of candles normalize() takes the min/max over.
+NORMALIZE_WINDOW = 200
 # Set the pain range of devil(2~9999)
 PAIN_RANGE = 1000
 # Add "GodStraNew" Generated Results As spells inside SPELLS.
@@ -328,8 +332,8 @@ def spell_finder(index, space):
 
 
 def normalize(df):
-    df = (df-df.min())/(df.max()-df.min())
-    return df
+    # Scale with the trailing window only - the whole-series min()/max() looked ahead.
+    return rolling_normalize(df, NORMALIZE_WINDOW)
 
 
 def gene_calculator(dataframe, indicator):
@@ -561,6 +565,7 @@ class DevilStra(IStrategy):
 
     # 𝖂𝖔𝖗𝖘𝖙, 𝖀𝖓𝖎𝖉𝖊𝖆𝖑, 𝕾𝖚𝖇𝖔𝖕𝖙𝖎𝖒𝖆𝖑, 𝕸𝖆𝖑𝖆𝖕𝖗𝖔𝖕𝖔𝖘 𝕬𝖓𝖉 𝕯𝖎𝖘𝖒𝖆𝖑 𝖙𝖎𝖒𝖊𝖋𝖗𝖆𝖒𝖊 𝖋𝖔𝖗 𝖙𝖍𝖎𝖘 𝖘𝖙𝖗𝖆𝖙𝖊𝖌𝖞:
     timeframe = '4h'
+    startup_candle_count = NORMALIZE_WINDOW
 
     spell_pot = [
         ",".join(
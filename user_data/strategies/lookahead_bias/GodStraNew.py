@@ -19,6 +19,8 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
 from random import shuffle
+
+from ftlib.rolling_minmax import rolling_normalize
 #  TODO: this gene is removed 'MAVP' cuz or error on periods
 all_god_genes = {
     'Overlap Studies': {
@@ -230,6 +232,8 @@ operators = [
 # number of candles to check up,don,off trend.
 TREND_CHECK_CANDLES = 4
 DECIMALS = 1
+# number of candles normalize() takes the min/max over.
+NORMALIZE_WINDOW = 200
 ########################### END SETTINGS ##########################
 # DATAFRAME = DataFrame()
 
@@ -253,8 +257,8 @@ if len(operators) == 1:
 
 
 def normalize(df):
-    df = (df-df.min())/(df.max()-df.min())
-    return df
+    # Scale with the trailing window only - the whole-series min()/max() looked ahead.
+    return rolling_normalize(df, NORMALIZE_WINDOW)
 
 
 def gene_calculator(dataframe, indicator):
@@ -472,6 +476,7 @@ class GodStraNew(IStrategy):
     stoploss = -0.128
     # Buy hypers
     timeframe = '4h'
+    startup_candle_count = NORMALIZE_WINDOW
 
     # #################### END OF RESULT PLACE ####################
 
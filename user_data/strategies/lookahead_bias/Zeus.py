@@ -17,11 +17,15 @@ from pandas import DataFrame
 # import talib.abstract as ta
 import pandas as pd
 import ta
-from ta.utils import dropna
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
 
+from ftlib.rolling_minmax import rolling_normalize
+
+# number of candles the indicators are normalized over.
+NORMALIZE_WINDOW = 200
+
 
 class Zeus(IStrategy):
 
@@ -68,6 +72,7 @@ class Zeus(IStrategy):
 
     # Buy hypers
     timeframe = '4h'
+    startup_candle_count = NORMALIZE_WINDOW
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # Add all ta features
@@ -96,12 +101,11 @@ class Zeus(IStrategy):
 
         dataframe['trend_kst_diff'] = KST.kst_diff()
 
-        # Normalization
-        tib = dataframe['trend_ichimoku_base']
-        dataframe['trend_ichimoku_base'] = (
-            tib-tib.min())/(tib.max()-tib.min())
-        tkd = dataframe['trend_kst_diff']
-        dataframe['trend_kst_diff'] = (tkd-tkd.min())/(tkd.max()-tkd.min())
+        # Normalization over the trailing window (no future candles)
+        dataframe['trend_ichimoku_base'] = rolling_normalize(
+            dataframe['trend_ichimoku_base'], NORMALIZE_WINDOW)
+        dataframe['trend_kst_diff'] = rolling_normalize(
+            dataframe['trend_kst_diff'], NORMALIZE_WINDOW)
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
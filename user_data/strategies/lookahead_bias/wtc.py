@@ -8,8 +8,6 @@
 # request to making this strategy.
 # hope you enjoy and get profit
 # Author: @Mablue (Masoud Azizi)
-# IMPORTANT: install sklearn befoure you run this strategy:
-# pip install sklearn
 # github: https://github.com/mablue/
 # freqtrade hyperopt --hyperopt-loss SharpeHyperOptLoss --spaces buy sell --strategy wtc
 
@@ -22,7 +20,11 @@ from pandas import DataFrame
 # --- Do not remove these libs ---
 import numpy as np  # noqa
 import pandas as pd  # noqa
-from sklearn import preprocessing
+
+from ftlib.rolling_minmax import rolling_normalize
+
+# number of candles the indicators are normalized over.
+NORMALIZE_WINDOW = 200
 
 # --------------------------------
 # Add your lib to import here
@@ -74,6 +76,7 @@ class wtc(IStrategy):
     stoploss = -0.128
     ############################## END SETTINGS ##############################
     timeframe = '30m'
+    startup_candle_count = NORMALIZE_WINDOW
 
     buy_max = DecimalParameter(-1, 1, decimals=4, default=0.4393, space='buy')
     buy_min = DecimalParameter(-1, 1, decimals=4, default=-0.4676, space='buy')
@@ -117,10 +120,8 @@ class wtc(IStrategy):
             slowk = stoch['slowk']
             dataframe['slowk'] = slowk
             # print(dataframe.iloc[:, 6:].keys())
-            x = dataframe.iloc[:, 6:].values  # returns a numpy array
-            min_max_scaler = preprocessing.MinMaxScaler()
-            x_scaled = min_max_scaler.fit_transform(x)
-            dataframe.iloc[:, 6:] = pd.DataFrame(x_scaled)
+            # min/max over the trailing window - MinMaxScaler fitted on the full frame looked ahead
+            dataframe.iloc[:, 6:] = rolling_normalize(dataframe.iloc[:, 6:], NORMALIZE_WINDOW)
             # print('wt:\t', dataframe['wt'].min(), dataframe['wt'].max())
             # print('stoch:\t', dataframe['stoch'].min(), dataframe['stoch'].max())
             dataframe['def'] = dataframe['slowk']-dataframe['wt1']
@@ -5,7 +5,6 @@ from freqtrade.strategy import (IStrategy, informative)
 from pandas import DataFrame, Series
 import talib.abstract as ta
 import math
-import pandas_ta as pta
 # from finta import TA as fta
 import logging
 from logging import FATAL